@@ -0,0 +1,344 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import connection
+
+import numpy as np
+
+from .archive import to_micros, transfer_archive
+from .exceptions import AnalyticsNotLoadedException
+from .models import Currency, Transfer
+from .money import Money
+
+MICROS_PER_DAY = 86_400_000_000
+EPOCH_DAY = date(1970, 1, 1)
+
+
+@dataclass(frozen=True, slots=True)
+class TransferArrays:
+    """
+    Whole ledger as contiguous int64 columns, one element per transfer.
+    Missing account is 0, values are integer cents, days are counted
+    from 1970-01-01 in UTC. `cents` are in transfer currency, `to_cents`
+    what target account was credited with in its own currency.
+    """
+
+    ids: np.ndarray
+    from_account: np.ndarray
+    to_account: np.ndarray
+    currency: np.ndarray
+    cents: np.ndarray
+    to_cents: np.ndarray
+    day: np.ndarray
+
+    def __len__(self):
+        return len(self.ids)
+
+
+@dataclass(frozen=True, slots=True)
+class AccountFlow:
+    account_id: int
+    inflow: Money
+    outflow: Money
+    net: Money
+
+
+@dataclass(frozen=True, slots=True)
+class CurrencyDayVolume:
+    currency: str
+    day: date
+    transfers: int
+    volume: Money
+
+
+@dataclass(frozen=True, slots=True)
+class Counterparty:
+    account_id: int
+    transfers: int
+    volume: Money
+
+
+def load_transfers(chunk_size=100_000):
+    """
+    Read archived months straight from their files and live transfers
+    `chunk_size` rows at a time from server-side cursor into
+    `TransferArrays`.
+    """
+    chunks = []
+    symbols = dict(Currency.objects.values_list("symbol", "pk"))
+
+    for month in transfer_archive.months():
+        chunks.append(_archived_chunk(transfer_archive.open(month), symbols))
+
+    rows = (
+        Transfer.objects.order_by()
+        .values_list(
+            "id",
+            "from_account_id",
+            "to_account_id",
+            "currency_id",
+            "value",
+            "to_value",
+            "transfer_date",
+        )
+        .iterator(chunk_size)
+    )
+
+    while chunk := list(islice(rows, chunk_size)):
+        chunks.append(
+            [
+                np.fromiter((row[0] for row in chunk), np.int64, len(chunk)),
+                np.fromiter(
+                    (row[1] or 0 for row in chunk), np.int64, len(chunk)
+                ),
+                np.fromiter(
+                    (row[2] or 0 for row in chunk), np.int64, len(chunk)
+                ),
+                np.fromiter((row[3] for row in chunk), np.int64, len(chunk)),
+                np.fromiter((row[4] for row in chunk), np.int64, len(chunk)),
+                np.fromiter(
+                    (row[4] if row[5] is None else row[5] for row in chunk),
+                    np.int64,
+                    len(chunk),
+                ),
+                np.fromiter(
+                    (to_micros(row[6]) for row in chunk),
+                    np.int64,
+                    len(chunk),
+                )
+                // MICROS_PER_DAY,
+            ]
+        )
+
+    columns = (
+        [np.concatenate(column) for column in zip(*chunks)]
+        if chunks
+        else [np.empty(0, np.int64) for _ in range(7)]
+    )
+    return TransferArrays(*columns)
+
+
+def _archived_chunk(archive, symbols):
+    column = archive.columns
+    strings = len(column["strings.offsets"]) - 1
+    # archive keeps currency symbols in its string table
+    currency_ids = np.array(
+        [symbols.get(archive.string(idx), 0) for idx in range(strings)],
+        np.int64,
+    )
+    currency = np.frombuffer(column["transfers.currency"], np.uint32)
+    return [
+        np.frombuffer(column["transfers.id"], np.int64),
+        np.frombuffer(column["transfers.from_account"], np.int64),
+        np.frombuffer(column["transfers.to_account"], np.int64),
+        currency_ids[currency] if strings else np.zeros(0, np.int64),
+        np.frombuffer(column["transfers.value"], np.int64),
+        # files written before conversions have no `to_value`
+        np.frombuffer(
+            column.get("transfers.to_value", column["transfers.value"]),
+            np.int64,
+        ),
+        np.frombuffer(column["transfers.transfer_date"], np.int64)
+        // MICROS_PER_DAY,
+    ]
+
+
+def group_sum(keys, values):
+    """
+    `(unique keys, sums, counts)` of `values` grouped by `keys`. Sums stay
+    int64, so cents add up exactly.
+    """
+    if not len(keys):
+        empty = np.empty(0, np.int64)
+        return empty, empty, empty
+
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    sums = np.add.reduceat(values[order], starts)
+    counts = np.diff(np.append(starts, len(keys)))
+    return keys[starts], sums, counts
+
+
+def net_flow(arrays, after=0, limit=None):
+    """
+    `AccountFlow` of accounts with transfers, by account id. Only up to
+    `limit` accounts with id higher than `after` are returned.
+    """
+    incoming = arrays.to_account != 0
+    outgoing = arrays.from_account != 0
+    size = (
+        int(
+            max(
+                arrays.to_account.max(initial=0),
+                arrays.from_account.max(initial=0),
+            )
+        )
+        + 1
+    )
+    inflow = np.zeros(size, np.int64)
+    outflow = np.zeros(size, np.int64)
+    keys, sums, _ = group_sum(
+        arrays.to_account[incoming], arrays.to_cents[incoming]
+    )
+    inflow[keys] = sums
+    keys, sums, _ = group_sum(
+        arrays.from_account[outgoing], arrays.cents[outgoing]
+    )
+    outflow[keys] = sums
+    active = np.bincount(arrays.to_account[incoming], minlength=size)
+    active += np.bincount(arrays.from_account[outgoing], minlength=size)
+    accounts = np.flatnonzero(active)
+    accounts = accounts[accounts > after][:limit]
+
+    return [
+        AccountFlow(
+            account_id=int(account),
+            inflow=Money(inflow[account]),
+            outflow=Money(outflow[account]),
+            net=Money(inflow[account] - outflow[account]),
+        )
+        for account in accounts
+    ]
+
+
+def currency_volume(arrays, symbols):
+    """
+    `CurrencyDayVolume` of every currency and UTC day with transfers,
+    ordered by currency id and day. `symbols` maps currency ids to symbols.
+    """
+    if not len(arrays):
+        return []
+
+    first_day = int(arrays.day.min())
+    span = int(arrays.day.max()) - first_day + 1
+    keys, sums, counts = group_sum(
+        arrays.currency * span + (arrays.day - first_day), arrays.cents
+    )
+
+    return [
+        CurrencyDayVolume(
+            currency=symbols.get(int(key // span), ""),
+            day=EPOCH_DAY + timedelta(days=first_day + int(key % span)),
+            transfers=int(count),
+            volume=Money(total),
+        )
+        for key, total, count in zip(keys, sums, counts)
+    ]
+
+
+def top_counterparties(arrays, account, limit):
+    """
+    Up to `limit` accounts `account` moved most money with, both ways,
+    biggest volume first. Volume is in currency of `account`.
+    """
+    sent = (
+        (arrays.from_account == account)
+        & (arrays.to_account != 0)
+        & (arrays.to_account != account)
+    )
+    received = (
+        (arrays.to_account == account)
+        & (arrays.from_account != 0)
+        & (arrays.from_account != account)
+    )
+    keys, sums, counts = group_sum(
+        np.concatenate(
+            (arrays.to_account[sent], arrays.from_account[received])
+        ),
+        np.concatenate((arrays.cents[sent], arrays.to_cents[received])),
+    )
+    top = np.argsort(-sums, kind="stable")[:limit]
+
+    return [
+        Counterparty(
+            account_id=int(keys[idx]),
+            transfers=int(counts[idx]),
+            volume=Money(sums[idx]),
+        )
+        for idx in top
+    ]
+
+
+class TransferAnalytics:
+    """
+    Reports computed from `TransferArrays` kept in memory of the process.
+    Reports never read the ledger themselves: arrays older than
+    `ANALYTICS_CACHE_SECONDS` are still served while background thread
+    loads new ones, and until first load is done reports raise
+    `AnalyticsNotLoadedException`. Management commands call `load`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._arrays = None
+        self._loaded_at = 0
+        self._loader = None
+
+    def arrays(self):
+        with self._lock:
+            if self._loader is None and (
+                self._arrays is None
+                or time.monotonic() - self._loaded_at
+                >= settings.ANALYTICS_CACHE_SECONDS
+            ):
+                self._loader = threading.Thread(
+                    target=self._reload, name="analytics-load", daemon=True
+                )
+                self._loader.start()
+
+            arrays = self._arrays
+
+        if arrays is None:
+            raise AnalyticsNotLoadedException(
+                "Analytics are being loaded, try again later"
+            )
+
+        return arrays
+
+    def load(self):
+        """
+        Read ledger in calling thread and serve new arrays from now on.
+        """
+        arrays = load_transfers(settings.ANALYTICS_CHUNK_SIZE)
+
+        with self._lock:
+            self._arrays = arrays
+            self._loaded_at = time.monotonic()
+
+        return arrays
+
+    def invalidate(self):
+        """
+        Reload arrays on next report, current ones are served meanwhile.
+        """
+        with self._lock:
+            self._loaded_at = -math.inf
+
+    def _reload(self):
+        try:
+            self.load()
+        finally:
+            with self._lock:
+                self._loader = None
+
+            # connection was opened by this thread only
+            connection.close()
+
+    def net_flow(self, after=0, limit=None):
+        return net_flow(self.arrays(), after, limit)
+
+    def currency_volume(self):
+        symbols = dict(Currency.objects.values_list("pk", "symbol"))
+        return currency_volume(self.arrays(), symbols)
+
+    def top_counterparties(self, account, limit=10):
+        return top_counterparties(self.arrays(), int(account), limit)
+
+
+transfer_analytics = TransferAnalytics()
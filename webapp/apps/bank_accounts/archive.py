@@ -0,0 +1,519 @@
+import bisect
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+
+from .money import Money
+
+MAGIC = b"BKTARCH1"
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+NO_STRING = 2**32 - 1
+
+# `transfers` section holds every transfer once, ordered by
+# `(transfer_date, id)`. `entries` holds it once per account side, grouped
+# by account and ordered by `(transfer_date, id)` within account, with
+# `accounts` / `offsets` index pointing at slice of every account.
+SECTIONS = ("transfers", "entries")
+COLUMNS = {
+    "id": "q",
+    "transfer_date": "q",
+    "value": "q",
+    # amount credited to target account, same as `value` unless converted
+    "to_value": "q",
+    "from_account": "q",
+    "to_account": "q",
+    "name": "I",
+    "from_name": "I",
+    "to_name": "I",
+    "currency": "I",
+}
+FLUSH_ROWS = 65536
+FILE_NAME = re.compile(r"^transfers-(\d{4})-(\d{2})\.bta$")
+
+
+def to_micros(value):
+    return (value - EPOCH) // MICROSECOND
+
+
+def file_name(month):
+    return f"transfers-{month:%Y-%m}.bta"
+
+
+class ArchiveWriter:
+    """
+    Writes one month of transfers as columnar file. Columns are fixed
+    width arrays, strings (names, currency symbols) are stored once in
+    string table and referenced by index. Rows are added in final order
+    and spooled to temporary files, so memory use does not depend on
+    number of rows. File appears under `path` only once complete.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.directory = os.path.dirname(path)
+        self.strings = {}
+        self.counts = dict.fromkeys(SECTIONS, 0)
+        self.accounts = array("q")
+        self.offsets = array("q")
+        self.buffers = {
+            (section, column): array(typecode)
+            for section in SECTIONS
+            for column, typecode in COLUMNS.items()
+        }
+        self.spools = {
+            key: tempfile.TemporaryFile(dir=self.directory)
+            for key in self.buffers
+        }
+
+    def add_transfer(self, row):
+        """
+        Add `(id, transfer_date, value, from_account_id, to_account_id,
+        name, from_account_name, to_account_name, currency_symbol,
+        to_value)`, `to_value` None for transfers without conversion.
+        """
+        self._add("transfers", row)
+
+    def add_entry(self, account_id, row):
+        if not self.accounts or self.accounts[-1] != account_id:
+            self.accounts.append(account_id)
+            self.offsets.append(self.counts["entries"])
+
+        self._add("entries", row)
+
+    def close(self):
+        for key in self.buffers:
+            self._flush(key)
+
+        self.offsets.append(self.counts["entries"])
+        strings = sorted(self.strings, key=self.strings.get)
+        blob = array("B")
+        string_offsets = array("q", [0])
+
+        for value in strings:
+            blob.frombytes(value.encode())
+            string_offsets.append(len(blob))
+
+        parts = [
+            (f"{section}.{column}", COLUMNS[column], self.counts[section])
+            for section, column in self.buffers
+        ]
+        parts += [
+            ("index.accounts", "q", len(self.accounts)),
+            ("index.offsets", "q", len(self.offsets)),
+            ("strings.offsets", "q", len(string_offsets)),
+            ("strings.blob", "B", len(blob)),
+        ]
+        header = {"counts": self.counts, "columns": {}}
+        offset = 0
+
+        for name, typecode, count in parts:
+            header["columns"][name] = [typecode, offset, count]
+            size = count * array(typecode).itemsize
+            offset += size + (-size % 8)
+
+        header = json.dumps(header).encode()
+        header += b" " * (-(len(MAGIC) + 8 + len(header)) % 8)
+        data_start = len(MAGIC) + 8 + len(header)
+
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, delete=False
+        ) as output:
+            output.write(MAGIC)
+            output.write(len(header).to_bytes(8, "little"))
+            output.write(header)
+
+            for key, spool in self.spools.items():
+                spool.seek(0)
+                self._copy(spool, output)
+                spool.close()
+
+            for values in (
+                self.accounts,
+                self.offsets,
+                string_offsets,
+                blob,
+            ):
+                values.tofile(output)
+                self._pad(output)
+
+            assert output.tell() == data_start + offset
+            output.flush()
+            os.fsync(output.fileno())
+
+        os.replace(output.name, self.path)
+
+    def _add(self, section, row):
+        (
+            idx,
+            transfer_date,
+            value,
+            from_account,
+            to_account,
+            name,
+            from_name,
+            to_name,
+            currency,
+            to_value,
+        ) = row
+        values = {
+            "id": idx,
+            "transfer_date": to_micros(transfer_date),
+            "value": int(value),
+            "to_value": int(value if to_value is None else to_value),
+            "from_account": from_account or 0,
+            "to_account": to_account or 0,
+            "name": self._string(name),
+            "from_name": self._string(from_name),
+            "to_name": self._string(to_name),
+            "currency": self._string(currency),
+        }
+
+        for column, value in values.items():
+            self.buffers[section, column].append(value)
+
+        self.counts[section] += 1
+
+        if len(self.buffers[section, "id"]) >= FLUSH_ROWS:
+            for column in COLUMNS:
+                self._flush((section, column))
+
+    def _flush(self, key):
+        self.buffers[key].tofile(self.spools[key])
+        del self.buffers[key][:]
+
+    def _string(self, value):
+        if value is None:
+            return NO_STRING
+
+        return self.strings.setdefault(value, len(self.strings))
+
+    def _copy(self, source, output):
+        while chunk := source.read(1 << 20):
+            output.write(chunk)
+
+        self._pad(output)
+
+    def _pad(self, output):
+        output.write(b"\0" * (-output.tell() % 8))
+
+
+class _Keys:
+    # `(transfer_date, id)` of rows, as sequence for `bisect`
+    def __init__(self, dates, ids):
+        self.dates = dates
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, idx):
+        return (self.dates[idx], self.ids[idx])
+
+
+class ArchiveMonth:
+    """
+    Read-only view of archive file. File is memory-mapped and columns are
+    sliced straight from the mapping, so reading rows of one account
+    touches only pages of its slice and of the index.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not transfer archive")
+
+        size = int.from_bytes(self._map[len(MAGIC) : len(MAGIC) + 8], "little")
+        start = len(MAGIC) + 8
+        header = json.loads(self._map[start : start + size])
+        start += size
+        view = memoryview(self._map)
+        self.columns = {}
+
+        for name, (typecode, offset, count) in header["columns"].items():
+            itemsize = array(typecode).itemsize
+            self.columns[name] = view[
+                start + offset : start + offset + count * itemsize
+            ].cast(typecode)
+
+        self.keys = {
+            section: _Keys(
+                self.columns[f"{section}.transfer_date"],
+                self.columns[f"{section}.id"],
+            )
+            for section in SECTIONS
+        }
+
+    def read(self, limit, key=None, forward=True, account=None):
+        """
+        Up to `limit` rows following (or preceding, when not `forward`)
+        `(transfer_date micros, id)` key, in reading direction.
+        """
+        section = "entries" if account else "transfers"
+        low, high = (
+            self.slice(account) if account else (0, len(self.keys[section]))
+        )
+
+        if forward:
+            start = low
+
+            if key is not None:
+                start = bisect.bisect_right(self.keys[section], key, low, high)
+
+            rows = range(start, min(high, start + limit))
+        else:
+            end = high
+
+            if key is not None:
+                end = bisect.bisect_left(self.keys[section], key, low, high)
+
+            rows = range(end - 1, max(low, end - limit) - 1, -1)
+
+        return [self.row(section, idx) for idx in rows]
+
+    def slice(self, account):
+        accounts = self.columns["index.accounts"]
+        idx = bisect.bisect_left(accounts, account)
+
+        if idx == len(accounts) or accounts[idx] != account:
+            return 0, 0
+
+        offsets = self.columns["index.offsets"]
+        return offsets[idx], offsets[idx + 1]
+
+    def get_totals(self, account_ids, after=None, until=None):
+        """
+        `{account_id: [net change, transfers]}` of given accounts, counting
+        transfers with `after < transfer_date <= until` (micros, None for
+        no bound).
+        """
+        dates = self.columns["entries.transfer_date"]
+        to_accounts = self.columns["entries.to_account"]
+        values = self.columns["entries.value"]
+        # files written before conversions have no `to_value`
+        to_values = self.columns.get("entries.to_value", values)
+        totals = {}
+
+        for account in account_ids:
+            low, high = self.slice(account)
+
+            if after is not None:
+                low = bisect.bisect_right(dates, after, low, high)
+
+            if until is not None:
+                high = bisect.bisect_right(dates, until, low, high)
+
+            if low >= high:
+                continue
+
+            cents = sum(
+                to_values[idx] if to_accounts[idx] == account else -values[idx]
+                for idx in range(low, high)
+            )
+            totals[account] = [int(cents), high - low]
+
+        return totals
+
+    def account_ids(self):
+        return self.columns["index.accounts"]
+
+    def get_daily_totals(self, account_ids, tz):
+        """
+        `{(account_id, day): [inflow, outflow, transfers in, transfers
+        out]}` of given accounts, days in `tz`.
+        """
+        dates = self.columns["entries.transfer_date"]
+        to_accounts = self.columns["entries.to_account"]
+        values = self.columns["entries.value"]
+        to_values = self.columns.get("entries.to_value", values)
+        totals = defaultdict(lambda: [0, 0, 0, 0])
+
+        for account in account_ids:
+            low, high = self.slice(account)
+
+            for idx in range(low, high):
+                day = (EPOCH + dates[idx] * MICROSECOND).astimezone(tz).date()
+                delta = totals[account, day]
+
+                if to_accounts[idx] == account:
+                    delta[0] += to_values[idx]
+                    delta[2] += 1
+                else:
+                    delta[1] += values[idx]
+                    delta[3] += 1
+
+        return totals
+
+    def row(self, section, idx):
+        """
+        Row at `idx` in `TransferRow` field order.
+        """
+        column = self.columns
+        return (
+            column[f"{section}.id"][idx],
+            self.string(column[f"{section}.name"][idx]),
+            self.string(column[f"{section}.from_name"][idx]),
+            self.string(column[f"{section}.to_name"][idx]),
+            Money(column[f"{section}.value"][idx]),
+            self.string(column[f"{section}.currency"][idx]),
+            EPOCH + column[f"{section}.transfer_date"][idx] * MICROSECOND,
+        )
+
+    def string(self, idx):
+        if idx == NO_STRING:
+            return None
+
+        offsets = self.columns["strings.offsets"]
+        blob = self.columns["strings.blob"]
+        return bytes(blob[offsets[idx] : offsets[idx + 1]]).decode()
+
+
+class TransferArchive:
+    """
+    Monthly archive files in `TRANSFER_ARCHIVE_DIR`. Archived months are
+    older than any transfer left in database, so archive rows always come
+    before live ones in `(transfer_date, id)` order.
+    """
+
+    max_open = 24
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listing = (None, [])
+        self._open = OrderedDict()
+
+    @property
+    def directory(self):
+        return settings.TRANSFER_ARCHIVE_DIR
+
+    def path(self, month):
+        return os.path.join(self.directory, file_name(month))
+
+    def months(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+
+        stamp = (self.directory, os.stat(self.directory).st_mtime_ns)
+
+        with self._lock:
+            if self._listing[0] != stamp:
+                months = []
+
+                for name in os.listdir(self.directory):
+                    if match := FILE_NAME.match(name):
+                        months.append(date(int(match[1]), int(match[2]), 1))
+
+                self._listing = (stamp, sorted(months))
+                self._open.clear()
+
+            return self._listing[1]
+
+    def open(self, month):
+        with self._lock:
+            archive = self._open.get(month)
+
+            if archive is None:
+                archive = self._open[month] = ArchiveMonth(self.path(month))
+
+                while len(self._open) > self.max_open:
+                    self._open.popitem(last=False)
+
+            self._open.move_to_end(month)
+            return archive
+
+    def get_rows(self, limit, key=None, forward=True, account=None):
+        """
+        Up to `limit` rows after (before when not `forward`) `key`
+        `(transfer_date, id)`, in reading direction. Months which end
+        before the key are not opened.
+        """
+        account = int(account) if account else None
+        micros_key = None if key is None else (to_micros(key[0]), key[1])
+        months = self.months()
+
+        if key is not None:
+            month = key[0].astimezone(dt_timezone.utc).date().replace(day=1)
+            months = [
+                m for m in months if (m >= month) == forward or m == month
+            ]
+
+        rows = []
+
+        for month in months if forward else reversed(months):
+            if len(rows) >= limit:
+                break
+
+            rows += self.open(month).read(
+                limit - len(rows), micros_key, forward, account
+            )
+
+        return rows
+
+    def iter_rows(self, account=None, chunk_size=2000):
+        account = int(account) if account else None
+
+        for month in self.months():
+            archive = self.open(month)
+            key = None
+
+            while rows := archive.read(chunk_size, key, account=account):
+                yield from rows
+                last = rows[-1]
+                key = (to_micros(last[6]), last[0])
+
+    def get_totals(self, account_ids, after=None, until=None):
+        """
+        `{account_id: [net change, transfers]}` of archived transfers with
+        `after < transfer_date <= until`, None for no bound. Months outside
+        of that window are not opened.
+        """
+        totals = defaultdict(lambda: [0, 0])
+        months = self.months()
+
+        if after is not None:
+            month = after.astimezone(dt_timezone.utc).date().replace(day=1)
+            months = [m for m in months if m >= month]
+
+        if until is not None:
+            month = until.astimezone(dt_timezone.utc).date().replace(day=1)
+            months = [m for m in months if m <= month]
+
+        after = None if after is None else to_micros(after)
+        until = None if until is None else to_micros(until)
+
+        for month in months:
+            for account, (net, count) in (
+                self.open(month).get_totals(account_ids, after, until).items()
+            ):
+                totals[account][0] += net
+                totals[account][1] += count
+
+        return totals
+
+    def get_daily_totals(self, account_ids, tz):
+        """
+        `{(account_id, day): [inflow, outflow, transfers in, transfers
+        out]}` of archived transfers, days in `tz`.
+        """
+        totals = defaultdict(lambda: [0, 0, 0, 0])
+
+        for month in self.months():
+            for key, delta in (
+                self.open(month).get_daily_totals(account_ids, tz).items()
+            ):
+                totals[key] = [a + b for a, b in zip(totals[key], delta)]
+
+        return totals
+
+
+transfer_archive = TransferArchive()
@@ -5,3 +5,14 @@ CURRENCY_SYMBOL_PLACEHOLDER = "Symbol must have 3 letters"
 CURRENCY_SYMBOL_VALIDATOR = "Symbol must have 3 letters"
 
 NEGATIVE_VALUE_ERROR_MESSAGE = "Value cannot be less than 0"
+
+ACCOUNT_PLACEHOLDER = "Start typing account name"
+ACCOUNT_AUTOCOMPLETE_LIMIT = 20
+
+HISTORY_PAGE_SIZE = 50
+ACCOUNTS_PAGE_SIZE = 50
+
+ANALYTICS_COUNTERPARTIES_LIMIT = 10
+ANALYTICS_NET_FLOW_PAGE_SIZE = 100
+
+STATEMENT_PAGE_SIZE = 50
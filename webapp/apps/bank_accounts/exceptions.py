@@ -27,3 +27,28 @@ class InvalidCurrencyException(Exception):
     """
     When currency symbol is not valid.
     """
+
+
+class ConcurrentUpdateException(Exception):
+    """
+    When account keeps being changed by other requests and optimistic
+    write could not be applied within allowed number of retries.
+    """
+
+
+class InvalidExchangeRateException(Exception):
+    """
+    When exchange rate is not positive or converts currency to itself.
+    """
+
+
+class IdempotencyKeyConflictException(Exception):
+    """
+    When idempotency key is reused for request with different payload.
+    """
+
+
+class AnalyticsNotLoadedException(Exception):
+    """
+    When analytics report is asked for before ledger was first loaded.
+    """
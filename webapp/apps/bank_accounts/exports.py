@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+import zlib
+from dataclasses import fields
+from itertools import islice
+
+from .queries.transfers import TransferRow
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_COLUMNS = [field.name for field in fields(TransferRow)]
+
+
+def export_transfers(rows, export_format, rows_per_chunk, compress=False):
+    """
+    Encode `TransferRow` iterable as CSV or NDJSON bytes, yielded in chunks
+    of up to `rows_per_chunk` rows. With `compress` output is gzip stream
+    flushed after every chunk, so receiver never waits for more than one
+    chunk either way.
+    """
+    encode = _encode_csv if export_format == "csv" else _encode_ndjson
+    chunks = (chunk.encode() for chunk in encode(rows, rows_per_chunk))
+
+    if compress:
+        chunks = _gzip(chunks)
+
+    return chunks
+
+
+def _values(row):
+    return (
+        row.pk,
+        row.name,
+        row.from_account,
+        row.to_account,
+        str(row.value),
+        row.currency,
+        row.transfer_date.isoformat(),
+    )
+
+
+def _chunked(rows, size):
+    rows = iter(rows)
+
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _encode_csv(rows, rows_per_chunk):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    # header goes out before first query returns
+    yield buffer.getvalue()
+
+    for chunk in _chunked(rows, rows_per_chunk):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_values(row) for row in chunk)
+        yield buffer.getvalue()
+
+
+def _encode_ndjson(rows, rows_per_chunk):
+    for chunk in _chunked(rows, rows_per_chunk):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, _values(row)))) + "\n"
+            for row in chunk
+        )
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    yield compressor.flush()
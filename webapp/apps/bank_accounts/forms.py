@@ -1,16 +1,109 @@
+import re
+from uuid import uuid4
+
 from django import forms
 from django.core.validators import ValidationError
+from django.urls import reverse_lazy
 
 from .const import (
+    ACCOUNT_PLACEHOLDER,
     CURRENCY_SYMBOL_PLACEHOLDER,
     CURRENCY_SYMBOL_VALIDATOR,
     MONEY_AMOUNT_PATTERN,
     MONEY_AMOUNT_PLACEHOLDER,
     NEGATIVE_VALUE_ERROR_MESSAGE,
 )
+from .money import Money
 from .queries import account_queries, currency_queries
 
 
+class AccountField(forms.Field):
+    """
+    Account id typed with help of autocomplete endpoint. Submitted id is
+    validated with single cached lookup instead of loading every account
+    as choices.
+    """
+
+    default_error_messages = {
+        "invalid_choice": forms.ChoiceField.default_error_messages[
+            "invalid_choice"
+        ],
+    }
+
+    def widget_attrs(self, widget):
+        attrs = super().widget_attrs(widget)
+        attrs["placeholder"] = ACCOUNT_PLACEHOLDER
+        attrs["autocomplete"] = "off"
+        attrs["data-autocomplete-url"] = reverse_lazy(
+            "bank-accounts:account-autocomplete"
+        )
+        return attrs
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+
+        try:
+            return account_queries.get_metadata(value).pk
+        except (ValueError, TypeError, account_queries.model.DoesNotExist):
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+
+
+class MoneyAmountField(forms.CharField):
+    """
+    Amount typed in major units, e.g. "12.50", cleaned to `Money`. Sign is
+    accepted here, so forms can report negative amounts with their own
+    message.
+    """
+
+    default_error_messages = {
+        "invalid": forms.DecimalField.default_error_messages["invalid"],
+        "max_decimal_places": "Ensure that there are no more than 2 decimal "
+        "places.",
+        "out_of_range": "Amount is too large.",
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault(
+            "widget",
+            forms.TextInput(
+                attrs={
+                    "placeholder": MONEY_AMOUNT_PLACEHOLDER,
+                    "pattern": MONEY_AMOUNT_PATTERN,
+                }
+            ),
+        )
+        super().__init__(**kwargs)
+
+    def to_python(self, value):
+        value = super().to_python(value)
+
+        if value in self.empty_values:
+            return None
+
+        if not re.fullmatch(r"-?(\d+\.?\d*|\.\d+)", value):
+            raise ValidationError(
+                self.error_messages["invalid"], code="invalid"
+            )
+
+        if not re.match(MONEY_AMOUNT_PATTERN, value.removeprefix("-")):
+            raise ValidationError(
+                self.error_messages["max_decimal_places"],
+                code="max_decimal_places",
+            )
+
+        try:
+            return Money.parse(value)
+        except ValueError:
+            raise ValidationError(
+                self.error_messages["out_of_range"], code="out_of_range"
+            )
+
+
 class AddAccountForm(forms.Form):
     name = forms.CharField(
         widget=forms.TextInput(attrs={"placeholder": "Name"})
@@ -19,14 +112,7 @@ class AddAccountForm(forms.Form):
         widget=forms.TextInput(attrs={"placeholder": "Description"})
     )
     currency = forms.ChoiceField(choices=())
-    funds = forms.DecimalField(
-        widget=forms.TextInput(
-            attrs={
-                "placeholder": MONEY_AMOUNT_PLACEHOLDER,
-                "pattern": MONEY_AMOUNT_PATTERN,
-            }
-        )
-    )
+    funds = MoneyAmountField()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -63,39 +149,37 @@ class AddCurrencyForm(forms.Form):
 
 
 class HistoryFilterForm(forms.Form):
-    by_account = forms.ChoiceField(choices=())
+    by_account = AccountField(required=False)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        choices = [(acc.pk, acc.name) for acc in account_queries.get_all()]
-        self.fields["by_account"].choices = choices
+
+class NetFlowForm(forms.Form):
+    # account id page starts after
+    after = forms.IntegerField(required=False, min_value=0)
+
+
+class StatementForm(forms.Form):
+    # entry id page starts after
+    after = forms.IntegerField(required=False, min_value=0)
 
 
 class DepositForm(forms.Form):
     name = forms.CharField(
         widget=forms.TextInput(attrs={"placeholder": "Title"})
     )
-    to_account = forms.ChoiceField(choices=())
+    to_account = AccountField()
     currency = forms.ChoiceField(choices=())
-    value = forms.DecimalField(
-        widget=forms.TextInput(
-            attrs={
-                "placeholder": MONEY_AMOUNT_PLACEHOLDER,
-                "pattern": MONEY_AMOUNT_PATTERN,
-            }
-        )
+    value = MoneyAmountField()
+    idempotency_key = forms.CharField(
+        required=False, max_length=64, widget=forms.HiddenInput()
     )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.fields["idempotency_key"].initial = uuid4().hex
         currency_choices = [
             (curr.pk, curr.symbol) for curr in currency_queries.get_all()
         ]
-        account_choices = [
-            (acc.pk, acc.name) for acc in account_queries.get_all()
-        ]
         self.fields["currency"].choices = currency_choices
-        self.fields["to_account"].choices = account_choices
 
     def clean_value(self):
         value = self.cleaned_data["value"]
@@ -110,27 +194,20 @@ class WithdrawForm(forms.Form):
     name = forms.CharField(
         widget=forms.TextInput(attrs={"placeholder": "Title"})
     )
-    from_account = forms.ChoiceField(choices=())
+    from_account = AccountField()
     currency = forms.ChoiceField(choices=())
-    value = forms.DecimalField(
-        widget=forms.TextInput(
-            attrs={
-                "placeholder": MONEY_AMOUNT_PLACEHOLDER,
-                "pattern": MONEY_AMOUNT_PATTERN,
-            }
-        )
+    value = MoneyAmountField()
+    idempotency_key = forms.CharField(
+        required=False, max_length=64, widget=forms.HiddenInput()
     )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.fields["idempotency_key"].initial = uuid4().hex
         currency_choices = [
             (curr.pk, curr.symbol) for curr in currency_queries.get_all()
         ]
-        account_choices = [
-            (acc.pk, acc.name) for acc in account_queries.get_all()
-        ]
         self.fields["currency"].choices = currency_choices
-        self.fields["from_account"].choices = account_choices
 
     def clean_value(self):
         value = self.cleaned_data["value"]
@@ -145,29 +222,21 @@ class TransferForm(forms.Form):
     name = forms.CharField(
         widget=forms.TextInput(attrs={"placeholder": "Title"})
     )
-    from_account = forms.ChoiceField(choices=())
-    to_account = forms.ChoiceField(choices=())
+    from_account = AccountField()
+    to_account = AccountField()
     currency = forms.ChoiceField(choices=())
-    value = forms.DecimalField(
-        widget=forms.TextInput(
-            attrs={
-                "placeholder": MONEY_AMOUNT_PLACEHOLDER,
-                "pattern": MONEY_AMOUNT_PATTERN,
-            }
-        )
+    value = MoneyAmountField()
+    idempotency_key = forms.CharField(
+        required=False, max_length=64, widget=forms.HiddenInput()
     )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.fields["idempotency_key"].initial = uuid4().hex
         currency_choices = [
             (curr.pk, curr.symbol) for curr in currency_queries.get_all()
         ]
-        account_choices = [
-            (acc.pk, acc.name) for acc in account_queries.get_all()
-        ]
         self.fields["currency"].choices = currency_choices
-        self.fields["from_account"].choices = account_choices
-        self.fields["to_account"].choices = account_choices
 
     def clean_value(self):
         value = self.cleaned_data["value"]
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...analytics import transfer_analytics
+
+REPORTS = ("net-flow", "currency-volume", "counterparties")
+
+
+class Command(BaseCommand):
+    help = (
+        "Print ledger report computed in memory with NumPy: net flow per "
+        "account, volume per currency per day, or top counterparties of "
+        "--account."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("report", choices=REPORTS)
+        parser.add_argument(
+            "--account",
+            type=int,
+            help="Account whose counterparties are reported",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Number of counterparties reported",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        # command reads ledger itself instead of waiting for background load
+        transfer_analytics.load()
+
+        if options["report"] == "net-flow":
+            for flow in transfer_analytics.net_flow():
+                self.stdout.write(
+                    f"{flow.account_id}\t{flow.inflow}\t{flow.outflow}\t"
+                    f"{flow.net}"
+                )
+        elif options["report"] == "currency-volume":
+            for volume in transfer_analytics.currency_volume():
+                self.stdout.write(
+                    f"{volume.currency}\t{volume.day}\t{volume.transfers}\t"
+                    f"{volume.volume}"
+                )
+        else:
+            if options["account"] is None:
+                raise CommandError("counterparties report needs --account")
+
+            for counterparty in transfer_analytics.top_counterparties(
+                options["account"], options["limit"]
+            ):
+                self.stdout.write(
+                    f"{counterparty.account_id}\t{counterparty.transfers}\t"
+                    f"{counterparty.volume}"
+                )
+
+        self.stderr.write(f"Done in {time.monotonic() - started:.2f} s")
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+
+from ...models import Transfer
+from ...partitions import (
+    add_months,
+    current_month,
+    get_partitions,
+    is_partitioned,
+)
+from ...usecases import ArchiveMonthCommand, ArchiveMonthUsecase
+
+
+class Command(BaseCommand):
+    help = (
+        "Move transfers of months older than --months out of database into "
+        "columnar files in TRANSFER_ARCHIVE_DIR, oldest month first. "
+        "History keeps showing them, read from the files. Partitions of "
+        "archived months are detached concurrently and dropped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=settings.TRANSFER_ARCHIVE_AFTER_MONTHS,
+            help="Number of recent months kept in database",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.TRANSFER_ARCHIVE_DIR:
+            raise CommandError("TRANSFER_ARCHIVE_DIR is not set")
+
+        oldest = Transfer.objects.aggregate(oldest=Min("transfer_date"))
+        cutoff = add_months(current_month(), -options["months"])
+
+        months = (
+            [oldest["oldest"].date().replace(day=1)]
+            if oldest["oldest"]
+            else []
+        )
+
+        # empty partitions older than oldest transfer are dropped too
+        if is_partitioned():
+            months += get_partitions()[:1]
+
+        if not months:
+            self.stdout.write("No transfers to archive")
+            return
+
+        month = min(months)
+
+        while month < cutoff:
+            count = ArchiveMonthUsecase().execute(ArchiveMonthCommand(month))
+            self.stdout.write(f"Archived {count} transfers of {month:%Y-%m}")
+            month = add_months(month, 1)
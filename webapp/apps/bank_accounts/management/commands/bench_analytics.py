@@ -0,0 +1,204 @@
+import time
+from collections import defaultdict
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+from ...analytics import (
+    currency_volume,
+    load_transfers,
+    net_flow,
+    top_counterparties,
+)
+from ...models import Account, Currency, Transfer
+from ...queries.balances import CREDITED_VALUE
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ledger reports computed with NumPy against equivalent ORM "
+        "aggregations. Seeds --rows transfers between its own accounts, "
+        "which are removed afterwards, run it against PostgreSQL database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10_000_000,
+            help="Number of seeded transfers",
+        )
+        parser.add_argument(
+            "--accounts",
+            type=int,
+            default=10_000,
+            help="Number of accounts transfers are spread across",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100_000,
+            help="Rows read at a time when loading NumPy arrays",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Benchmark seeds data with PostgreSQL SQL")
+
+        currency = Currency.objects.create(symbol="BNC")
+        Account.objects.bulk_create(
+            Account(name=f"bench {idx}", currency=currency)
+            for idx in range(options["accounts"])
+        )
+        accounts = Account.objects.filter(currency=currency)
+
+        try:
+            self._seed(currency, accounts, options["rows"])
+            self._run(accounts.order_by("pk")[0].pk, options)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {Transfer._meta.db_table} "
+                    "WHERE currency_id = %s",
+                    [currency.pk],
+                )
+
+            accounts.delete()
+            currency.delete()
+
+    def _seed(self, currency, accounts, rows):
+        ids = accounts.order_by("pk").values_list("pk", flat=True)
+        first, last = ids[0], ids.reverse()[0]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Transfer._meta.db_table}
+                    (name, from_account_id, to_account_id, currency_id,
+                     value, transfer_date)
+                SELECT
+                    'bench',
+                    CASE WHEN i %% 10 = 0
+                        THEN NULL
+                        ELSE %(first)s + (i::bigint * 7919) %% %(span)s END,
+                    %(first)s + (i::bigint * 104729 + 1) %% %(span)s,
+                    %(currency)s,
+                    i %% 10000 + 1,
+                    now() - i * interval '1 second'
+                FROM generate_series(1, %(rows)s) AS i
+                """,
+                {
+                    "first": first,
+                    "span": last - first + 1,
+                    "currency": currency.pk,
+                    "rows": rows,
+                },
+            )
+            cursor.execute(f"ANALYZE {Transfer._meta.db_table}")
+
+    def _run(self, account, options):
+        symbols = dict(Currency.objects.values_list("pk", "symbol"))
+        started = time.monotonic()
+        arrays = load_transfers(options["chunk_size"])
+        load = time.monotonic() - started
+        self.stdout.write(f"Loaded {len(arrays)} transfers in {load:.2f} s")
+        reports = (
+            ("net flow", self._orm_net_flow, lambda: net_flow(arrays)),
+            (
+                "currency volume",
+                self._orm_currency_volume,
+                lambda: currency_volume(arrays, symbols),
+            ),
+            (
+                "top counterparties",
+                lambda: self._orm_counterparties(account),
+                lambda: top_counterparties(arrays, account, 10),
+            ),
+        )
+
+        for name, orm_report, numpy_report in reports:
+            orm_seconds, orm_result = self._time(orm_report)
+            numpy_seconds, numpy_result = self._time(numpy_report)
+            self.stdout.write(
+                f"{name:>20}: ORM {orm_seconds:8.3f} s, "
+                f"NumPy {numpy_seconds:8.3f} s "
+                f"({orm_seconds / max(numpy_seconds, 1e-9):.0f}x), "
+                f"{len(numpy_result)} rows"
+            )
+
+            if orm_result != self._comparable(name, numpy_result):
+                raise CommandError(f"{name} results differ")
+
+    def _time(self, report):
+        started = time.monotonic()
+        result = report()
+        return time.monotonic() - started, result
+
+    def _orm_net_flow(self):
+        flows = defaultdict(int)
+
+        for field, amount, sign in (
+            ("to_account", CREDITED_VALUE, 1),
+            ("from_account", "value", -1),
+        ):
+            rows = (
+                Transfer.objects.filter(**{f"{field}__isnull": False})
+                .values(field)
+                .annotate(total=Sum(amount))
+                .values_list(field, "total")
+                .order_by()
+            )
+
+            for account, total in rows:
+                flows[account] += sign * total
+
+        return dict(flows)
+
+    def _orm_currency_volume(self):
+        return set(
+            Transfer.objects.annotate(
+                day=TruncDate("transfer_date", tzinfo=dt_timezone.utc)
+            )
+            .values("currency__symbol", "day")
+            .annotate(transfers=Count("id"), volume=Sum("value"))
+            .values_list("currency__symbol", "day", "transfers", "volume")
+            .order_by()
+        )
+
+    def _orm_counterparties(self, account):
+        volumes = defaultdict(int)
+
+        for field, other, amount in (
+            ("from_account", "to_account", "value"),
+            ("to_account", "from_account", CREDITED_VALUE),
+        ):
+            rows = (
+                Transfer.objects.filter(
+                    ~Q(**{other: account}),
+                    **{field: account, f"{other}__isnull": False},
+                )
+                .values(other)
+                .annotate(volume=Sum(amount))
+                .values_list(other, "volume")
+                .order_by()
+            )
+
+            for counterparty, volume in rows:
+                volumes[counterparty] += volume
+
+        return sorted(volumes.values(), reverse=True)[:10]
+
+    def _comparable(self, name, result):
+        if name == "net flow":
+            return {flow.account_id: flow.net for flow in result}
+
+        if name == "currency volume":
+            return {
+                (row.currency, row.day, row.transfers, row.volume)
+                for row in result
+            }
+
+        return [counterparty.volume for counterparty in result]
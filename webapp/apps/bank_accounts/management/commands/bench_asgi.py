@@ -0,0 +1,123 @@
+import asyncio
+import io
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive WSGI and ASGI handlers in-process with concurrent GET "
+        "requests and compare requests/sec and p99 latency of sync read "
+        "views with their async variants. Use it against PostgreSQL "
+        "database filled with realistic data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[1, 8, 32],
+            help="Numbers of requests in flight",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests sent in every run",
+        )
+
+    def handle(self, *args, **options):
+        cases = (
+            ("wsgi", "bank-accounts:home"),
+            ("asgi", "bank-accounts:home"),
+            ("asgi", "bank-accounts:home-async"),
+            ("wsgi", "bank-accounts:history"),
+            ("asgi", "bank-accounts:history"),
+            ("asgi", "bank-accounts:history-async"),
+        )
+
+        for concurrency in options["concurrency"]:
+            for server, url_name in cases:
+                path = reverse(url_name)
+                runner = getattr(self, f"_run_{server}")
+                latencies, elapsed = runner(
+                    path, concurrency, options["requests"]
+                )
+                p99 = statistics.quantiles(latencies, n=100)[98]
+                self.stdout.write(
+                    f"{server} {path:<18} concurrency {concurrency:>3}: "
+                    f"{len(latencies) / elapsed:8.1f} req/sec, "
+                    f"p99 {p99 * 1000:7.1f} ms"
+                )
+
+    def _host(self):
+        host = settings.ALLOWED_HOSTS[0]
+        return "localhost" if host == "*" else host
+
+    def _run_wsgi(self, path, concurrency, requests):
+        application = WSGIHandler()
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "SERVER_NAME": self._host(),
+            "SERVER_PORT": "80",
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": io.StringIO(),
+        }
+
+        def request(_):
+            started = time.monotonic()
+            body = application(dict(environ), lambda status, headers: None)
+            b"".join(body)
+            body.close()
+            return time.monotonic() - started
+
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(request, range(requests)))
+
+        return latencies, time.monotonic() - started
+
+    def _run_asgi(self, path, concurrency, requests):
+        application = ASGIHandler()
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [(b"host", self._host().encode())],
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            pass
+
+        async def request(semaphore, latencies):
+            async with semaphore:
+                started = time.monotonic()
+                await application(dict(scope), receive, send)
+                latencies.append(time.monotonic() - started)
+
+        async def run():
+            semaphore = asyncio.Semaphore(concurrency)
+            latencies = []
+            started = time.monotonic()
+            await asyncio.gather(
+                *(request(semaphore, latencies) for _ in range(requests))
+            )
+            return latencies, time.monotonic() - started
+
+        return asyncio.run(run())
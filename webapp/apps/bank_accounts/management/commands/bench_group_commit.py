@@ -0,0 +1,116 @@
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from ...models import Account, Currency
+from ...money import Money
+from ...usecases import DepositCommand, DepositUsecase, GroupCommitExecutor
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare commits/sec, deposits/sec and p99 latency of concurrent "
+        "deposits committed one transaction per request and with group "
+        "commit. Creates and removes its own accounts, run it against "
+        "PostgreSQL database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers",
+            type=int,
+            nargs="+",
+            default=[1, 8, 32, 64],
+            help="Numbers of concurrent writer threads",
+        )
+        parser.add_argument(
+            "--deposits",
+            type=int,
+            default=100,
+            help="Deposits done by each writer",
+        )
+        parser.add_argument(
+            "--accounts",
+            type=int,
+            default=10,
+            help="Number of accounts deposits are spread across",
+        )
+
+    def handle(self, *args, **options):
+        # symbol of other benchmarks, left behind when one was interrupted
+        currency, created = Currency.objects.get_or_create(symbol="BNC")
+        accounts = [
+            Account.objects.create(
+                name=f"bench {idx}", currency=currency, funds=0
+            )
+            for idx in range(options["accounts"])
+        ]
+
+        try:
+            for writers in options["writers"]:
+                single = DepositUsecase()
+                grouped = GroupCommitExecutor(
+                    max_batch=settings.DEPOSIT_GROUP_COMMIT_MAX_BATCH,
+                    max_wait=settings.DEPOSIT_GROUP_COMMIT_MAX_WAIT,
+                )
+
+                for mode, usecase in (("single", single), ("group", grouped)):
+                    latencies, elapsed = self._run(
+                        usecase, accounts, writers, options["deposits"]
+                    )
+                    commits = (
+                        grouped.commits
+                        if usecase is grouped
+                        else len(latencies)
+                    )
+                    p99 = statistics.quantiles(latencies, n=100)[98]
+                    self.stdout.write(
+                        f"{writers:>3} writers, {mode:>6}: "
+                        f"{commits / elapsed:8.1f} commits/sec, "
+                        f"{len(latencies) / elapsed:8.1f} deposits/sec, "
+                        f"p99 {p99 * 1000:7.1f} ms"
+                    )
+        finally:
+            Account.objects.filter(
+                pk__in=[account.pk for account in accounts]
+            ).delete()
+
+            if created:
+                currency.delete()
+
+    def _run(self, usecase, accounts, writers, deposits):
+        def writer(seed):
+            rnd = random.Random(seed)
+            latencies = []
+
+            try:
+                for _ in range(deposits):
+                    command = DepositCommand(
+                        name="bench deposit",
+                        to_account=rnd.choice(accounts).pk,
+                        currency=accounts[0].currency_id,
+                        value=Money(1),
+                    )
+                    started = time.monotonic()
+                    usecase.execute(command)
+                    latencies.append(time.monotonic() - started)
+            finally:
+                connection.close()
+
+            return latencies
+
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=writers) as executor:
+            latencies = [
+                latency
+                for worker_latencies in executor.map(writer, range(writers))
+                for latency in worker_latencies
+            ]
+
+        return latencies, time.monotonic() - started
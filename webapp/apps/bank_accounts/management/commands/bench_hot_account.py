@@ -0,0 +1,124 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from ...exceptions import (
+    ConcurrentUpdateException,
+    InvalidWithdrawAmountException,
+)
+from ...models import Account, Currency
+from ...money import Money
+from ...usecases import (
+    DepositCommand,
+    DepositUsecase,
+    FastWithdrawUsecase,
+    SetBalanceSlotsCommand,
+    SetBalanceSlotsUsecase,
+    WithdrawCommand,
+    WithdrawUsecase,
+)
+
+VALUE = Money(1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure throughput of concurrent deposits and withdrawals hitting "
+        "one account, with and without balance slots. Creates and removes "
+        "its own account, run it against PostgreSQL database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers",
+            type=int,
+            nargs="+",
+            default=[1, 4, 16, 64],
+            help="Numbers of concurrent writer threads",
+        )
+        parser.add_argument(
+            "--operations",
+            type=int,
+            default=200,
+            help="Operations done by each writer",
+        )
+        parser.add_argument(
+            "--slots",
+            type=int,
+            default=16,
+            help="Number of balance slots of hot account",
+        )
+
+    def handle(self, *args, **options):
+        # symbol of other benchmarks, left behind when one was interrupted
+        currency, created = Currency.objects.get_or_create(symbol="BNC")
+        account = Account.objects.create(
+            name="bench", currency=currency, funds=1000
+        )
+
+        try:
+            for writers in options["writers"]:
+                for slots in (0, options["slots"]):
+                    SetBalanceSlotsUsecase().execute(
+                        SetBalanceSlotsCommand(account=account.pk, slots=slots)
+                    )
+                    ops_per_sec = self._run(
+                        account, writers, options["operations"]
+                    )
+                    mode = f"{slots} slots" if slots else "single row"
+                    self.stdout.write(
+                        f"{writers:>3} writers, {mode:>12}: "
+                        f"{ops_per_sec:10.1f} ops/sec"
+                    )
+        finally:
+            Account.objects.filter(pk=account.pk).delete()
+
+            if created:
+                currency.delete()
+
+    def _run(self, account, writers, operations):
+        deposit = DepositCommand(
+            name="bench deposit",
+            to_account=account.pk,
+            currency=account.currency_id,
+            value=VALUE,
+        )
+        withdraw = WithdrawCommand(
+            name="bench withdraw",
+            from_account=account.pk,
+            currency=account.currency_id,
+            value=VALUE,
+        )
+
+        def writer(_):
+            deposit_usecase = DepositUsecase()
+            withdraw_usecase = (
+                FastWithdrawUsecase()
+                if settings.TRANSFER_FAST_PATH
+                else WithdrawUsecase()
+            )
+
+            try:
+                for idx in range(operations):
+                    try:
+                        if idx % 2:
+                            withdraw_usecase.execute(withdraw)
+                        else:
+                            deposit_usecase.execute(deposit)
+                    except (
+                        ConcurrentUpdateException,
+                        InvalidWithdrawAmountException,
+                    ):
+                        pass
+            finally:
+                connection.close()
+
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=writers) as executor:
+            list(executor.map(writer, range(writers)))
+
+        return writers * operations / (time.monotonic() - started)
@@ -0,0 +1,71 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...money import Money
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare arithmetic transfer usecases do on balances - validating "
+        "amount, subtracting it from one balance and adding it to another - "
+        "with amounts as Decimal and as Money. Needs no database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--operations",
+            type=int,
+            default=1_000_000,
+            help="Number of transfers applied to balances",
+        )
+        parser.add_argument(
+            "--accounts",
+            type=int,
+            default=1000,
+            help="Number of balances transfers move money between",
+        )
+
+    def handle(self, *args, **options):
+        rnd = random.Random(0)
+        pairs = [
+            (
+                rnd.randrange(options["accounts"]),
+                rnd.randrange(options["accounts"]),
+                rnd.randint(1, 100_000),
+            )
+            for _ in range(options["operations"])
+        ]
+        results = {}
+
+        for name, amount in (
+            ("Decimal", lambda cents: Decimal(cents).scaleb(-2)),
+            ("Money", Money),
+        ):
+            transfers = [(a, b, amount(cents)) for a, b, cents in pairs]
+            funds = [amount(10**9)] * options["accounts"]
+            elapsed = self._run(transfers, funds)
+            results[name] = funds
+            self.stdout.write(
+                f"{name:>8}: {elapsed:7.3f} s, "
+                f"{len(transfers) / elapsed:12.0f} transfers/sec"
+            )
+
+        expected = [Money.parse(value) for value in results["Decimal"]]
+
+        if expected != results["Money"]:
+            raise CommandError("Balances differ")
+
+    def _run(self, transfers, funds):
+        started = time.perf_counter()
+
+        for from_account, to_account, value in transfers:
+            if value <= 0 or value > funds[from_account]:
+                continue
+
+            funds[from_account] -= value
+            funds[to_account] += value
+
+        return time.perf_counter() - started
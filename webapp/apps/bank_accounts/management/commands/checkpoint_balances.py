@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...usecases import (
+    CreateBalanceCheckpointsCommand,
+    CreateBalanceCheckpointsUsecase,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write balance checkpoints of accounts with new transfers, "
+        "run it periodically to keep balance_at lookups short"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lag",
+            type=int,
+            default=settings.BALANCE_CHECKPOINT_LAG,
+            help="Seconds in the past the checkpoint is taken at",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of accounts processed in one query",
+        )
+
+    def handle(self, *args, **options):
+        command = CreateBalanceCheckpointsCommand(
+            as_of=timezone.now() - timedelta(seconds=options["lag"]),
+            batch_size=options["batch_size"],
+        )
+        created = CreateBalanceCheckpointsUsecase().execute(command)
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {created} balance checkpoints")
+        )
@@ -0,0 +1,64 @@
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...exports import EXPORT_CONTENT_TYPES, export_transfers
+from ...forms import HistoryFilterForm
+from ...queries import transfer_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream whole transfer history, optionally of single account, as "
+        "CSV or NDJSON to file or standard output. Rows are read from "
+        "server-side cursor, so memory use does not grow with history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--account",
+            help="Export only transfers of account with this id",
+        )
+        parser.add_argument(
+            "--format",
+            choices=tuple(EXPORT_CONTENT_TYPES),
+            default="csv",
+            help="Output format",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress output with gzip",
+        )
+        parser.add_argument(
+            "--output",
+            help="Output file, standard output by default",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help="Number of rows fetched from database at a time",
+        )
+
+    def handle(self, *args, **options):
+        form = HistoryFilterForm({"by_account": options["account"]})
+
+        if not form.is_valid():
+            raise CommandError(form.errors.as_text())
+
+        rows = transfer_queries.iter_rows(
+            form.cleaned_data["by_account"], chunk_size=options["chunk_size"]
+        )
+        chunks = export_transfers(
+            rows, options["format"], options["chunk_size"], options["gzip"]
+        )
+
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                output.writelines(chunks)
+        else:
+            output = sys.stdout.buffer
+            output.writelines(chunks)
+            output.flush()
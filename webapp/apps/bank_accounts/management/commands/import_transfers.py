@@ -0,0 +1,224 @@
+import csv
+import json
+import os
+import time
+from decimal import Decimal
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from ...models import ImportJob
+from ...money import Money
+from ...usecases import (
+    BatchItemResult,
+    BatchTransferUsecase,
+    CopyBatchTransferUsecase,
+    DepositCommand,
+    TransferCommand,
+    WithdrawCommand,
+)
+
+ID_FIELDS = ("from_account", "to_account", "currency")
+COMMAND_TYPES = {
+    "deposit": (DepositCommand, ("name", "to_account", "currency", "value")),
+    "withdraw": (
+        WithdrawCommand,
+        ("name", "from_account", "currency", "value"),
+    ),
+    "transfer": (
+        TransferCommand,
+        ("name", "from_account", "to_account", "currency", "value"),
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream deposits, withdrawals and transfers from CSV or NDJSON file "
+        "and commit them in chunks. Every row needs `type` "
+        "(deposit / withdraw / transfer) and fields of matching command. "
+        "Import is resumed from last committed chunk when run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file")
+        parser.add_argument(
+            "--format",
+            choices=("csv", "ndjson"),
+            help="File format, guessed from file extension by default",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of rows committed in one transaction",
+        )
+        parser.add_argument(
+            "--skip-failed",
+            action="store_true",
+            help="Report invalid rows and keep importing the rest",
+        )
+        parser.add_argument(
+            "--job-name",
+            help="Resume key, absolute file path by default",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or self._guess_format(path)
+        chunk_size = options["chunk_size"]
+
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        job, _ = ImportJob.objects.get_or_create(
+            name=options["job_name"] or os.path.abspath(path)
+        )
+
+        if connection.vendor == "postgresql":
+            usecase = CopyBatchTransferUsecase(
+                skip_failed=options["skip_failed"]
+            )
+        else:
+            usecase = BatchTransferUsecase(skip_failed=options["skip_failed"])
+
+        if job.rows_committed:
+            self.stdout.write(
+                f"Resuming '{job.name}' after {job.rows_committed} rows"
+            )
+
+        imported = failed = 0
+        started = time.monotonic()
+
+        with open(path, newline="") as source:
+            rows = islice(
+                self._read_rows(source, file_format), job.rows_committed, None
+            )
+
+            while chunk := list(islice(rows, chunk_size)):
+                first_row = job.rows_committed + 1
+                commands, rows_of_commands, results = [], [], []
+
+                for index, row in enumerate(chunk):
+                    try:
+                        commands.append(self._parse(row))
+                        rows_of_commands.append(index)
+                    except ValueError as ex:
+                        results.append(
+                            BatchItemResult(
+                                index=index, command=None, exception=ex
+                            )
+                        )
+
+                with transaction.atomic():
+                    self._lock_job(job)
+
+                    if commands and (options["skip_failed"] or not results):
+                        for result in usecase.execute(commands):
+                            result.index = rows_of_commands[result.index]
+                            results.append(result)
+
+                    errors = sorted(
+                        (
+                            result
+                            for result in results
+                            if result.exception is not None
+                        ),
+                        key=lambda result: result.index,
+                    )
+
+                    for result in errors:
+                        self.stderr.write(
+                            f"Row {first_row + result.index}: {result.error}"
+                        )
+
+                    if errors and not options["skip_failed"]:
+                        raise CommandError(
+                            f"Chunk starting at row {first_row} was rolled "
+                            f"back, {job.rows_committed} rows committed"
+                        )
+
+                    job.rows_committed += len(chunk)
+                    job.save(update_fields=["rows_committed", "updated_date"])
+
+                imported += len(chunk) - len(errors)
+                failed += len(errors)
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"Committed {job.rows_committed} rows "
+                    f"({(imported + failed) / elapsed:.0f} rows/sec)"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} rows, {failed} failed, "
+                f"{job.rows_committed} rows committed in total"
+            )
+        )
+
+    def _guess_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+
+        if extension == ".csv":
+            return "csv"
+
+        if extension in (".ndjson", ".jsonl"):
+            return "ndjson"
+
+        raise CommandError(f"Cannot guess format of '{path}', use --format")
+
+    def _read_rows(self, source, file_format):
+        if file_format == "csv":
+            yield from csv.DictReader(source)
+            return
+
+        for line in source:
+            if line.strip():
+                try:
+                    yield json.loads(line, parse_float=Decimal)
+                except ValueError:
+                    # still a row, so row numbers and resuming stay right
+                    yield None
+
+    def _parse(self, row):
+        """
+        Command of row, raises ValueError when row is invalid.
+        """
+        if not isinstance(row, dict):
+            raise ValueError("invalid row")
+
+        try:
+            command_class, fields = COMMAND_TYPES[row.get("type")]
+        except (KeyError, TypeError):
+            raise ValueError(f"unknown command type {row.get('type')!r}")
+
+        values = {}
+
+        for field in fields:
+            if row.get(field) in (None, ""):
+                raise ValueError(f"missing field '{field}'")
+
+            values[field] = row[field]
+
+        for field in ID_FIELDS:
+            if field in values:
+                try:
+                    values[field] = int(str(values[field]).strip())
+                except ValueError:
+                    raise ValueError(f"invalid {field} {values[field]!r}")
+
+        try:
+            values["value"] = Money.parse(values["value"])
+        except ValueError:
+            raise ValueError("invalid value")
+
+        return command_class(**values)
+
+    def _lock_job(self, job):
+        locked = ImportJob.objects.select_for_update().get(pk=job.pk)
+
+        if locked.rows_committed != job.rows_committed:
+            raise CommandError(
+                f"Import job '{job.name}' is run by another process"
+            )
@@ -0,0 +1,86 @@
+import csv
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...exceptions import InvalidExchangeRateException
+from ...queries import currency_queries
+from ...usecases import LoadExchangeRatesCommand, LoadExchangeRatesUsecase
+
+FIELDS = ("from_currency", "to_currency", "rate", "effective_from")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load exchange rates from CSV file with columns from_currency, "
+        "to_currency (currency symbols), rate (units of to_currency for one "
+        "from_currency) and effective_from (ISO date and time, UTC when "
+        "without offset). Rates are added in one transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file")
+
+    def handle(self, *args, **options):
+        currencies = {
+            currency.symbol: currency.pk
+            for currency in currency_queries.get_all()
+        }
+
+        with open(options["path"], newline="") as source:
+            rates = [
+                self._parse(row, currencies, row_number)
+                for row_number, row in enumerate(
+                    csv.DictReader(source), start=1
+                )
+            ]
+
+        try:
+            added = LoadExchangeRatesUsecase().execute(
+                LoadExchangeRatesCommand(rates=rates)
+            )
+        except InvalidExchangeRateException as ex:
+            raise CommandError(str(ex))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Added {added} exchange rates, "
+                f"{len(rates) - added} already loaded"
+            )
+        )
+
+    def _parse(self, row, currencies, row_number):
+        try:
+            from_currency, to_currency, rate, effective_from = (
+                row[field].strip() for field in FIELDS
+            )
+        except (KeyError, AttributeError):
+            raise CommandError(
+                f"Row {row_number}: expected columns {', '.join(FIELDS)}"
+            )
+
+        try:
+            effective_from = datetime.fromisoformat(effective_from)
+            rate = Decimal(rate)
+        except (ValueError, InvalidOperation):
+            raise CommandError(f"Row {row_number}: invalid rate or date")
+
+        if not rate.is_finite():
+            raise CommandError(f"Row {row_number}: invalid rate or date")
+
+        if timezone.is_naive(effective_from):
+            effective_from = timezone.make_aware(
+                effective_from, dt_timezone.utc
+            )
+
+        try:
+            return (
+                currencies[from_currency],
+                currencies[to_currency],
+                rate,
+                effective_from,
+            )
+        except KeyError as ex:
+            raise CommandError(f"Row {row_number}: unknown currency {ex}")
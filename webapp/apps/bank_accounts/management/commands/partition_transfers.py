@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ...partitions import (
+    add_months,
+    convert_to_partitioned,
+    create_partitions,
+    current_month,
+    is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "PostgreSQL only. Create monthly transfer partitions ahead of time, "
+        "run it at least monthly. With --convert, first turn plain transfer "
+        "table into partitioned one; that locks the table until all rows "
+        "are copied, run it in maintenance window."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Convert plain transfer table to partitioned one",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=settings.TRANSFER_PARTITIONS_AHEAD,
+            help="Number of future months to create partitions for",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Partitioning needs PostgreSQL")
+
+        if options["convert"]:
+            if is_partitioned():
+                raise CommandError("Transfer table is already partitioned")
+
+            convert_to_partitioned(options["ahead"])
+            self.stdout.write(
+                self.style.SUCCESS("Transfer table is partitioned by month")
+            )
+
+        elif not is_partitioned():
+            raise CommandError(
+                "Transfer table is not partitioned, run with --convert first"
+            )
+
+        month = current_month()
+        created = create_partitions(month, add_months(month, options["ahead"]))
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {len(created)} partitions")
+        )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from ...usecases.idempotency import idempotency_keys
+
+
+class Command(BaseCommand):
+    help = "Delete expired idempotency keys in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of keys deleted in one transaction",
+        )
+
+    def handle(self, *args, **options):
+        purged = idempotency_keys.purge_expired(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {purged} expired idempotency keys")
+        )
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from ...models import Account
+from ...usecases import RebuildDailyStatsCommand, RebuildDailyStatsUsecase
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute daily account stats from journal. Accounts are split "
+        "into chunks rebuilt in parallel, each in its own transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of chunks rebuilt at the same time",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of accounts rebuilt in one transaction",
+        )
+
+    def handle(self, *args, **options):
+        ids = list(Account.objects.order_by("pk").values_list("pk", flat=True))
+        chunks = self._chunks(iter(ids), options["chunk_size"])
+
+        if options["workers"] > 1:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                created = sum(pool.map(self._rebuild_in_thread, chunks))
+        else:
+            created = sum(map(self._rebuild, chunks))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {created} daily stats rows")
+        )
+
+    def _rebuild(self, account_ids):
+        return RebuildDailyStatsUsecase().execute(
+            RebuildDailyStatsCommand(account_ids=account_ids)
+        )
+
+    def _rebuild_in_thread(self, account_ids):
+        try:
+            return self._rebuild(account_ids)
+        finally:
+            connection.close()
+
+    def _chunks(self, ids, size):
+        while chunk := tuple(islice(ids, size)):
+            yield chunk
@@ -0,0 +1,145 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import Max, Min
+
+from ...models import Account
+from ...queries import balance_queries
+from ...usecases import RepairBalancesCommand, RepairBalancesUsecase
+
+
+def reconcile_range(first_id, last_id):
+    """
+    Check accounts with ids in `[first_id, last_id]`. Reads run in one
+    read only snapshot on PostgreSQL, so balances and transfers agree even
+    while writes go on. Returns `(pid, accounts, transfers, seconds,
+    drifted ledger balances)`.
+    """
+    started = time.monotonic()
+    snapshot = (
+        connection.vendor == "postgresql" and not connection.in_atomic_block
+    )
+
+    with transaction.atomic():
+        if snapshot:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"
+                )
+
+        ledger = balance_queries.get_ledger("range", (first_id, last_id))
+
+    return (
+        os.getpid(),
+        len(ledger),
+        sum(balance.transfers for balance in ledger),
+        time.monotonic() - started,
+        [balance for balance in ledger if balance.drift],
+    )
+
+
+def init_worker():
+    # every worker process opens its own connection on first query
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that balance of every account equals its opening balance "
+        "plus incoming minus outgoing transfers. Accounts are split into "
+        "id ranges checked in parallel worker processes, each with its "
+        "own database connection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of worker processes, 0 checks in this process",
+        )
+        parser.add_argument(
+            "--range-size",
+            type=int,
+            default=10000,
+            help="Number of account ids checked in one task",
+        )
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Rewrite drifted balances, under lock, to expected ones",
+        )
+
+    def handle(self, *args, **options):
+        bounds = Account.objects.aggregate(first=Min("pk"), last=Max("pk"))
+
+        if bounds["first"] is None:
+            self.stdout.write("No accounts to reconcile")
+            return
+
+        size = options["range_size"]
+        firsts = list(range(bounds["first"], bounds["last"] + 1, size))
+        lasts = [first + size - 1 for first in firsts]
+        started = time.monotonic()
+
+        if options["workers"]:
+            # forked workers must not share connection of this process
+            connections.close_all()
+
+            with ProcessPoolExecutor(
+                max_workers=options["workers"], initializer=init_worker
+            ) as pool:
+                results = list(pool.map(reconcile_range, firsts, lasts))
+        else:
+            results = list(map(reconcile_range, firsts, lasts))
+
+        elapsed = time.monotonic() - started
+        drifted = [balance for *_, found in results for balance in found]
+        self._report(results, elapsed)
+
+        for balance in drifted:
+            self.stdout.write(
+                f"Account {balance.account_id}: balance {balance.balance}, "
+                f"expected {balance.expected} (drift {balance.drift})"
+            )
+
+        if drifted and options["repair"]:
+            repaired = RepairBalancesUsecase().execute(
+                RepairBalancesCommand(
+                    account_ids=tuple(b.account_id for b in drifted)
+                )
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Repaired {len(repaired)} accounts")
+            )
+        elif drifted:
+            raise CommandError(f"{len(drifted)} accounts out of balance")
+        else:
+            self.stdout.write(self.style.SUCCESS("All accounts balance"))
+
+    def _report(self, results, elapsed):
+        workers = defaultdict(lambda: [0, 0, 0, 0.0])
+
+        for pid, accounts, transfers, seconds, _ in results:
+            worker = workers[pid]
+            worker[0] += 1
+            worker[1] += accounts
+            worker[2] += transfers
+            worker[3] += seconds
+
+        for pid, (ranges, accounts, transfers, seconds) in workers.items():
+            self.stdout.write(
+                f"Worker {pid}: {ranges} ranges, {accounts} accounts, "
+                f"{transfers} transfers, "
+                f"{transfers / seconds if seconds else 0:.0f} transfers/sec"
+            )
+
+        self.stdout.write(
+            f"Checked {sum(r[1] for r in results)} accounts in "
+            f"{elapsed:.1f} s"
+        )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Account
+from ...usecases import SetBalanceSlotsCommand, SetBalanceSlotsUsecase
+
+
+class Command(BaseCommand):
+    help = (
+        "Spread funds of hot account across balance slots, "
+        "or fold them back into single row with --slots 0"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("account", type=int, help="Account id")
+        parser.add_argument(
+            "--slots",
+            type=int,
+            default=16,
+            help="Number of balance slots, 0 turns sharding off",
+        )
+
+    def handle(self, *args, **options):
+        command = SetBalanceSlotsCommand(
+            account=options["account"], slots=options["slots"]
+        )
+
+        try:
+            account = SetBalanceSlotsUsecase().execute(command)
+        except (Account.DoesNotExist, ValueError) as e:
+            raise CommandError(e)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Account {account.pk} uses {account.balance_slots} "
+                f"balance slots"
+            )
+        )
@@ -0,0 +1,55 @@
+# Generated by Django 4.0.3 on 2026-10-18 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="Name"
+                    ),
+                ),
+                (
+                    "rows_committed",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Rows committed"
+                    ),
+                ),
+                (
+                    "created_date",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Created date"
+                    ),
+                ),
+                (
+                    "updated_date",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Updated date"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Import job",
+                "verbose_name_plural": "Import jobs",
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.0.3 on 2026-10-18 12:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0002_import_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        max_length=64, unique=True, verbose_name="Key"
+                    ),
+                ),
+                (
+                    "created_date",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        verbose_name="Created date",
+                    ),
+                ),
+                (
+                    "transfer",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="idempotency_keys",
+                        to="bank_accounts.transfer",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Idempotency key",
+                "verbose_name_plural": "Idempotency keys",
+            },
+        ),
+    ]
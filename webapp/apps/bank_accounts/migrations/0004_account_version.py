@@ -0,0 +1,20 @@
+# Generated by Django 4.0.3 on 2026-10-18 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0003_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="version",
+            field=models.PositiveBigIntegerField(
+                default=0, verbose_name="Version"
+            ),
+        ),
+    ]
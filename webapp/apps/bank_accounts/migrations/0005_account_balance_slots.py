@@ -0,0 +1,66 @@
+# Generated by Django 4.0.3 on 2026-10-18 12:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0004_account_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="balance_slots",
+            field=models.PositiveSmallIntegerField(
+                default=0, verbose_name="Balance slots"
+            ),
+        ),
+        migrations.CreateModel(
+            name="AccountBalanceSlot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "slot",
+                    models.PositiveSmallIntegerField(verbose_name="Slot"),
+                ),
+                (
+                    "funds",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=6,
+                        verbose_name="Funds",
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slots",
+                        to="bank_accounts.account",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Account balance slot",
+                "verbose_name_plural": "Account balance slots",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="accountbalanceslot",
+            constraint=models.UniqueConstraint(
+                fields=("account", "slot"), name="unique_account_slot"
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.0.3 on 2026-10-18 12:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0005_account_balance_slots"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("as_of", models.DateTimeField(verbose_name="As of")),
+                (
+                    "balance",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=6, verbose_name="Balance"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Balance checkpoint",
+                "verbose_name_plural": "Balance checkpoints",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="transfer",
+            index=models.Index(
+                fields=["from_account", "transfer_date"],
+                name="transfer_from_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transfer",
+            index=models.Index(
+                fields=["to_account", "transfer_date"],
+                name="transfer_to_date_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="balancecheckpoint",
+            name="account",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="checkpoints",
+                to="bank_accounts.account",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="balancecheckpoint",
+            constraint=models.UniqueConstraint(
+                fields=("account", "as_of"), name="unique_account_checkpoint"
+            ),
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 4.0.3 on 2026-10-18 12:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_entries(apps, schema_editor):
+    Account = apps.get_model("bank_accounts", "Account")
+    AccountEntry = apps.get_model("bank_accounts", "AccountEntry")
+    Transfer = apps.get_model("bank_accounts", "Transfer")
+
+    for account in Account.objects.order_by("pk").iterator():
+        transfers = list(
+            Transfer.objects.filter(
+                models.Q(from_account=account) | models.Q(to_account=account)
+            ).order_by("transfer_date", "pk")
+        )
+        amounts = [
+            t.value if t.to_account_id == account.pk else -t.value
+            for t in transfers
+        ]
+        # walk forward from balance before first transfer, hot accounts
+        # (funds spread across slots) do not record balance
+        balance = account.funds - sum(amounts)
+        entries = []
+
+        for transfer, amount in zip(transfers, amounts):
+            balance += amount
+            entries.append(
+                AccountEntry(
+                    account=account,
+                    transfer=transfer,
+                    amount=amount,
+                    balance=None if account.balance_slots else balance,
+                )
+            )
+
+        AccountEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0006_balance_checkpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AccountEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=6, verbose_name="Amount"
+                    ),
+                ),
+                (
+                    "balance",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=6,
+                        null=True,
+                        verbose_name="Balance",
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="entries",
+                        to="bank_accounts.account",
+                    ),
+                ),
+                (
+                    "transfer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="entries",
+                        to="bank_accounts.transfer",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Account entry",
+                "verbose_name_plural": "Account entries",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="accountentry",
+            index=models.Index(
+                fields=["account", "id"], name="entry_account_id_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+INDEX_NAME = "account_name_upper_like_idx"
+
+
+def create_index(apps, schema_editor):
+    # `name__istartswith` is compiled to `UPPER("name"::text) LIKE ...`,
+    # only pattern ops index on same expression serves it on PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON bank_accounts_account "
+        "(UPPER(name::text) text_pattern_ops)"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0007_account_entry"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
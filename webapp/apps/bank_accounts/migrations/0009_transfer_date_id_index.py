@@ -0,0 +1,19 @@
+# Generated by Django 4.0.3 on 2026-10-18 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0008_account_name_prefix_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transfer",
+            index=models.Index(
+                fields=["transfer_date", "id"], name="transfer_date_id_idx"
+            ),
+        ),
+    ]
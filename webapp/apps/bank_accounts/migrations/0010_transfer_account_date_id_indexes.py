@@ -0,0 +1,42 @@
+# Generated by Django 4.0.3 on 2026-10-18 13:09
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # transfer table is large and written all the time, indexes are built
+    # and dropped without blocking writes, which cannot run in transaction
+    atomic = False
+
+    dependencies = [
+        ("bank_accounts", "0009_transfer_date_id_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="transfer",
+            index=models.Index(
+                fields=["from_account", "transfer_date", "id"],
+                name="transfer_from_date_id_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="transfer",
+            index=models.Index(
+                fields=["to_account", "transfer_date", "id"],
+                name="transfer_to_date_id_idx",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="transfer",
+            name="transfer_from_date_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="transfer",
+            name="transfer_to_date_idx",
+        ),
+    ]
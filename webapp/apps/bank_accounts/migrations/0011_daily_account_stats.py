@@ -0,0 +1,78 @@
+# Generated by Django 4.0.3 on 2026-10-18 13:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0010_transfer_account_date_id_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyAccountStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Day")),
+                (
+                    "inflow",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Inflow",
+                    ),
+                ),
+                (
+                    "outflow",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Outflow",
+                    ),
+                ),
+                (
+                    "transfers_in",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Incoming transfers"
+                    ),
+                ),
+                (
+                    "transfers_out",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Outgoing transfers"
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="bank_accounts.account",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily account stats",
+                "verbose_name_plural": "Daily account stats",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyaccountstats",
+            constraint=models.UniqueConstraint(
+                fields=("account", "day"), name="unique_account_day_stats"
+            ),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 4.0.3 on 2026-10-18 13:30
+
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Round
+
+import apps.bank_accounts.money
+
+# (model, field, field options)
+MONEY_FIELDS = [
+    ("account", "funds", {"default": 0, "verbose_name": "Funds"}),
+    (
+        "accountbalanceslot",
+        "funds",
+        {"default": 0, "verbose_name": "Funds"},
+    ),
+    ("accountentry", "amount", {"verbose_name": "Amount"}),
+    (
+        "accountentry",
+        "balance",
+        {"blank": True, "null": True, "verbose_name": "Balance"},
+    ),
+    ("balancecheckpoint", "balance", {"verbose_name": "Balance"}),
+    (
+        "dailyaccountstats",
+        "inflow",
+        {"default": 0, "verbose_name": "Inflow"},
+    ),
+    (
+        "dailyaccountstats",
+        "outflow",
+        {"default": 0, "verbose_name": "Outflow"},
+    ),
+    ("transfer", "value", {"verbose_name": "value"}),
+]
+
+
+def to_minor_units(apps, schema_editor):
+    for model_name, name, _ in MONEY_FIELDS:
+        apps.get_model("bank_accounts", model_name).objects.update(
+            **{name: Round(F(name) * 100)}
+        )
+
+
+def to_major_units(apps, schema_editor):
+    for model_name, name, _ in MONEY_FIELDS:
+        apps.get_model("bank_accounts", model_name).objects.update(
+            **{name: Round(F(name) / Value(100.0), 2)}
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Money columns become bigint numbers of cents. Columns are widened
+    first, so amounts fit once multiplied, then converted in place. Every
+    row of transfer table is rewritten, run it in maintenance window.
+    """
+
+    dependencies = [
+        ("bank_accounts", "0011_daily_account_stats"),
+    ]
+
+    operations = [
+        *[
+            migrations.AlterField(
+                model_name=model_name,
+                name=name,
+                field=models.DecimalField(
+                    max_digits=20, decimal_places=2, **options
+                ),
+            )
+            for model_name, name, options in MONEY_FIELDS
+        ],
+        migrations.RunPython(to_minor_units, to_major_units),
+        *[
+            migrations.AlterField(
+                model_name=model_name,
+                name=name,
+                field=apps.bank_accounts.money.MoneyField(**options),
+            )
+            for model_name, name, options in MONEY_FIELDS
+        ],
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.0.3 on 2026-10-18 13:38
+
+import apps.bank_accounts.money
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0012_money_minor_units"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transfer",
+            name="to_value",
+            field=apps.bank_accounts.money.MoneyField(
+                blank=True, null=True, verbose_name="to value"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ExchangeRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "rate",
+                    models.DecimalField(
+                        decimal_places=12, max_digits=24, verbose_name="Rate"
+                    ),
+                ),
+                (
+                    "effective_from",
+                    models.DateTimeField(verbose_name="Effective from"),
+                ),
+                (
+                    "from_currency",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rates_from",
+                        to="bank_accounts.currency",
+                        verbose_name="From currency",
+                    ),
+                ),
+                (
+                    "to_currency",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rates_to",
+                        to="bank_accounts.currency",
+                        verbose_name="To currency",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Exchange rate",
+                "verbose_name_plural": "Exchange rates",
+            },
+        ),
+        migrations.AddField(
+            model_name="transfer",
+            name="exchange_rate",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="transfers",
+                to="bank_accounts.exchangerate",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="exchangerate",
+            constraint=models.UniqueConstraint(
+                fields=("from_currency", "to_currency", "effective_from"),
+                name="unique_exchange_rate_pair_date",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.0.3 on 2026-10-18 13:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0013_exchange_rates"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="dailyaccountstats",
+            name="unique_account_day_stats",
+        ),
+        migrations.AddField(
+            model_name="dailyaccountstats",
+            name="slot",
+            field=models.PositiveSmallIntegerField(
+                default=0, verbose_name="Slot"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyaccountstats",
+            constraint=models.UniqueConstraint(
+                fields=("account", "day", "slot"),
+                name="unique_account_day_slot_stats",
+            ),
+        ),
+    ]
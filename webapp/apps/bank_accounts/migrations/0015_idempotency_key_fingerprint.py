@@ -0,0 +1,23 @@
+# Generated by Django 4.0.3 on 2026-10-18 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bank_accounts", "0014_daily_stats_slots"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="idempotencykey",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True,
+                default="",
+                max_length=64,
+                verbose_name="Fingerprint",
+            ),
+        ),
+    ]
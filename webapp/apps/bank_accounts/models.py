@@ -1,5 +1,7 @@
 from django.db import models
 
+from .money import MoneyField
+
 
 class Currency(models.Model):
     symbol = models.CharField(max_length=3, unique=True, verbose_name="Symbol")
@@ -23,8 +25,10 @@ class Account(models.Model):
         related_name="account_currency",
         verbose_name="Currency",
     )
-    funds = models.DecimalField(
-        max_digits=6, decimal_places=2, default=0, verbose_name="Funds"
+    funds = MoneyField(default=0, verbose_name="Funds")
+    version = models.PositiveBigIntegerField(default=0, verbose_name="Version")
+    balance_slots = models.PositiveSmallIntegerField(
+        default=0, verbose_name="Balance slots"
     )
     created_date = models.DateTimeField(
         auto_now_add=True, verbose_name="Created date"
@@ -38,6 +42,71 @@ class Account(models.Model):
         return f"{self.name}"
 
 
+class AccountBalanceSlot(models.Model):
+    """
+    Part of balance of "hot" account. Balance of account with
+    `balance_slots > 0` is `Account.funds` plus sum of its slots.
+    """
+
+    account = models.ForeignKey(
+        Account, on_delete=models.CASCADE, related_name="slots"
+    )
+    slot = models.PositiveSmallIntegerField(verbose_name="Slot")
+    funds = MoneyField(default=0, verbose_name="Funds")
+
+    class Meta:
+        verbose_name = "Account balance slot"
+        verbose_name_plural = "Account balance slots"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "slot"], name="unique_account_slot"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.account} [{self.slot}]: {self.funds}"
+
+
+class ExchangeRate(models.Model):
+    """
+    Units of `to_currency` given for one unit of `from_currency`. Rate is
+    in effect from `effective_from` until next rate of same pair.
+    """
+
+    from_currency = models.ForeignKey(
+        Currency,
+        on_delete=models.CASCADE,
+        related_name="rates_from",
+        verbose_name="From currency",
+    )
+    to_currency = models.ForeignKey(
+        Currency,
+        on_delete=models.CASCADE,
+        related_name="rates_to",
+        verbose_name="To currency",
+    )
+    rate = models.DecimalField(
+        max_digits=24, decimal_places=12, verbose_name="Rate"
+    )
+    effective_from = models.DateTimeField(verbose_name="Effective from")
+
+    class Meta:
+        verbose_name = "Exchange rate"
+        verbose_name_plural = "Exchange rates"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["from_currency", "to_currency", "effective_from"],
+                name="unique_exchange_rate_pair_date",
+            )
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.from_currency_id} -> {self.to_currency_id} "
+            f"@ {self.effective_from}: {self.rate}"
+        )
+
+
 class Transfer(models.Model):
     from_account = models.ForeignKey(
         Account,
@@ -57,9 +126,17 @@ class Transfer(models.Model):
     currency = models.ForeignKey(
         Currency, on_delete=models.CASCADE, related_name="currency"
     )
-    value = models.DecimalField(
-        max_digits=6, decimal_places=2, verbose_name="value"
+    value = MoneyField(verbose_name="value")
+    # set when accounts have different currencies: `value` is in currency
+    # of source account, target account is credited with `to_value`
+    exchange_rate = models.ForeignKey(
+        ExchangeRate,
+        on_delete=models.PROTECT,
+        blank=True,
+        null=True,
+        related_name="transfers",
     )
+    to_value = MoneyField(blank=True, null=True, verbose_name="to value")
     transfer_date = models.DateTimeField(
         auto_now_add=True, verbose_name="transfer date"
     )
@@ -67,9 +144,175 @@ class Transfer(models.Model):
     class Meta:
         verbose_name = "Transfer"
         verbose_name_plural = "Transfers"
+        indexes = [
+            models.Index(
+                fields=["from_account", "transfer_date", "id"],
+                name="transfer_from_date_id_idx",
+            ),
+            models.Index(
+                fields=["to_account", "transfer_date", "id"],
+                name="transfer_to_date_id_idx",
+            ),
+            models.Index(
+                fields=["transfer_date", "id"], name="transfer_date_id_idx"
+            ),
+        ]
 
     def __str__(self):
         return (
             f"Moved: {self.value}{self.currency}\n"
             f"{self.from_account} -> {self.to_account}"
         )
+
+    @property
+    def credited_value(self):
+        """
+        Amount target account receives, in its own currency.
+        """
+        return self.value if self.to_value is None else self.to_value
+
+
+class AccountEntry(models.Model):
+    """
+    One account side of a `Transfer`: signed amount and account balance
+    right after it. Entries of account are ordered by id, so statements
+    and daily stats rebuild are range scans of `(account, id)` index.
+    History pages by date over `(account, transfer_date, id)` indexes of
+    `Transfer` instead, as archived months keep no entries. `balance` is
+    empty for hot accounts, which are written without account row lock.
+    """
+
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name="entries",
+    )
+    transfer = models.ForeignKey(
+        Transfer, on_delete=models.CASCADE, related_name="entries"
+    )
+    amount = MoneyField(verbose_name="Amount")
+    balance = MoneyField(
+        blank=True,
+        null=True,
+        verbose_name="Balance",
+    )
+
+    class Meta:
+        verbose_name = "Account entry"
+        verbose_name_plural = "Account entries"
+        indexes = [
+            models.Index(fields=["account", "id"], name="entry_account_id_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.account}: {self.amount} ({self.balance})"
+
+
+class BalanceCheckpoint(models.Model):
+    """
+    Balance of account including every transfer up to `as_of`. Balance at
+    any later moment is checkpoint plus transfers made after it.
+    """
+
+    account = models.ForeignKey(
+        Account, on_delete=models.CASCADE, related_name="checkpoints"
+    )
+    as_of = models.DateTimeField(verbose_name="As of")
+    balance = MoneyField(verbose_name="Balance")
+
+    class Meta:
+        verbose_name = "Balance checkpoint"
+        verbose_name_plural = "Balance checkpoints"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "as_of"], name="unique_account_checkpoint"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.account} @ {self.as_of}: {self.balance}"
+
+
+class DailyAccountStats(models.Model):
+    """
+    Money moved in and out of account during one day, kept up to date by
+    usecases together with journal entries. Hot accounts write into one of
+    `balance_slots` rows of the day, so their writers do not queue on one
+    row, stats of a day are sum of its slots.
+    """
+
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name="daily_stats",
+    )
+    day = models.DateField(verbose_name="Day")
+    slot = models.PositiveSmallIntegerField(default=0, verbose_name="Slot")
+    inflow = MoneyField(default=0, verbose_name="Inflow")
+    outflow = MoneyField(default=0, verbose_name="Outflow")
+    transfers_in = models.PositiveIntegerField(
+        default=0, verbose_name="Incoming transfers"
+    )
+    transfers_out = models.PositiveIntegerField(
+        default=0, verbose_name="Outgoing transfers"
+    )
+
+    class Meta:
+        verbose_name = "Daily account stats"
+        verbose_name_plural = "Daily account stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "day", "slot"],
+                name="unique_account_day_slot_stats",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.account} @ {self.day}: +{self.inflow} -{self.outflow}"
+
+
+class ImportJob(models.Model):
+    name = models.CharField(max_length=255, unique=True, verbose_name="Name")
+    rows_committed = models.PositiveBigIntegerField(
+        default=0, verbose_name="Rows committed"
+    )
+    created_date = models.DateTimeField(
+        auto_now_add=True, verbose_name="Created date"
+    )
+    updated_date = models.DateTimeField(
+        auto_now=True, verbose_name="Updated date"
+    )
+
+    class Meta:
+        verbose_name = "Import job"
+        verbose_name_plural = "Import jobs"
+
+    def __str__(self):
+        return f"{self.name} ({self.rows_committed} rows)"
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=64, unique=True, verbose_name="Key")
+    # hash of usecase command key was used with, empty for older keys
+    fingerprint = models.CharField(
+        max_length=64, blank=True, default="", verbose_name="Fingerprint"
+    )
+    transfer = models.ForeignKey(
+        Transfer,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="idempotency_keys",
+    )
+    created_date = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name="Created date"
+    )
+
+    class Meta:
+        verbose_name = "Idempotency key"
+        verbose_name_plural = "Idempotency keys"
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,82 @@
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+
+from django.db import models
+
+MINOR_UNITS = 100
+MAX_MINOR_UNITS = 2**63 - 1
+
+
+class Money(int):
+    """
+    Amount of money as integer number of minor units (cents). Major units
+    appear only at edges: `parse` of user input and `str` for display.
+    Arithmetic is inherited from int untouched, so usecases add and
+    subtract at C speed and get plain int cents back; wrap results which
+    are shown to users in `Money` again.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, value):
+        """
+        `Money` of amount in major units given as str or `Decimal`, e.g.
+        "12.3". Raises ValueError for more than two decimal places or
+        amount out of range.
+        """
+        try:
+            amount = Decimal(str(value).strip())
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount {value!r}")
+
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount {value!r}")
+
+        cents = amount * MINOR_UNITS
+
+        if cents != cents.to_integral_value() or abs(cents) > MAX_MINOR_UNITS:
+            raise ValueError(f"Invalid amount {value!r}")
+
+        return cls(int(cents))
+
+    def __str__(self):
+        units, cents = divmod(abs(int(self)), MINOR_UNITS)
+        sign = "-" if self < 0 else ""
+        return f"{sign}{units}.{cents:02d}"
+
+    def __repr__(self):
+        return f"Money({int(self)})"
+
+    def convert(self, rate):
+        """
+        Amount in other currency at `Decimal` exchange rate, rounded half
+        to even to whole minor units.
+        """
+        amount = (Decimal(int(self)) * rate).to_integral_value(ROUND_HALF_EVEN)
+        return Money(int(amount))
+
+
+class MoneyField(models.BigIntegerField):
+    """
+    `Money` stored as bigint number of minor units.
+    """
+
+    description = "Amount of money in minor units"
+
+    def from_db_value(self, value, expression, connection):
+        # PostgreSQL sums bigints into numeric
+        return None if value is None else Money(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, Money):
+            return value
+
+        return Money(super().to_python(value))
+
+    def get_prep_value(self, value):
+        if isinstance(value, (Decimal, float)):
+            raise TypeError(
+                f"Money must be given in minor units, got {value!r}"
+            )
+
+        return super().get_prep_value(value)
@@ -0,0 +1,176 @@
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Transfer
+
+TABLE = Transfer._meta.db_table
+PARTITION_PREFIX = f"{TABLE}_p"
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{PARTITION_PREFIX}{month:%Y_%m}"
+
+
+def partition_month(name):
+    year, month = name[len(PARTITION_PREFIX) :].split("_")
+    return date(int(year), int(month), 1)
+
+
+def current_month():
+    return timezone.now().date().replace(day=1)
+
+
+def is_partitioned():
+    if connection.vendor != "postgresql":
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = %s::regclass",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def get_partitions():
+    """
+    Months of attached partitions, oldest first.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = %s::regclass",
+            [TABLE],
+        )
+        return sorted(partition_month(name) for (name,) in cursor.fetchall())
+
+
+def create_partitions(first_month, last_month):
+    """
+    Create missing partitions for months `first_month..last_month`,
+    returns months of created ones.
+    """
+    existing = set(get_partitions())
+    created = []
+    month = first_month
+
+    with connection.cursor() as cursor:
+        while month <= last_month:
+            if month not in existing:
+                cursor.execute(
+                    f"CREATE TABLE {_quote(partition_name(month))} "
+                    f"PARTITION OF {_quote(TABLE)} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    [month, add_months(month, 1)],
+                )
+                created.append(month)
+
+            month = add_months(month, 1)
+
+    return created
+
+
+def convert_to_partitioned(months_ahead):
+    """
+    Replace plain transfer table with one partitioned by month of
+    `transfer_date`, holding same rows, indexes and foreign keys. Table is
+    locked for whole conversion, run it in maintenance window.
+
+    Primary key becomes `(id, transfer_date)`, as it must contain partition
+    key, and other tables cannot have foreign keys to partitioned table.
+    Journal entries and idempotency keys keep transfer ids without database
+    constraint, usecases write them in same transaction as transfers.
+    """
+    old_table = f"{TABLE}_unpartitioned"
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {_quote(TABLE)} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s "
+            "AND indexname NOT IN (SELECT conname FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'p')",
+            [TABLE, TABLE],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE confrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+
+        for table, constraint in cursor.fetchall():
+            cursor.execute(
+                f"ALTER TABLE {table} DROP CONSTRAINT {_quote(constraint)}"
+            )
+
+        cursor.execute(
+            f"ALTER TABLE {_quote(TABLE)} RENAME TO {_quote(old_table)}"
+        )
+        cursor.execute(
+            f"CREATE TABLE {_quote(TABLE)} "
+            f"(LIKE {_quote(old_table)} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (transfer_date)"
+        )
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [old_table])
+        (sequence,) = cursor.fetchone()
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id")
+        cursor.execute(
+            f"SELECT min(transfer_date)::date FROM {_quote(old_table)}"
+        )
+        (oldest,) = cursor.fetchone()
+        first_month = (oldest or current_month()).replace(day=1)
+        create_partitions(
+            first_month, add_months(current_month(), months_ahead)
+        )
+        cursor.execute(
+            f"INSERT INTO {_quote(TABLE)} SELECT * FROM {_quote(old_table)}"
+        )
+        cursor.execute(f"DROP TABLE {_quote(old_table)}")
+        cursor.execute(
+            f"ALTER TABLE {_quote(TABLE)} "
+            f"ADD CONSTRAINT {_quote(TABLE + '_pkey')} "
+            "PRIMARY KEY (id, transfer_date)"
+        )
+
+        for definition in index_definitions:
+            cursor.execute(definition)
+
+        for constraint, definition in foreign_keys:
+            cursor.execute(
+                f"ALTER TABLE {_quote(TABLE)} "
+                f"ADD CONSTRAINT {_quote(constraint)} {definition}"
+            )
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {_quote(TABLE)}")
+
+
+def detach_partition(month):
+    """
+    Detach partition without blocking reads and writes of the rest of the
+    table. Must not run inside transaction.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {_quote(TABLE)} DETACH PARTITION "
+            f"{_quote(partition_name(month))} CONCURRENTLY"
+        )
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
@@ -1,9 +1,31 @@
 from .accounts import AccountQueries
+from .balances import BalanceQueries
 from .currencies import CurrencyQueries
+from .daily_stats import DailyAccountStatsQueries
+from .entries import AccountEntryQueries
+from .exchange_rates import ExchangeRateQueries
+from .idempotency import IdempotencyKeyQueries
+from .summary import SummaryQueries
 from .transfers import TransferQueries
 
 account_queries = AccountQueries()
+balance_queries = BalanceQueries()
 currency_queries = CurrencyQueries()
+daily_stats_queries = DailyAccountStatsQueries()
+entry_queries = AccountEntryQueries()
+exchange_rate_queries = ExchangeRateQueries()
+idempotency_key_queries = IdempotencyKeyQueries()
+summary_queries = SummaryQueries()
 transfer_queries = TransferQueries()
 
-__all__ = ["account_queries", "currency_queries", "transfer_queries"]
+__all__ = [
+    "account_queries",
+    "balance_queries",
+    "currency_queries",
+    "daily_stats_queries",
+    "entry_queries",
+    "exchange_rate_queries",
+    "idempotency_key_queries",
+    "summary_queries",
+    "transfer_queries",
+]
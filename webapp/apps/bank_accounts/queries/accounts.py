@@ -1,6 +1,260 @@
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce
+
 from ..models import Account
-from .base import BaseQuery
+from ..money import MoneyField
+from .balance_slots import BalanceSlotQueries
+from .base import BaseQuery, reference_cache
+from .pagination import NEXT, PREVIOUS, decode_cursor, keyset_page
+
+
+@dataclass(frozen=True, slots=True)
+class AccountMetadata:
+    """
+    Rarely changing part of `Account`, served from cache. Never holds
+    `funds`, those are always read fresh.
+    """
+
+    pk: int
+    name: str
+    currency_id: int
+    balance_slots: int
 
 
 class AccountQueries(BaseQuery):
+    """
+    Funds of "hot" accounts (`balance_slots > 0`) are spread across
+    `AccountBalanceSlot` rows. Accounts returned by `get_many` /
+    `get_for_update*` have `funds` set to their full balance, and
+    `save_funds` writes changes of hot accounts into slots, so usecases
+    do not need to care which accounts are hot.
+    """
+
     model = Account
+    slot_queries = BalanceSlotQueries()
+    metadata_cache = reference_cache("account_metadata")
+
+    def get_metadata(self, idx):
+        """
+        Cached `AccountMetadata` of account, raises `DoesNotExist` like
+        `get_by_id`. Lets usecases check existence and currency of account
+        without a SELECT.
+        """
+        return self.metadata_cache.get_or_load(
+            int(idx), lambda: self._load_metadata(idx)
+        )
+
+    def get_all_with_balance(self):
+        return self.get_all().annotate(
+            balance=F("funds")
+            + Coalesce(
+                Sum("slots__funds"),
+                Value(0),
+                output_field=MoneyField(),
+            )
+        )
+
+    def get_page(self, limit, cursor=None, direction=NEXT):
+        """
+        Keyset page of accounts with balance, ordered by id.
+        """
+        accounts = self.get_all_with_balance().select_related("currency")
+
+        if cursor is not None:
+            (idx,) = decode_cursor(cursor, int)
+
+            if direction == PREVIOUS:
+                accounts = accounts.filter(pk__lt=idx).order_by("-pk")
+            else:
+                accounts = accounts.filter(pk__gt=idx)
+
+        return keyset_page(
+            list(accounts[: limit + 1]),
+            limit,
+            cursor,
+            direction,
+            key=lambda account: (account.pk,),
+        )
+
+    def search_by_name(self, prefix, limit):
+        """
+        Accounts whose name starts with `prefix` (case insensitive), for
+        autocomplete. On PostgreSQL served by `UPPER(name)` pattern index.
+        """
+        return list(
+            self.model.objects.filter(name__istartswith=prefix)
+            .order_by("name")
+            .values("id", "name", "currency_id")[:limit]
+        )
+
+    def get_many(self, *ids):
+        """
+        Return given accounts in requested order, without locking them.
+        """
+        accounts = self.model.objects.in_bulk(ids)
+        self._load_slot_funds(accounts.values())
+        return self._in_order(ids, accounts)
+
+    def get_for_update(self, *ids):
+        """
+        Lock given accounts with `SELECT ... FOR UPDATE` and return them
+        in requested order. Rows are always locked in ascending id order,
+        so concurrent writers touching same accounts cannot deadlock.
+        Must be called inside `transaction.atomic()`.
+        """
+        return self._in_order(ids, self.get_for_update_in_bulk(ids))
+
+    def get_for_update_in_bulk(self, ids):
+        """
+        Same locking rules as `get_for_update`, but returns `{id: account}`
+        mapping and silently skips ids which do not exist. Rows of hot
+        accounts are not locked, their slots are locked only when written.
+        """
+        accounts = {
+            acc.pk: acc
+            for acc in self.model.objects.select_for_update()
+            .filter(pk__in=ids, balance_slots=0)
+            .order_by("pk")
+        }
+
+        if len(accounts) < len(set(ids)):
+            hot_accounts = self.model.objects.filter(
+                pk__in=ids, balance_slots__gt=0
+            )
+            self._load_slot_funds(hot_accounts)
+            accounts.update((acc.pk, acc) for acc in hot_accounts)
+
+        return accounts
+
+    def save_funds(self, account):
+        """
+        Compare-and-swap write of account funds. Bumps `version` and returns
+        False when account was changed since it was read. Hot accounts
+        apply difference to their slots instead and return False only when
+        they do not have enough funds anymore.
+        """
+        if account.balance_slots:
+            return self._save_slot_funds(account)
+
+        updated = self.model.objects.filter(
+            pk=account.pk, version=account.version
+        ).update(funds=account.funds, version=F("version") + 1)
+
+        if updated:
+            account.version += 1
+
+        return bool(updated)
+
+    def debit(self, idx, currency, value):
+        """
+        Subtract `value` from account funds with single conditional
+        UPDATE. Returns new funds or None when account does not exist,
+        has different currency, does not have enough funds or is hot.
+        """
+        return self._update_funds_returning(
+            "UPDATE {table} SET funds = funds - %s, version = version + 1 "
+            "WHERE id = %s AND currency_id = %s AND funds >= %s "
+            "AND balance_slots = 0 "
+            "RETURNING funds",
+            [value, idx, currency, value],
+        )
+
+    def credit(self, idx, currency, value):
+        """
+        Add `value` to account funds with single conditional UPDATE.
+        Returns new funds or None when account does not exist, has
+        different currency or is hot.
+        """
+        return self._update_funds_returning(
+            "UPDATE {table} SET funds = funds + %s, version = version + 1 "
+            "WHERE id = %s AND currency_id = %s AND balance_slots = 0 "
+            "RETURNING funds",
+            [value, idx, currency],
+        )
+
+    def debit_slots(self, account, value):
+        """
+        Fallback of `debit` for hot accounts. Returns False when account
+        does not have enough funds.
+        """
+        return self.slot_queries.debit(account, value)
+
+    def slots_cover(self, account, value):
+        """
+        True when slots of hot account hold at least `value` together.
+        Tells failed slot debit caused by missing funds from one caused by
+        slots rebalanced meanwhile.
+        """
+        totals = self.slot_queries.get_totals([account.pk])
+        return (totals.get(account.pk) or 0) >= value
+
+    def credit_slots(self, account, value):
+        """
+        Fallback of `credit` for hot accounts. Returns False when slots
+        were rebalanced meanwhile.
+        """
+        return self.slot_queries.credit(account, value)
+
+    def _load_slot_funds(self, accounts):
+        hot_accounts = [acc for acc in accounts if acc.balance_slots]
+
+        if not hot_accounts:
+            return
+
+        totals = self.slot_queries.get_totals([acc.pk for acc in hot_accounts])
+
+        for account in hot_accounts:
+            account.funds += totals.get(account.pk) or 0
+            account.loaded_funds = account.funds
+
+    def _save_slot_funds(self, account):
+        delta = account.funds - account.loaded_funds
+
+        if delta > 0 and not self.slot_queries.credit(account, delta):
+            return False
+
+        if delta < 0 and not self.slot_queries.debit(account, -delta):
+            return False
+
+        account.loaded_funds = account.funds
+        return True
+
+    def _load_metadata(self, idx):
+        row = (
+            self.model.objects.filter(pk=idx)
+            .values_list("pk", "name", "currency_id", "balance_slots")
+            .first()
+        )
+
+        if row is None:
+            raise self.model.DoesNotExist(
+                f"Account with id {idx} does not exist"
+            )
+
+        return AccountMetadata(*row)
+
+    def _in_order(self, ids, accounts):
+        ids = [int(idx) for idx in ids]
+
+        for idx in ids:
+            if idx not in accounts:
+                raise self.model.DoesNotExist(
+                    f"Account with id {idx} does not exist"
+                )
+
+        return [accounts[idx] for idx in ids]
+
+    def _update_funds_returning(self, sql, params):
+        table = connection.ops.quote_name(self.model._meta.db_table)
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql.format(table=table), params)
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        return self.model._meta.get_field("funds").to_python(row[0])
@@ -0,0 +1,75 @@
+import random
+
+from django.db.models import F, Sum
+
+from ..models import AccountBalanceSlot
+from .base import BaseQuery
+
+
+class BalanceSlotQueries(BaseQuery):
+    model = AccountBalanceSlot
+
+    def get_totals(self, account_ids):
+        """
+        Return `{account_id: sum of slot funds}` for given hot accounts.
+        """
+        return dict(
+            self.model.objects.filter(account_id__in=account_ids)
+            .values("account_id")
+            .annotate(total=Sum("funds"))
+            .values_list("account_id", "total")
+        )
+
+    def credit(self, account, value):
+        """
+        Add `value` to one randomly chosen slot of hot account. Returns
+        False when slot does not exist anymore (slots were rebalanced).
+        """
+        updated = self.model.objects.filter(
+            account_id=account.pk, slot=random.randrange(account.balance_slots)
+        ).update(funds=F("funds") + value)
+
+        return bool(updated)
+
+    def debit(self, account, value):
+        """
+        Subtract `value` from randomly chosen slot of hot account. When that
+        slot runs low, all slots of account are locked (in slot order) and
+        `value` is borrowed across them. Returns False when whole account
+        does not have enough funds or slots were rebalanced meanwhile.
+        """
+        updated = self.model.objects.filter(
+            account_id=account.pk,
+            slot=random.randrange(account.balance_slots),
+            funds__gte=value,
+        ).update(funds=F("funds") - value)
+
+        if updated:
+            return True
+
+        slots = list(
+            self.model.objects.select_for_update()
+            .filter(account_id=account.pk)
+            .order_by("slot")
+        )
+
+        if len(slots) != account.balance_slots:
+            return False
+
+        if sum(slot.funds for slot in slots) < value:
+            return False
+
+        remaining = value
+
+        for slot in sorted(slots, key=lambda s: s.funds, reverse=True):
+            taken = min(slot.funds, remaining)
+
+            if taken:
+                slot.funds -= taken
+                slot.save(update_fields=["funds"])
+                remaining -= taken
+
+            if not remaining:
+                break
+
+        return True
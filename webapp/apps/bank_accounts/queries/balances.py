@@ -0,0 +1,209 @@
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from ..archive import transfer_archive
+from ..models import Account, BalanceCheckpoint, Transfer
+from ..money import Money
+from .accounts import AccountQueries
+from .base import BaseQuery
+
+# amount target account of transfer is credited with, in its own currency
+CREDITED_VALUE = Coalesce("to_value", "value")
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerBalance:
+    """
+    Current balance of account next to one expected from its transfers:
+    opening balance plus incoming minus outgoing transfers.
+    """
+
+    account_id: int
+    balance: Money
+    expected: Money
+    transfers: int
+
+    @property
+    def drift(self):
+        return Money(self.balance - self.expected)
+
+
+class BalanceQueries(BaseQuery):
+    """
+    Historical balances. `balance_at` starts from nearest checkpoint, so
+    it reads only transfers made after it instead of whole history.
+    """
+
+    model = BalanceCheckpoint
+    account_queries = AccountQueries()
+
+    def balance_at(self, account, timestamp):
+        """
+        Return balance of `account` including every transfer made up to
+        `timestamp`, or None when account did not exist yet. Accounts
+        without checkpoint are answered backwards from current balance.
+        """
+        if timestamp < account.created_date:
+            return None
+
+        checkpoint = (
+            self.model.objects.filter(account=account, as_of__lte=timestamp)
+            .order_by("-as_of")
+            .first()
+        )
+
+        if checkpoint is None:
+            current = (
+                self.account_queries.get_all_with_balance()
+                .get(pk=account.pk)
+                .balance
+            )
+            return Money(current - self.get_net_change(account.pk, timestamp))
+
+        return Money(
+            checkpoint.balance
+            + self.get_net_change(account.pk, checkpoint.as_of, timestamp)
+        )
+
+    def get_net_change(self, account_id, after, until=None):
+        """
+        Sum of transfers moving money in and out of account with
+        `after < transfer_date <= until`. `until` None means up to now.
+        Archived transfers count too.
+        """
+        archived = transfer_archive.get_totals([account_id], after, until)
+        window = Q(transfer_date__gt=after)
+
+        if until is not None:
+            window &= Q(transfer_date__lte=until)
+
+        totals = Transfer.objects.filter(
+            Q(from_account_id=account_id) | Q(to_account_id=account_id),
+            window,
+        ).aggregate(
+            credit=Sum(CREDITED_VALUE, filter=Q(to_account_id=account_id)),
+            debit=Sum("value", filter=Q(from_account_id=account_id)),
+        )
+        return (
+            (totals["credit"] or 0)
+            - (totals["debit"] or 0)
+            + archived.get(account_id, [0])[0]
+        )
+
+    def get_net_changes(self, account_ids, after, until):
+        """
+        Same as `get_net_change` for many accounts at once, returns
+        `{account_id: net change}` with entries only for active accounts.
+        `after` None means from the beginning, `until` None up to now.
+        Archived transfers count too.
+        """
+        window = Q()
+
+        if after is not None:
+            window &= Q(transfer_date__gt=after)
+
+        if until is not None:
+            window &= Q(transfer_date__lte=until)
+
+        changes = defaultdict(int)
+
+        for field, amount, sign in (
+            ("to_account_id", CREDITED_VALUE, 1),
+            ("from_account_id", "value", -1),
+        ):
+            rows = (
+                Transfer.objects.filter(
+                    window, **{f"{field}__in": account_ids}
+                )
+                .values(field)
+                .annotate(total=Sum(amount))
+                .values_list(field, "total")
+            )
+
+            for account_id, total in rows:
+                changes[account_id] += sign * total
+
+        for account_id, (total, _) in transfer_archive.get_totals(
+            account_ids, after, until
+        ).items():
+            changes[account_id] += total
+
+        return changes
+
+    def get_ledger(self, lookup, value):
+        """
+        `LedgerBalance` of accounts whose id matches `id__<lookup>=value`,
+        e.g. `get_ledger("range", (1, 1000))`. Opening balance is the one
+        recorded by checkpoint taken when account was created, 0 for
+        accounts older than checkpoints. Archived transfers count too.
+        """
+        balances = self.account_queries.get_all_with_balance().filter(
+            **{f"id__{lookup}": value}
+        )
+        opening = dict(
+            self.model.objects.filter(
+                as_of=F("account__created_date"),
+                **{f"account__id__{lookup}": value},
+            ).values_list("account_id", "balance")
+        )
+        totals = defaultdict(lambda: [0, 0])
+
+        for field, amount, sign in (
+            ("to_account", CREDITED_VALUE, 1),
+            ("from_account", "value", -1),
+        ):
+            rows = (
+                Transfer.objects.filter(**{f"{field}__id__{lookup}": value})
+                .values(field)
+                .annotate(total=Sum(amount), count=Count("id"))
+                .values_list(field, "total", "count")
+                .order_by()
+            )
+
+            for account_id, total, count in rows:
+                totals[account_id][0] += sign * total
+                totals[account_id][1] += count
+
+        if transfer_archive.months():
+            account_ids = [account.pk for account in balances]
+
+            for account_id, (total, count) in transfer_archive.get_totals(
+                account_ids
+            ).items():
+                totals[account_id][0] += total
+                totals[account_id][1] += count
+
+        return [
+            LedgerBalance(
+                account_id=account.pk,
+                balance=account.balance,
+                expected=Money(
+                    opening.get(account.pk, 0) + totals[account.pk][0]
+                ),
+                transfers=totals[account.pk][1],
+            )
+            for account in balances
+        ]
+
+    def get_latest_checkpoints(self):
+        """
+        Return `{account_id: latest checkpoint or None}` for all accounts.
+        """
+        latest = self.model.objects.filter(account=OuterRef("pk")).order_by(
+            "-as_of"
+        )
+        checkpoint_ids = dict(
+            Account.objects.annotate(
+                checkpoint_id=Subquery(latest.values("pk")[:1])
+            ).values_list("pk", "checkpoint_id")
+        )
+        checkpoints = self.model.objects.in_bulk(
+            [idx for idx in checkpoint_ids.values() if idx is not None]
+        )
+        return {
+            account_id: checkpoints.get(checkpoint_id)
+            for account_id, checkpoint_id in checkpoint_ids.items()
+        }
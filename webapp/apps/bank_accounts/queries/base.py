@@ -1,12 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+from django.db import transaction
+
+reference_caches = []
+
+
+class ReferenceCache:
+    """
+    Per-process LRU of rarely changing rows, entries expire after `ttl`
+    seconds. Writers call `invalidate`, which bumps version stamp kept in
+    Django cache, shared by every process, so other processes drop their
+    entries on next lookup as well.
+    """
+
+    def __init__(self, name, max_size, ttl):
+        self.version_key = f"bank_accounts:reference_cache:{name}:version"
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        reference_caches.append(self)
+
+    def version(self):
+        """
+        Version stamp shared by every process. Missing stamp, on first use
+        or after shared cache lost its keys, starts from current time, so
+        stamp handed out before is not repeated.
+        """
+        version = shared_cache.get(self.version_key)
+
+        if version is None:
+            shared_cache.add(self.version_key, time.time_ns(), timeout=None)
+            version = shared_cache.get(self.version_key)
+
+        return version
+
+    def get_or_load(self, key, load):
+        version = self.version()
+
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+
+            entry = self._entries.get(key)
+
+            if entry is not None and time.monotonic() - entry[1] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+
+        value = load()
+
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = (value, time.monotonic())
+                self._entries.move_to_end(key)
+
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self):
+        """
+        Call from transaction which changes cached rows. Entries are
+        dropped right away and once more after commit, so rows loaded by
+        other requests before commit are not kept either.
+        """
+        self._bump_version()
+        transaction.on_commit(self._bump_version)
+
+    def _bump_version(self):
+        try:
+            shared_cache.incr(self.version_key)
+        except ValueError:
+            shared_cache.add(self.version_key, time.time_ns(), timeout=None)
+
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+
 class BaseQuery:
     model = None
+    # set for models which change rarely, `get_by_id` and `get_all` are
+    # then answered from per-process cache
+    cache = None
 
     def get_by_id(self, idx):
+        if self.cache is not None:
+            return self.cache.get_or_load(
+                ("id", int(idx)), lambda: self.model.objects.get(pk=idx)
+            )
+
         obj = self.model.objects.get(pk=idx)
         return obj
 
+    def get_in_bulk(self, ids):
+        if self.cache is not None:
+            objects = {}
+
+            for idx in ids:
+                try:
+                    objects[int(idx)] = self.get_by_id(idx)
+                except self.model.DoesNotExist:
+                    pass
+
+            return objects
+
+        return self.model.objects.in_bulk(ids)
+
     def get_all(self):
+        if self.cache is not None:
+            return self.cache.get_or_load(
+                "all", lambda: list(self.model.objects.all().order_by("pk"))
+            )
+
         return self.model.objects.all().order_by("pk")
 
     def count(self):
         return self.model.objects.count()
+
+
+def reference_cache(name):
+    return ReferenceCache(
+        name,
+        max_size=settings.REFERENCE_CACHE_SIZE,
+        ttl=settings.REFERENCE_CACHE_TTL,
+    )
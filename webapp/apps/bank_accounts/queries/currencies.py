@@ -1,6 +1,7 @@
 from ..models import Currency
-from .base import BaseQuery
+from .base import BaseQuery, reference_cache
 
 
 class CurrencyQueries(BaseQuery):
     model = Currency
+    cache = reference_cache("currencies")
@@ -0,0 +1,107 @@
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..archive import transfer_archive
+from ..models import AccountEntry, DailyAccountStats
+from .base import BaseQuery
+
+STATS_COLUMNS = ("inflow", "outflow", "transfers_in", "transfers_out")
+
+
+class DailyAccountStatsQueries(BaseQuery):
+    model = DailyAccountStats
+    # rows written by single upsert statement
+    upsert_batch_size = 100
+
+    def increment(self, deltas):
+        """
+        Add `{(account_id, day, slot): (inflow, outflow, transfers_in,
+        transfers_out)}` to stats, creating missing rows. Rows are upserted
+        in key order, so concurrent writers cannot deadlock on them.
+        """
+        rows = sorted(deltas.items())
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        columns = ", ".join(("account_id", "day", "slot") + STATS_COLUMNS)
+        updates = ", ".join(
+            f"{column} = {table}.{column} + EXCLUDED.{column}"
+            for column in STATS_COLUMNS
+        )
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), self.upsert_batch_size):
+                batch = rows[start : start + self.upsert_batch_size]
+                values = ", ".join(
+                    ["(%s, %s, %s, %s, %s, %s, %s)"] * len(batch)
+                )
+                cursor.execute(
+                    f"INSERT INTO {table} ({columns}) VALUES {values} "
+                    f"ON CONFLICT (account_id, day, slot) "
+                    f"DO UPDATE SET {updates}",
+                    [
+                        value
+                        for (account_id, day, slot), delta in batch
+                        for value in (account_id, day, slot, *delta)
+                    ],
+                )
+
+    def get_report(self, account, since, until):
+        """
+        Stats of account for days `since <= day <= until`, one unsaved row
+        per day with any transfers (sum of its slots), oldest first.
+        """
+        return [
+            self.model(account_id=account, **row)
+            for row in self._filter(account, since, until)
+            .values("day")
+            .annotate(**{column: Sum(column) for column in STATS_COLUMNS})
+            .order_by("day")
+        ]
+
+    def get_totals(self, account, since, until):
+        return self._filter(account, since, until).aggregate(
+            **{column: Sum(column) for column in STATS_COLUMNS}
+        )
+
+    def _filter(self, account, since, until):
+        return self.model.objects.filter(
+            account_id=account, day__gte=since, day__lte=until
+        )
+
+    def compute_from_journal(self, account_ids):
+        """
+        Recompute unsaved stats rows of accounts from their journal and,
+        for archived months whose journal is gone, from archive.
+        """
+        totals = transfer_archive.get_daily_totals(
+            account_ids, timezone.get_current_timezone()
+        )
+        rows = (
+            AccountEntry.objects.filter(account_id__in=account_ids)
+            .annotate(day=TruncDate("transfer__transfer_date"))
+            .values("account_id", "day")
+            .annotate(
+                inflow=Sum("amount", filter=Q(amount__gt=0)),
+                outflow=Sum("amount", filter=Q(amount__lt=0)),
+                transfers_in=Count("id", filter=Q(amount__gt=0)),
+                transfers_out=Count("id", filter=Q(amount__lt=0)),
+            )
+            .order_by()
+        )
+
+        for row in rows:
+            delta = totals[row["account_id"], row["day"]]
+            delta[0] += row["inflow"] or 0
+            delta[1] -= row["outflow"] or 0
+            delta[2] += row["transfers_in"]
+            delta[3] += row["transfers_out"]
+
+        return [
+            self.model(
+                account_id=account_id,
+                day=day,
+                **dict(zip(STATS_COLUMNS, delta)),
+            )
+            for (account_id, day), delta in totals.items()
+        ]
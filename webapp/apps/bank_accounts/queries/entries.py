@@ -0,0 +1,18 @@
+from ..models import AccountEntry
+from .base import BaseQuery
+
+
+class AccountEntryQueries(BaseQuery):
+    model = AccountEntry
+
+    def get_statement(self, account, after=0):
+        """
+        Entries of account with id higher than `after` and running balance,
+        oldest first. Single range scan of `(account, id)` index. Entries of
+        archived months are gone, balances of later ones still hold.
+        """
+        return (
+            self.model.objects.filter(account_id=account, id__gt=after)
+            .select_related("transfer", "transfer__currency")
+            .order_by("id")
+        )
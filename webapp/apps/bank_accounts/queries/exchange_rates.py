@@ -0,0 +1,96 @@
+import bisect
+from collections import defaultdict
+
+from django.db import connection
+
+from ..models import ExchangeRate
+from .base import BaseQuery, reference_cache
+
+
+class ExchangeRateQueries(BaseQuery):
+    """
+    Rates are answered from per-process table of every pair, loaded with
+    one query and kept until rates change. Lookup is a bisect over
+    effective dates of the pair, so converting transfer costs no query.
+    """
+
+    model = ExchangeRate
+    cache = reference_cache("exchange_rates")
+    # rows written by single insert statement
+    insert_batch_size = 500
+
+    def get_rate(self, from_currency, to_currency, at):
+        """
+        `ExchangeRate` of currency pair in effect at `at`, None when pair
+        has no rate yet.
+        """
+        rates = self.cache.get_or_load("pairs", self._load_pairs).get(
+            (int(from_currency), int(to_currency))
+        )
+
+        if rates is None:
+            return None
+
+        dates, pair_rates = rates
+        idx = bisect.bisect_right(dates, at)
+        return pair_rates[idx - 1] if idx else None
+
+    def add_new(self, rates):
+        """
+        Insert unsaved `ExchangeRate` rows, skipping ones whose pair and
+        date are in table already, also when other transaction added them
+        meanwhile. Returns number of inserted rows.
+        """
+        fields = [
+            self.model._meta.get_field(name)
+            for name in (
+                "from_currency",
+                "to_currency",
+                "rate",
+                "effective_from",
+            )
+        ]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        columns = ", ".join(
+            connection.ops.quote_name(field.column) for field in fields
+        )
+        added = 0
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(rates), self.insert_batch_size):
+                batch = rates[start : start + self.insert_batch_size]
+                values = ", ".join(["(%s, %s, %s, %s)"] * len(batch))
+                # only rows actually inserted are returned
+                cursor.execute(
+                    f"INSERT INTO {table} ({columns}) VALUES {values} "
+                    "ON CONFLICT (from_currency_id, to_currency_id, "
+                    "effective_from) DO NOTHING RETURNING id",
+                    [
+                        field.get_db_prep_save(
+                            getattr(rate, field.attname), connection
+                        )
+                        for rate in batch
+                        for field in fields
+                    ],
+                )
+                added += len(cursor.fetchall())
+
+        return added
+
+    def invalidate(self):
+        """
+        Call from transaction which adds or changes rates.
+        """
+        self.cache.invalidate()
+
+    def _load_pairs(self):
+        pairs = defaultdict(lambda: ([], []))
+
+        for rate in self.model.objects.order_by(
+            "from_currency_id", "to_currency_id", "effective_from"
+        ):
+            dates, rates = pairs[rate.from_currency_id, rate.to_currency_id]
+            dates.append(rate.effective_from)
+            rates.append(rate)
+
+        return dict(pairs)
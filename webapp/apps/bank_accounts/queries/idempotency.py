@@ -0,0 +1,25 @@
+from ..models import IdempotencyKey
+from .base import BaseQuery
+
+
+class IdempotencyKeyQueries(BaseQuery):
+    model = IdempotencyKey
+
+    def get_by_key(self, key):
+        return (
+            self.model.objects.select_related("transfer")
+            .filter(key=key)
+            .first()
+        )
+
+    def get_by_keys(self, keys):
+        return self.model.objects.select_related("transfer").in_bulk(
+            keys, field_name="key"
+        )
+
+    def get_expired_ids(self, created_before, limit):
+        return list(
+            self.model.objects.filter(created_date__lt=created_before)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:limit]
+        )
@@ -0,0 +1,83 @@
+import base64
+import json
+from dataclasses import dataclass
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+NEXT = "next"
+PREVIOUS = "prev"
+
+
+@dataclass(frozen=True, slots=True)
+class KeysetPage:
+    items: list
+    next_cursor: str | None
+    previous_cursor: str | None
+
+
+def encode_cursor(*key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor, *types):
+    """
+    Return key encoded by `encode_cursor`, which must have one item of
+    each of `types`. Raises ValueError for cursors which were not produced
+    by it.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, UnicodeError, ValueError) as ex:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from ex
+
+    # `type` rather than `isinstance`, so `true` is not taken for an id
+    if (
+        not isinstance(key, list)
+        or len(key) != len(types)
+        or any(type(item) is not kind for item, kind in zip(key, types))
+    ):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+    return key
+
+
+def decode_date_cursor(cursor):
+    """
+    Return `(transfer_date, id)` key of cursor encoded from ISO format of
+    aware datetime and id, raises ValueError like `decode_cursor`.
+    """
+    transfer_date, idx = decode_cursor(cursor, str, int)
+    # raises ValueError for well formatted but invalid dates
+    parsed = parse_datetime(transfer_date)
+
+    if parsed is None or timezone.is_naive(parsed):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+    return parsed, idx
+
+
+def keyset_page(rows, limit, cursor, direction, key):
+    """
+    Build page from up to `limit + 1` rows fetched in `direction` after
+    `cursor`. Extra row only tells whether there is more in that direction.
+    Rows fetched backwards are returned in forward order.
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if direction == PREVIOUS:
+        rows.reverse()
+        has_next, has_previous = cursor is not None, has_more
+    else:
+        has_next, has_previous = has_more, cursor is not None
+
+    return KeysetPage(
+        items=rows,
+        next_cursor=(
+            encode_cursor(*key(rows[-1])) if rows and has_next else None
+        ),
+        previous_cursor=(
+            encode_cursor(*key(rows[0])) if rows and has_previous else None
+        ),
+    )
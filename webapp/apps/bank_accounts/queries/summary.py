@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from ..models import AccountBalanceSlot, Currency
+from ..money import Money
+from .base import BaseQuery, reference_cache
+
+
+@dataclass(frozen=True, slots=True)
+class CurrencyFunds:
+    symbol: str
+    accounts: int
+    funds: Money
+
+
+@dataclass(frozen=True, slots=True)
+class Summary:
+    """
+    Totals shown on home page. `version` is version of summary cache it
+    was loaded under and changes with every write, `as_of` is when it was
+    computed.
+    """
+
+    version: int
+    as_of: datetime
+    accounts_count: int
+    currencies: list[CurrencyFunds]
+
+
+class SummaryQueries(BaseQuery):
+    """
+    Cached summary of all accounts. Every usecase changing accounts or
+    funds invalidates it.
+    """
+
+    model = Currency
+    summary_cache = reference_cache("summary")
+
+    def get_summary(self):
+        return self.summary_cache.get_or_load("summary", self._load_summary)
+
+    def invalidate(self):
+        """
+        Call from transaction changing accounts, currencies or funds.
+        """
+        self.summary_cache.invalidate()
+
+    def _load_summary(self):
+        version = self.summary_cache.version()
+        slot_funds = dict(
+            AccountBalanceSlot.objects.values("account__currency_id")
+            .annotate(total=Sum("funds"))
+            .values_list("account__currency_id", "total")
+            .order_by()
+        )
+        currencies = [
+            CurrencyFunds(
+                symbol=currency.symbol,
+                accounts=currency.accounts,
+                funds=Money(
+                    (currency.funds or 0) + slot_funds.get(currency.pk, 0)
+                ),
+            )
+            for currency in self.model.objects.annotate(
+                accounts=Count("account_currency"),
+                funds=Sum("account_currency__funds"),
+            ).order_by("pk")
+        ]
+        return Summary(
+            version=version,
+            as_of=timezone.now(),
+            accounts_count=sum(currency.accounts for currency in currencies),
+            currencies=currencies,
+        )
@@ -1,13 +1,182 @@
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain
+
 from django.db.models import Q
 
+from ..archive import transfer_archive
 from ..models import Transfer
+from ..money import Money
 from .base import BaseQuery
+from .pagination import NEXT, PREVIOUS, decode_date_cursor, keyset_page
+
+
+@dataclass(frozen=True, slots=True)
+class TransferRow:
+    """
+    Read-only projection of `Transfer` with only what history shows,
+    accounts and currency are already their display names.
+    """
+
+    pk: int
+    name: str
+    from_account: str | None
+    to_account: str | None
+    value: Money
+    currency: str
+    transfer_date: datetime
+
+
+# `TransferRow` fields in order, as `values_list` lookups on `Transfer`
+TRANSFER_ROW_LOOKUPS = (
+    "id",
+    "name",
+    "from_account__name",
+    "to_account__name",
+    "value",
+    "currency__symbol",
+    "transfer_date",
+)
 
 
 class TransferQueries(BaseQuery):
+    """
+    Transfer table may be partitioned by month of `transfer_date`, so
+    queries bound `transfer_date` with plain comparisons wherever they
+    can, which lets PostgreSQL skip partitions outside the bounds.
+    """
+
     model = Transfer
 
-    def get_filtered_by_account(self, account):
-        return self.model.objects.filter(
-            Q(from_account_id=account) | Q(to_account=account)
+    def get_by_account(self, account, after=None, until=None):
+        """
+        Transfers of account with `after < transfer_date <= until`, ordered
+        by `(transfer_date, id)`. Incoming and outgoing transfers are read
+        by separate range scans of their `(account, transfer_date, id)`
+        indexes merged with UNION ALL, which planners handle much better
+        than OR across both account columns.
+        """
+        window = Q()
+
+        if after is not None:
+            window &= Q(transfer_date__gt=after)
+
+        if until is not None:
+            window &= Q(transfer_date__lte=until)
+
+        outgoing = self.model.objects.filter(window, from_account_id=account)
+        incoming = self.model.objects.filter(window, to_account_id=account)
+        # transfers to the same account are already in outgoing
+        incoming = incoming.exclude(from_account_id=account)
+
+        return outgoing.union(incoming, all=True).order_by(
+            "transfer_date", "id"
         )
+
+    def get_row_page(self, limit, cursor=None, direction=NEXT, account=None):
+        """
+        Keyset page of `TransferRow` items ordered by `(transfer_date, id)`,
+        also for one account. Reads only displayed columns in a single
+        joined query, without building model instances. Months moved to
+        `transfer_archive` are read from it and joined with live rows, so
+        callers see one history; archived rows are always the older ones.
+        """
+        key = None
+
+        if cursor is not None:
+            key = decode_date_cursor(cursor)
+
+        # archived rows come before live ones, rows are read in direction
+        # of the page until there are `limit + 1` of them
+        if direction == PREVIOUS:
+            rows = self._get_live_rows(limit + 1, key, direction, account)
+
+            if len(rows) <= limit:
+                rows += transfer_archive.get_rows(
+                    limit + 1 - len(rows), key, False, account
+                )
+        else:
+            rows = transfer_archive.get_rows(limit + 1, key, True, account)
+
+            if len(rows) <= limit:
+                rows += self._get_live_rows(
+                    limit + 1 - len(rows), key, direction, account
+                )
+
+        return keyset_page(
+            [TransferRow(*row) for row in rows],
+            limit,
+            cursor,
+            direction,
+            key=lambda row: (row.transfer_date.isoformat(), row.pk),
+        )
+
+    def iter_rows(self, account=None, chunk_size=2000):
+        """
+        Whole history as `TransferRow` objects, in the order of
+        `get_row_page`, archived months first. Rows are streamed from
+        server-side cursor, `chunk_size` at a time, so memory use does not
+        depend on number of transfers.
+        """
+        if account:
+            rows = self.get_by_account(account).values_list(
+                *TRANSFER_ROW_LOOKUPS
+            )
+        else:
+            rows = self.model.objects.order_by(
+                "transfer_date", "id"
+            ).values_list(*TRANSFER_ROW_LOOKUPS)
+
+        return (
+            TransferRow(*row)
+            for row in chain(
+                transfer_archive.iter_rows(account, chunk_size),
+                rows.iterator(chunk_size),
+            )
+        )
+
+    def _get_live_rows(self, limit, key, direction, account):
+        if not account:
+            return list(
+                self._after(self.model.objects.all(), key, direction)
+                .order_by(*self._order(direction))
+                .values_list(*TRANSFER_ROW_LOOKUPS)[:limit]
+            )
+
+        outgoing = self.model.objects.filter(from_account_id=account)
+        incoming = self.model.objects.filter(to_account_id=account).exclude(
+            from_account_id=account
+        )
+        outgoing, incoming = (
+            self._after(arm, key, direction).values_list(*TRANSFER_ROW_LOOKUPS)
+            for arm in (outgoing, incoming)
+        )
+        return list(
+            outgoing.union(incoming, all=True).order_by(
+                *self._order(direction)
+            )[:limit]
+        )
+
+    def _after(self, transfers, key, direction):
+        # rows past `(transfer_date, id)` key in reading direction
+        if key is None:
+            return transfers
+
+        transfer_date, idx = key
+
+        if direction == PREVIOUS:
+            return transfers.filter(
+                Q(transfer_date__lt=transfer_date) | Q(id__lt=idx),
+                transfer_date__lte=transfer_date,
+            )
+
+        return transfers.filter(
+            Q(transfer_date__gt=transfer_date) | Q(id__gt=idx),
+            transfer_date__gte=transfer_date,
+        )
+
+    def _order(self, direction):
+        if direction == PREVIOUS:
+            return ("-transfer_date", "-id")
+
+        return ("transfer_date", "id")
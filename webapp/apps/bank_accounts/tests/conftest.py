@@ -0,0 +1,12 @@
+import pytest
+
+from ..queries.base import reference_caches
+
+
+@pytest.fixture(autouse=True)
+def _clear_reference_caches():
+    # ids are reused after test transactions roll back
+    for cache in reference_caches:
+        cache.clear()
+
+    yield
@@ -3,6 +3,7 @@ from django.urls import reverse
 import pytest
 
 from ..models import Account, Currency
+from ..money import Money
 
 
 @pytest.mark.django_db()
@@ -34,7 +35,7 @@ class TestAccountsUsecases:
         assert all_accounts[0].name == data["name"]
         assert all_accounts[0].description == data["description"]
         assert all_accounts[0].currency == self.currency
-        assert all_accounts[0].funds == data["funds"]
+        assert all_accounts[0].funds == Money.parse(data["funds"])
 
     def test_add_new_account_and_another_one(self):
         data_1 = {
@@ -59,11 +60,11 @@ class TestAccountsUsecases:
         assert all_accounts[0].name == data_1["name"]
         assert all_accounts[0].description == data_1["description"]
         assert all_accounts[0].currency == self.currency
-        assert all_accounts[0].funds == data_1["funds"]
+        assert all_accounts[0].funds == Money.parse(data_1["funds"])
         assert all_accounts[1].name == data_2["name"]
         assert all_accounts[1].description == data_2["description"]
         assert all_accounts[1].currency == self.currency
-        assert all_accounts[1].funds == data_2["funds"]
+        assert all_accounts[1].funds == Money.parse(data_2["funds"])
 
     def test_add_new_account_but_already_exist(self):
         data_1 = {
@@ -93,7 +94,7 @@ class TestAccountsUsecases:
         assert all_accounts[0].name == data_2["name"]
         assert all_accounts[0].description == data_2["description"]
         assert all_accounts[0].currency == self.currency
-        assert all_accounts[0].funds == data_2["funds"]
+        assert all_accounts[0].funds == Money.parse(data_2["funds"])
 
     def test_add_new_account_but_missing_data(self):
         data = {}
@@ -0,0 +1,249 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management import call_command
+from django.urls import reverse
+
+import numpy as np
+import pytest
+
+from ..analytics import (
+    AccountFlow,
+    Counterparty,
+    CurrencyDayVolume,
+    TransferAnalytics,
+    group_sum,
+)
+from ..exceptions import AnalyticsNotLoadedException
+from ..models import Account, Currency, Transfer
+from ..money import Money
+from ..partitions import add_months, current_month
+from .utils import create_transfer
+
+
+def test_group_sum():
+    keys, sums, counts = group_sum(
+        np.array([3, 1, 3, 2, 1, 3]), np.array([1, 2, 3, 4, 5, 6])
+    )
+
+    assert keys.tolist() == [1, 2, 3]
+    assert sums.tolist() == [7, 4, 10]
+    assert counts.tolist() == [2, 1, 3]
+
+
+@pytest.mark.django_db()
+class TestTransferAnalytics:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client, settings, tmp_path):
+        settings.TRANSFER_ARCHIVE_DIR = str(tmp_path)
+        self.client = client
+        self.analytics = TransferAnalytics()
+        self.usd = Currency.objects.create(symbol="USD")
+        self.eur = Currency.objects.create(symbol="EUR")
+        self.account_1, self.account_2, self.account_3 = [
+            Account.objects.create(
+                name=f"test{i}", currency=self.usd, funds=Money.parse("1000")
+            )
+            for i in (1, 2, 3)
+        ]
+        self.eur_account = Account.objects.create(
+            name="eur", currency=self.eur, funds=Money.parse("1000")
+        )
+        self.day = datetime(2022, 3, 4, 10, tzinfo=dt_timezone.utc)
+
+        for from_account, to_account, currency, value in (
+            (None, self.account_1, self.usd, "100.10"),
+            (self.account_1, self.account_2, self.usd, "20.05"),
+            (self.account_2, self.account_1, self.usd, "5"),
+            (self.account_1, self.account_3, self.usd, "1.01"),
+            (self.account_3, None, self.usd, "0.5"),
+            (None, self.eur_account, self.eur, "7"),
+        ):
+            transfer = create_transfer(
+                name="transfer",
+                from_account=from_account,
+                to_account=to_account,
+                currency=currency,
+                value=Money.parse(value),
+            )
+
+        # last one happens a day later
+        Transfer.objects.exclude(pk=transfer.pk).update(transfer_date=self.day)
+        Transfer.objects.filter(pk=transfer.pk).update(
+            transfer_date=self.day.replace(day=5)
+        )
+        self.analytics.load()
+
+    def test_net_flow(self):
+        assert self.analytics.net_flow() == [
+            AccountFlow(
+                self.account_1.pk,
+                Money.parse("105.10"),
+                Money.parse("21.06"),
+                Money.parse("84.04"),
+            ),
+            AccountFlow(
+                self.account_2.pk,
+                Money.parse("20.05"),
+                Money.parse("5.00"),
+                Money.parse("15.05"),
+            ),
+            AccountFlow(
+                self.account_3.pk,
+                Money.parse("1.01"),
+                Money.parse("0.50"),
+                Money.parse("0.51"),
+            ),
+            AccountFlow(
+                self.eur_account.pk,
+                Money.parse("7.00"),
+                Money.parse("0.00"),
+                Money.parse("7.00"),
+            ),
+        ]
+
+    def test_net_flow_page(self):
+        assert [
+            flow.account_id
+            for flow in self.analytics.net_flow(after=self.account_1.pk)
+        ] == [self.account_2.pk, self.account_3.pk, self.eur_account.pk]
+        assert [
+            flow.account_id
+            for flow in self.analytics.net_flow(
+                after=self.account_1.pk, limit=1
+            )
+        ] == [self.account_2.pk]
+
+    def test_currency_volume(self):
+        assert self.analytics.currency_volume() == [
+            CurrencyDayVolume(
+                "USD", self.day.date(), 5, Money.parse("126.66")
+            ),
+            CurrencyDayVolume(
+                "EUR", self.day.date().replace(day=5), 1, Money.parse("7.00")
+            ),
+        ]
+
+    def test_top_counterparties(self):
+        assert self.analytics.top_counterparties(self.account_1.pk) == [
+            Counterparty(self.account_2.pk, 2, Money.parse("25.05")),
+            Counterparty(self.account_3.pk, 1, Money.parse("1.01")),
+        ]
+        assert self.analytics.top_counterparties(self.account_1.pk, 1) == [
+            Counterparty(self.account_2.pk, 2, Money.parse("25.05")),
+        ]
+
+    def test_arrays_are_cached(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            self.analytics.net_flow()
+
+    def test_stale_arrays_are_served_while_reloading(
+        self, settings, monkeypatch, django_assert_num_queries
+    ):
+        reloads = []
+        monkeypatch.setattr(
+            TransferAnalytics, "_reload", lambda analytics: reloads.append(1)
+        )
+        before = self.analytics.net_flow()
+        settings.ANALYTICS_CACHE_SECONDS = 0
+        Transfer.objects.all().delete()
+
+        with django_assert_num_queries(0):
+            assert self.analytics.net_flow() == before
+            assert self.analytics.net_flow() == before
+
+        self.analytics._loader.join()
+        assert reloads == [1]
+
+    def test_report_before_first_load(self, monkeypatch):
+        from .. import views
+
+        monkeypatch.setattr(
+            TransferAnalytics, "_reload", lambda analytics: None
+        )
+        analytics = TransferAnalytics()
+        monkeypatch.setattr(views, "transfer_analytics", analytics)
+
+        with pytest.raises(AnalyticsNotLoadedException):
+            analytics.net_flow()
+
+        resp = self.client.get(
+            reverse("bank-accounts:analytics", args=["net-flow"])
+        )
+        assert resp.status_code == 503
+        assert resp["Retry-After"] == "5"
+
+    def test_archived_months_are_included(self):
+        before = self.analytics.net_flow()
+        Transfer.objects.update(
+            transfer_date=datetime.combine(
+                add_months(current_month(), -2),
+                self.day.timetz(),
+            )
+        )
+        call_command("archive_transfers", "--months", "1")
+
+        assert not Transfer.objects.exists()
+        analytics = TransferAnalytics()
+        analytics.load()
+        assert analytics.net_flow() == before
+
+    def test_endpoint(self, monkeypatch):
+        from .. import views
+
+        monkeypatch.setattr(views, "transfer_analytics", self.analytics)
+
+        resp = self.client.get(
+            reverse("bank-accounts:analytics", args=["net-flow"])
+        )
+        assert resp.status_code == 200
+        assert resp.json()["next_after"] is None
+        assert resp.json()["results"][0] == {
+            "account_id": self.account_1.pk,
+            "inflow": "105.10",
+            "outflow": "21.06",
+            "net": "84.04",
+        }
+
+        resp = self.client.get(
+            reverse("bank-accounts:analytics", args=["counterparties"]),
+            {"by_account": self.account_3.pk},
+        )
+        assert resp.json()["results"] == [
+            {"account_id": self.account_1.pk, "transfers": 1, "volume": "1.01"}
+        ]
+
+    def test_net_flow_endpoint_pages(self, monkeypatch):
+        from .. import views
+
+        monkeypatch.setattr(views, "transfer_analytics", self.analytics)
+        monkeypatch.setattr(views, "ANALYTICS_NET_FLOW_PAGE_SIZE", 3)
+        url = reverse("bank-accounts:analytics", args=["net-flow"])
+
+        resp = self.client.get(url)
+        assert [row["account_id"] for row in resp.json()["results"]] == [
+            self.account_1.pk,
+            self.account_2.pk,
+            self.account_3.pk,
+        ]
+        assert resp.json()["next_after"] == self.account_3.pk
+
+        resp = self.client.get(url, {"after": self.account_3.pk})
+        assert [row["account_id"] for row in resp.json()["results"]] == [
+            self.eur_account.pk
+        ]
+        assert resp.json()["next_after"] is None
+
+    @pytest.mark.parametrize(
+        "report, params, status",
+        [
+            ("counterparties", {}, 400),
+            ("net-flow", {"after": "abc"}, 400),
+            ("unknown", {}, 404),
+        ],
+    )
+    def test_endpoint_errors(self, report, params, status):
+        resp = self.client.get(
+            reverse("bank-accounts:analytics", args=[report]), params
+        )
+
+        assert resp.status_code == status
@@ -0,0 +1,252 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+
+from ..archive import ArchiveMonth, transfer_archive
+from ..models import (
+    Account,
+    AccountEntry,
+    Currency,
+    DailyAccountStats,
+    Transfer,
+)
+from ..money import Money
+from ..partitions import add_months, current_month
+from ..queries import balance_queries, transfer_queries
+from ..queries.pagination import PREVIOUS
+from ..usecases import ArchiveMonthCommand, ArchiveMonthUsecase
+from .utils import create_transfer
+
+
+@pytest.mark.django_db()
+class TestTransferArchive:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client, settings, tmp_path):
+        settings.TRANSFER_ARCHIVE_DIR = str(tmp_path)
+        self.client = client
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account_1, self.account_2, self.account_3 = [
+            Account.objects.create(
+                name=f"test{i}",
+                currency=self.currency,
+                funds=Money.parse("1000"),
+            )
+            for i in (1, 2, 3)
+        ]
+        self.months = [
+            add_months(current_month(), -3),
+            add_months(current_month(), -2),
+        ]
+        accounts = [
+            (None, self.account_1),
+            (self.account_1, self.account_2),
+            (self.account_2, self.account_3),
+            (self.account_3, None),
+            (self.account_1, self.account_3),
+        ]
+
+        for i in range(10):
+            from_account, to_account = accounts[i % len(accounts)]
+            transfer = create_transfer(
+                name=f"transfer_{i}",
+                from_account=from_account,
+                to_account=to_account,
+                currency=self.currency,
+                value=Money.parse(f"{i + 1}.25"),
+            )
+
+            if i < 8:
+                month = self.months[i // 4]
+                # same timestamp twice, so order falls back to ids
+                transfer_date = datetime(
+                    month.year,
+                    month.month,
+                    2 + i % 4 // 2,
+                    12,
+                    tzinfo=dt_timezone.utc,
+                ) + timedelta(microseconds=7)
+                Transfer.objects.filter(pk=transfer.pk).update(
+                    transfer_date=transfer_date
+                )
+
+        self.history = self._walk(3)
+        self.account_history = {
+            account.pk: self._walk(2, account.pk)
+            for account in (self.account_1, self.account_2, self.account_3)
+        }
+        self.ledger = balance_queries.get_ledger("range", (0, 10**9))
+
+    def _walk(self, limit, account=None):
+        rows = []
+        page = transfer_queries.get_row_page(limit, account=account)
+        rows += page.items
+
+        while page.next_cursor:
+            page = transfer_queries.get_row_page(
+                limit, cursor=page.next_cursor, account=account
+            )
+            rows += page.items
+
+        return rows
+
+    def _walk_back(self, limit, cursor, account=None):
+        rows = []
+
+        while cursor:
+            page = transfer_queries.get_row_page(
+                limit, cursor=cursor, direction=PREVIOUS, account=account
+            )
+            rows = page.items + rows
+            cursor = page.previous_cursor
+
+        return rows
+
+    def _archive(self):
+        call_command("archive_transfers", "--months", "1")
+
+    def test_archive_moves_closed_months(self):
+        self._archive()
+
+        assert transfer_archive.months() == self.months
+        assert sorted(Transfer.objects.values_list("name", flat=True)) == [
+            "transfer_8",
+            "transfer_9",
+        ]
+        assert not AccountEntry.objects.exclude(
+            transfer__name__in=["transfer_8", "transfer_9"]
+        ).exists()
+
+    def test_history_is_unchanged(self):
+        self._archive()
+
+        assert self._walk(3) == self.history
+        assert len(self.history) == 10
+
+        for account, history in self.account_history.items():
+            assert self._walk(2, account) == history
+
+    def test_walk_back_across_archive(self):
+        self._archive()
+        page = transfer_queries.get_row_page(3)
+
+        while page.next_cursor:
+            page = transfer_queries.get_row_page(3, cursor=page.next_cursor)
+
+        rows = self._walk_back(3, page.previous_cursor)
+
+        assert rows + page.items == self.history
+
+    def test_iter_rows(self):
+        self._archive()
+
+        assert list(transfer_queries.iter_rows()) == self.history
+        assert (
+            list(transfer_queries.iter_rows(self.account_3.pk))
+            == self.account_history[self.account_3.pk]
+        )
+
+    def test_ledger_counts_archived_transfers(self):
+        self._archive()
+
+        assert balance_queries.get_ledger("range", (0, 10**9)) == self.ledger
+
+    def test_balances_count_archived_transfers(self):
+        Account.objects.update(
+            created_date=datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+        )
+        accounts = list(Account.objects.order_by("pk"))
+        ids = [account.pk for account in accounts]
+        # window boundaries inside of first month, between months and now
+        dates = [
+            datetime(m.year, m.month, day, tzinfo=dt_timezone.utc)
+            for m in self.months
+            for day in (1, 3)
+        ] + [None]
+
+        def balances():
+            return [
+                [
+                    balance_queries.balance_at(account, until)
+                    for account in accounts
+                    for until in dates[:-1]
+                ],
+                [
+                    balance_queries.get_net_change(account.pk, after, until)
+                    for account in accounts
+                    for after, until in zip(dates, dates[1:])
+                ],
+                [
+                    dict(balance_queries.get_net_changes(ids, after, until))
+                    for after, until in zip([None] + dates, dates)
+                ],
+            ]
+
+        expected = balances()
+        self._archive()
+
+        assert balances() == expected
+        assert any(expected[1])
+
+    def test_rebuilt_daily_stats_keep_archived_days(self):
+        def rebuild():
+            call_command("rebuild_daily_stats", "--workers", "1")
+            return sorted(
+                DailyAccountStats.objects.values_list(
+                    "account_id",
+                    "day",
+                    "inflow",
+                    "outflow",
+                    "transfers_in",
+                    "transfers_out",
+                )
+            )
+
+        expected = rebuild()
+        self._archive()
+
+        assert rebuild() == expected
+        assert len(expected) > 3
+
+    def test_account_reads_its_slice(self):
+        self._archive()
+        archive = ArchiveMonth(transfer_archive.path(self.months[0]))
+        low, high = archive.slice(self.account_2.pk)
+        rows = archive.read(10, account=self.account_2.pk)
+
+        assert high - low == len(rows) == 2
+        assert {row[0] for row in rows} == {
+            row.pk
+            for row in self.account_history[self.account_2.pk]
+            if row.transfer_date.date().replace(day=1) == self.months[0]
+        }
+        assert archive.slice(10**9) == (0, 0)
+
+    def test_history_view_shows_archived_rows(self):
+        self._archive()
+
+        resp = self.client.get(
+            reverse("bank-accounts:history"), {"by_account": self.account_1.pk}
+        )
+
+        assert resp.status_code == 200
+        assert [row.pk for row in resp.context["transfers"]] == [
+            row.pk for row in self.account_history[self.account_1.pk]
+        ]
+
+    def test_only_closed_months_in_order(self):
+        with pytest.raises(ValueError):
+            ArchiveMonthUsecase().execute(ArchiveMonthCommand(current_month()))
+
+        with pytest.raises(ValueError):
+            ArchiveMonthUsecase().execute(ArchiveMonthCommand(self.months[1]))
+
+        assert transfer_archive.months() == []
+
+    def test_empty_month_writes_no_file(self):
+        month = add_months(self.months[0], -1)
+
+        assert ArchiveMonthUsecase().execute(ArchiveMonthCommand(month)) == 0
+        assert transfer_archive.months() == []
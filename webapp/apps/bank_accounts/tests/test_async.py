@@ -0,0 +1,128 @@
+from django.urls import reverse
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from ..exceptions import InvalidWithdrawAmountException
+from ..models import Account, Currency
+from ..money import Money
+from ..usecases import (
+    AsyncUsecase,
+    DepositCommand,
+    DepositUsecase,
+    TransferCommand,
+    TransferUsecase,
+)
+from .utils import create_transfer
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncViews:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client):
+        self.client = client
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account_1 = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("100")
+        )
+        self.account_2 = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("200")
+        )
+        self.transfer = create_transfer(
+            name="transfer1",
+            from_account=self.account_1,
+            to_account=self.account_2,
+            currency=self.currency,
+            value=Money.parse("10"),
+        )
+        self.deposit = create_transfer(
+            name="deposit1",
+            to_account=self.account_2,
+            currency=self.currency,
+            value=Money.parse("5"),
+        )
+
+    def test_home(self):
+        resp = self.client.get(reverse("bank-accounts:home-async"))
+
+        assert resp.status_code == 200
+        assert resp.context["available_accounts"] == [
+            self.account_1,
+            self.account_2,
+        ]
+        assert [acc.balance for acc in resp.context["available_accounts"]] == [
+            Money.parse("100"),
+            Money.parse("200"),
+        ]
+        assert resp.context["summary"].accounts_count == 2
+
+    def test_history(self):
+        resp = self.client.get(reverse("bank-accounts:history-async"))
+
+        assert resp.status_code == 200
+        assert [t.pk for t in resp.context["transfers"]] == [
+            self.transfer.pk,
+            self.deposit.pk,
+        ]
+
+    def test_history_filtered(self):
+        resp = self.client.get(
+            reverse("bank-accounts:history-async"),
+            {"by_account": self.account_1.id},
+        )
+
+        assert resp.status_code == 200
+        assert [t.pk for t in resp.context["transfers"]] == [self.transfer.pk]
+
+    @pytest.mark.parametrize("by_account", ["abc", "999999"])
+    def test_history_invalid_filter(self, by_account):
+        resp = self.client.get(
+            reverse("bank-accounts:history-async"), {"by_account": by_account}
+        )
+
+        assert resp.status_code == 400
+        assert "by_account" in resp.context["history_filters"].errors
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncUsecases:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account_1 = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("100")
+        )
+        self.account_2 = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("100")
+        )
+
+    def test_execute(self):
+        command = DepositCommand(
+            name="deposit1",
+            to_account=self.account_1.id,
+            currency=self.currency.id,
+            value=Money.parse("10"),
+        )
+
+        transfer = async_to_sync(AsyncUsecase(DepositUsecase()).execute)(
+            command
+        )
+
+        assert transfer.value == Money.parse("10")
+        self.account_1.refresh_from_db()
+        assert self.account_1.funds == Money.parse("110")
+
+    def test_execute_raises_usecase_errors(self):
+        command = TransferCommand(
+            name="transfer1",
+            from_account=self.account_1.id,
+            to_account=self.account_2.id,
+            currency=self.currency.id,
+            value=Money.parse("1000"),
+        )
+
+        with pytest.raises(InvalidWithdrawAmountException):
+            async_to_sync(AsyncUsecase(TransferUsecase()).execute)(command)
+
+        self.account_1.refresh_from_db()
+        assert self.account_1.funds == Money.parse("100")
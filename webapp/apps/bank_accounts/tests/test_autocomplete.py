@@ -0,0 +1,98 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+
+from ..const import ACCOUNT_AUTOCOMPLETE_LIMIT
+from ..models import Account, Currency
+
+
+@pytest.mark.django_db()
+class TestAccountAutocomplete:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client):
+        self.client = client
+        self.url = reverse("bank-accounts:account-autocomplete")
+        self.currency = Currency.objects.create(symbol="USD")
+
+    def _create_accounts(self, *names):
+        return [
+            Account.objects.create(name=name, currency=self.currency)
+            for name in names
+        ]
+
+    def test_prefix_search(self):
+        savings, salary, _ = self._create_accounts(
+            "Savings", "salary", "Checking"
+        )
+
+        resp = self.client.get(self.url, {"q": "sa"})
+
+        assert resp.status_code == 200
+        assert resp.json()["results"] == [
+            {
+                "id": savings.id,
+                "name": "Savings",
+                "currency_id": self.currency.id,
+            },
+            {
+                "id": salary.id,
+                "name": "salary",
+                "currency_id": self.currency.id,
+            },
+        ]
+
+    def test_results_are_limited(self):
+        self._create_accounts(
+            *(f"acc {idx:03}" for idx in range(ACCOUNT_AUTOCOMPLETE_LIMIT + 5))
+        )
+
+        resp = self.client.get(self.url, {"q": "acc"})
+
+        assert len(resp.json()["results"]) == ACCOUNT_AUTOCOMPLETE_LIMIT
+
+    def test_empty_query(self):
+        self._create_accounts("Savings")
+
+        resp = self.client.get(self.url, {"q": " "})
+
+        assert resp.json()["results"] == []
+
+    @pytest.mark.parametrize(
+        "url_name", ["deposit", "withdraw", "transfer", "history"]
+    )
+    def test_form_page_does_not_load_accounts(self, url_name):
+        url = reverse(f"bank-accounts:{url_name}")
+        self._create_accounts("test0")
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+
+        self._create_accounts(*(f"test{idx}" for idx in range(1, 50)))
+
+        with CaptureQueriesContext(connection) as many:
+            resp = self.client.get(url)
+
+        assert resp.status_code == 200
+        assert len(many.captured_queries) <= len(few.captured_queries)
+        assert "test49" not in resp.content.decode()
+
+    def test_form_rejects_unknown_account(self):
+        resp = self.client.post(
+            reverse("bank-accounts:deposit"),
+            data={
+                "name": "deposit1",
+                "to_account": "abc",
+                "currency": self.currency.id,
+                "value": "10",
+            },
+        )
+
+        assert resp.status_code == 400
+        assert resp.context_data["deposit_form"].errors == {
+            "to_account": [
+                "Select a valid choice. abc is not one of the available "
+                "choices."
+            ]
+        }
@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+
+import pytest
+
+from ..models import Account, BalanceCheckpoint, Currency, Transfer
+from ..money import Money
+from ..queries import balance_queries
+from ..usecases import (
+    AddAccountCommand,
+    AddAccountUsecase,
+    CreateBalanceCheckpointsCommand,
+    CreateBalanceCheckpointsUsecase,
+)
+
+
+@pytest.mark.django_db()
+class TestBalanceCheckpoints:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.now = timezone.now()
+        self.currency = Currency.objects.create(symbol="USD")
+        AddAccountUsecase().execute(
+            AddAccountCommand(
+                name="test1",
+                description="",
+                currency=self.currency.id,
+                funds=Money.parse("100"),
+            )
+        )
+        self.account = Account.objects.get(name="test1")
+        self.other = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("1000")
+        )
+        Account.objects.filter(pk__in=[self.account.pk, self.other.pk]).update(
+            created_date=self._at(0)
+        )
+        BalanceCheckpoint.objects.update(as_of=self._at(0))
+        self.account.refresh_from_db()
+        self.other.refresh_from_db()
+
+    def _at(self, minutes):
+        return self.now - timedelta(minutes=60 - minutes)
+
+    def _book(self, minutes, value, from_account=None, to_account=None):
+        transfer = Transfer.objects.create(
+            name="transfer",
+            from_account=from_account,
+            to_account=to_account,
+            currency=self.currency,
+            value=Money.parse(value),
+        )
+        Transfer.objects.filter(pk=transfer.pk).update(
+            transfer_date=self._at(minutes)
+        )
+
+        for account in (from_account, to_account):
+            if account is not None:
+                sign = 1 if account == to_account else -1
+                Account.objects.filter(pk=account.pk).update(
+                    funds=account.funds + sign * Money.parse(value)
+                )
+                account.refresh_from_db()
+
+    def _history(self):
+        self._book(10, "50", to_account=self.account)
+        self._book(20, "30", from_account=self.account, to_account=self.other)
+        self._book(30, "5.50", from_account=self.account)
+        self._book(40, "200", from_account=self.other, to_account=self.account)
+
+    def _checkpoint(self, minutes):
+        return CreateBalanceCheckpointsUsecase().execute(
+            CreateBalanceCheckpointsCommand(as_of=self._at(minutes))
+        )
+
+    def test_new_account_has_opening_checkpoint(self):
+        assert balance_queries.balance_at(
+            self.account, self._at(5)
+        ) == Money.parse("100")
+
+    def test_balance_before_account_existed(self):
+        assert balance_queries.balance_at(self.account, self._at(-5)) is None
+
+    @pytest.mark.parametrize(
+        "minutes, expected",
+        [
+            (0, "100"),
+            (10, "150"),
+            (15, "150"),
+            (20, "120"),
+            (35, "114.50"),
+            (59, "314.50"),
+        ],
+    )
+    def test_balance_at(self, minutes, expected):
+        self._history()
+
+        assert self._checkpoint(25) == 2
+        assert balance_queries.balance_at(
+            self.account, self._at(minutes)
+        ) == Money.parse(expected)
+
+    def test_checkpoint_skips_idle_accounts(self):
+        self._book(10, "50", to_account=self.account)
+
+        # second account gets its first checkpoint
+        assert self._checkpoint(25) == 2
+        assert self._checkpoint(30) == 0
+        assert BalanceCheckpoint.objects.filter(
+            account=self.account,
+            as_of=self._at(25),
+            balance=Money.parse("150"),
+        ).exists()
+
+    def test_lookup_starts_from_nearest_checkpoint(
+        self, django_assert_num_queries
+    ):
+        self._history()
+        self._checkpoint(35)
+
+        with django_assert_num_queries(2):
+            balance = balance_queries.balance_at(self.account, self._at(45))
+
+        assert balance == Money.parse("314.50")
+
+    def test_account_without_checkpoint(self):
+        self._history()
+
+        assert balance_queries.balance_at(
+            self.other, self._at(25)
+        ) == Money.parse("1030")
+
+        call_command("checkpoint_balances", lag=0)
+
+        checkpoint = BalanceCheckpoint.objects.get(account=self.other)
+        assert checkpoint.balance == Money.parse("830")
+        assert balance_queries.balance_at(
+            self.other, self._at(25)
+        ) == Money.parse("1030")
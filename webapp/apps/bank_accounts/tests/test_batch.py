@@ -0,0 +1,170 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from ..exceptions import InvalidWithdrawAmountException
+from ..models import Account, Currency, Transfer
+from ..money import Money
+from ..usecases import (
+    BatchTransferUsecase,
+    DepositCommand,
+    TransferCommand,
+    WithdrawCommand,
+)
+
+
+@pytest.mark.django_db()
+class TestBatchTransferUsecase:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account_1 = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("100")
+        )
+        self.account_2 = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("100")
+        )
+
+    def _refresh(self):
+        self.account_1.refresh_from_db()
+        self.account_2.refresh_from_db()
+
+    def _valid_commands(self):
+        return [
+            DepositCommand(
+                name="deposit",
+                to_account=self.account_1.id,
+                currency=self.currency.id,
+                value=Money.parse("50"),
+            ),
+            TransferCommand(
+                name="transfer",
+                from_account=self.account_1.id,
+                to_account=self.account_2.id,
+                currency=self.currency.id,
+                value=Money.parse("150"),
+            ),
+            WithdrawCommand(
+                name="withdraw",
+                from_account=self.account_2.id,
+                currency=self.currency.id,
+                value=Money.parse("25.50"),
+            ),
+        ]
+
+    def test_batch_applies_commands_in_order(self):
+        results = BatchTransferUsecase().execute(self._valid_commands())
+
+        assert [r.applied for r in results] == [True, True, True]
+        assert [r.error for r in results] == ["", "", ""]
+        assert Transfer.objects.count() == 3
+        self._refresh()
+        assert self.account_1.funds == Money.parse("0")
+        assert self.account_2.funds == Money.parse("224.50")
+
+    def test_batch_all_or_nothing_rolls_back_everything(self):
+        commands = self._valid_commands() + [
+            WithdrawCommand(
+                name="too much",
+                from_account=self.account_1.id,
+                currency=self.currency.id,
+                value=Money.parse("1"),
+            )
+        ]
+
+        results = BatchTransferUsecase().execute(commands)
+
+        assert [r.applied for r in results] == [False, False, False, False]
+        assert results[3].error == (
+            "Withdraw amount cannot be higher than available funds"
+        )
+        assert Transfer.objects.count() == 0
+        self._refresh()
+        assert self.account_1.funds == Money.parse("100")
+        assert self.account_2.funds == Money.parse("100")
+
+    def test_error_without_message_rolls_back(self, monkeypatch):
+        prepare = BatchTransferUsecase._prepare
+
+        def fail_withdraw(usecase, command, *args):
+            if isinstance(command, WithdrawCommand):
+                raise InvalidWithdrawAmountException()
+
+            return prepare(usecase, command, *args)
+
+        monkeypatch.setattr(BatchTransferUsecase, "_prepare", fail_withdraw)
+
+        results = BatchTransferUsecase().execute(self._valid_commands())
+
+        assert [r.applied for r in results] == [False, False, False]
+        assert isinstance(results[2].exception, InvalidWithdrawAmountException)
+        assert not Transfer.objects.exists()
+
+    def test_batch_skip_failed_commits_valid_items(self):
+        commands = [
+            TransferCommand(
+                name="same account",
+                from_account=self.account_1.id,
+                to_account=self.account_1.id,
+                currency=self.currency.id,
+                value=Money.parse("1"),
+            ),
+            DepositCommand(
+                name="missing account",
+                to_account=0,
+                currency=self.currency.id,
+                value=Money.parse("1"),
+            ),
+            DepositCommand(
+                name="invalid account id",
+                to_account="abc",
+                currency=self.currency.id,
+                value=Money.parse("1"),
+            ),
+        ] + self._valid_commands()
+
+        results = BatchTransferUsecase(skip_failed=True).execute(commands)
+
+        assert [r.applied for r in results] == [
+            False,
+            False,
+            False,
+            True,
+            True,
+            True,
+        ]
+        assert results[0].error == (
+            "Source account is same as target account, its not allowed."
+        )
+        assert results[1].error == "Account with id 0 does not exist"
+        assert results[2].error == "Account with id abc does not exist"
+        assert Transfer.objects.count() == 3
+        self._refresh()
+        assert self.account_1.funds == Money.parse("0")
+        assert self.account_2.funds == Money.parse("224.50")
+
+    def test_batch_query_count_does_not_grow_with_batch_size(self):
+        commands = [
+            TransferCommand(
+                name=f"transfer {idx}",
+                from_account=self.account_1.id,
+                to_account=self.account_2.id,
+                currency=self.currency.id,
+                value=Money.parse("0.01"),
+            )
+            for idx in range(100)
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            BatchTransferUsecase().execute(commands)
+
+        # currencies, locked accounts, bulk insert, one UPDATE per account,
+        # bulk insert of journal entries, daily stats upsert
+        data_queries = [
+            query
+            for query in ctx.captured_queries
+            if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))
+        ]
+        assert len(data_queries) == 7
+        assert Transfer.objects.count() == 100
@@ -0,0 +1,142 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.db.models import Sum
+
+import pytest
+
+from ..exceptions import (
+    ConcurrentUpdateException,
+    InvalidWithdrawAmountException,
+)
+from ..models import Account, Currency
+from ..money import Money
+from ..usecases import (
+    DepositCommand,
+    DepositUsecase,
+    TransferCommand,
+    TransferUsecase,
+    WithdrawCommand,
+    WithdrawUsecase,
+)
+
+WORKERS = 8
+OPERATIONS_PER_WORKER = 25
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="Row locks are only meaningful on PostgreSQL",
+)
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentUsecases:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+        self.accounts = [
+            Account.objects.create(
+                name=f"test{idx}",
+                currency=self.currency,
+                funds=Money.parse("1000"),
+            )
+            for idx in range(4)
+        ]
+        self.account_ids = [acc.pk for acc in self.accounts]
+
+    def _total_funds(self):
+        return Account.objects.filter(currency=self.currency).aggregate(
+            total=Sum("funds")
+        )["total"]
+
+    def _run_workers(self, worker):
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            return list(executor.map(worker, range(WORKERS)))
+
+    def _transfer_worker(self, seed):
+        rnd = random.Random(seed)
+        usecase = TransferUsecase()
+
+        try:
+            for _ in range(OPERATIONS_PER_WORKER):
+                from_account, to_account = rnd.sample(self.account_ids, 2)
+                command = TransferCommand(
+                    name="concurrent",
+                    from_account=from_account,
+                    to_account=to_account,
+                    currency=self.currency.pk,
+                    value=Money(rnd.randint(1, 50000)),
+                )
+
+                try:
+                    usecase.execute(command)
+                except (
+                    ConcurrentUpdateException,
+                    InvalidWithdrawAmountException,
+                ):
+                    pass
+        finally:
+            connection.close()
+
+    def _deposit_withdraw_worker(self, seed):
+        rnd = random.Random(seed)
+        booked = Money(0)
+
+        try:
+            for _ in range(OPERATIONS_PER_WORKER):
+                value = Money(rnd.randint(1, 10000))
+
+                try:
+                    DepositUsecase().execute(
+                        DepositCommand(
+                            name="deposit",
+                            to_account=self.account_ids[0],
+                            currency=self.currency.pk,
+                            value=value,
+                        )
+                    )
+                    booked += value
+                except ConcurrentUpdateException:
+                    pass
+
+                try:
+                    WithdrawUsecase().execute(
+                        WithdrawCommand(
+                            name="withdraw",
+                            from_account=self.account_ids[0],
+                            currency=self.currency.pk,
+                            value=value,
+                        )
+                    )
+                    booked -= value
+                except (
+                    ConcurrentUpdateException,
+                    InvalidWithdrawAmountException,
+                ):
+                    pass
+        finally:
+            connection.close()
+
+        return booked
+
+    def test_concurrent_transfers_conserve_funds(self):
+        expected_total = self._total_funds()
+
+        self._run_workers(self._transfer_worker)
+
+        assert self._total_funds() == expected_total
+        assert not Account.objects.filter(funds__lt=0).exists()
+
+    def test_concurrent_deposits_and_withdrawals_do_not_lose_updates(self):
+        initial_total = self._total_funds()
+
+        booked = self._run_workers(self._deposit_withdraw_worker)
+
+        assert self._total_funds() == initial_total + sum(booked)
+
+
+class TestOptimisticConcurrentUsecases(TestConcurrentUsecases):
+    @pytest.fixture(autouse=True, scope="function")
+    def _optimistic(self, settings):
+        settings.OPTIMISTIC_LOCKING = True
+        settings.OPTIMISTIC_LOCKING_RETRIES = 20
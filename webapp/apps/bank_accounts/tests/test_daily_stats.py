@@ -0,0 +1,201 @@
+import itertools
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+
+import pytest
+
+from ..exceptions import InvalidWithdrawAmountException
+from ..models import Account, Currency, DailyAccountStats, Transfer
+from ..money import Money
+from ..queries import daily_stats_queries
+from ..usecases import (
+    BatchTransferUsecase,
+    DepositCommand,
+    DepositUsecase,
+    SetBalanceSlotsCommand,
+    SetBalanceSlotsUsecase,
+    TransferCommand,
+    TransferUsecase,
+    WithdrawCommand,
+    WithdrawUsecase,
+    daily_stats as daily_stats_usecases,
+)
+
+
+@pytest.mark.django_db()
+class TestDailyAccountStats:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account_1 = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("100")
+        )
+        self.account_2 = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("100")
+        )
+        self.today = timezone.localdate()
+
+    def _commands(self):
+        return [
+            DepositCommand(
+                name="deposit1",
+                to_account=self.account_1.id,
+                currency=self.currency.id,
+                value=Money.parse("20"),
+            ),
+            TransferCommand(
+                name="transfer1",
+                from_account=self.account_1.id,
+                to_account=self.account_2.id,
+                currency=self.currency.id,
+                value=Money.parse("30"),
+            ),
+            WithdrawCommand(
+                name="withdraw1",
+                from_account=self.account_1.id,
+                currency=self.currency.id,
+                value=Money.parse("5"),
+            ),
+        ]
+
+    def _stats(self):
+        return {
+            stats.account_id: (
+                stats.day,
+                stats.inflow,
+                stats.outflow,
+                stats.transfers_in,
+                stats.transfers_out,
+            )
+            for stats in DailyAccountStats.objects.all()
+        }
+
+    def _expected(self):
+        return {
+            self.account_1.id: (
+                self.today,
+                Money.parse("20"),
+                Money.parse("35"),
+                1,
+                2,
+            ),
+            self.account_2.id: (
+                self.today,
+                Money.parse("30"),
+                Money.parse("0"),
+                1,
+                0,
+            ),
+        }
+
+    def test_usecases_increment_stats(self):
+        deposit, transfer, withdraw = self._commands()
+
+        DepositUsecase().execute(deposit)
+        TransferUsecase().execute(transfer)
+        WithdrawUsecase().execute(withdraw)
+
+        assert self._stats() == self._expected()
+
+    def test_fast_path_increments_stats(self, settings):
+        settings.TRANSFER_FAST_PATH = True
+        deposit, transfer, withdraw = self._commands()
+
+        DepositUsecase().execute(deposit)
+        TransferUsecase().execute(transfer)
+        WithdrawUsecase().execute(withdraw)
+
+        assert self._stats() == self._expected()
+
+    def test_batch_increments_stats(self):
+        BatchTransferUsecase().execute(self._commands())
+
+        assert self._stats() == self._expected()
+
+    def test_failed_usecase_does_not_count(self):
+        WithdrawUsecase().execute(self._commands()[2])
+
+        with pytest.raises(InvalidWithdrawAmountException):
+            WithdrawUsecase().execute(
+                WithdrawCommand(
+                    name="too much",
+                    from_account=self.account_1.id,
+                    currency=self.currency.id,
+                    value=Money.parse("999"),
+                )
+            )
+
+        assert self._stats()[self.account_1.id][4] == 1
+
+    def test_totals(self):
+        BatchTransferUsecase().execute(self._commands())
+        DailyAccountStats.objects.create(
+            account=self.account_1,
+            day=self.today - timedelta(days=400),
+            inflow=Money.parse("1000"),
+        )
+
+        totals = daily_stats_queries.get_totals(
+            self.account_1.id, self.today - timedelta(days=364), self.today
+        )
+
+        assert totals == {
+            "inflow": Money.parse("20"),
+            "outflow": Money.parse("35"),
+            "transfers_in": 1,
+            "transfers_out": 2,
+        }
+
+    def test_rebuild_matches_incremental(self):
+        BatchTransferUsecase().execute(self._commands())
+        Transfer.objects.filter(name="deposit1").update(
+            transfer_date=timezone.now() - timedelta(days=1)
+        )
+        DailyAccountStats.objects.all().delete()
+
+        call_command("rebuild_daily_stats", "--workers", "1")
+
+        report = daily_stats_queries.get_report(
+            self.account_1.id, self.today - timedelta(days=1), self.today
+        )
+        assert [
+            (s.day, s.inflow, s.outflow, s.transfers_in, s.transfers_out)
+            for s in report
+        ] == [
+            (self.today - timedelta(days=1), Money.parse("20"), 0, 1, 0),
+            (self.today, 0, Money.parse("35"), 0, 2),
+        ]
+        assert self._stats()[self.account_2.id] == (
+            self._expected()[self.account_2.id]
+        )
+
+    def test_hot_account_writes_slot_rows(self, monkeypatch):
+        SetBalanceSlotsUsecase().execute(
+            SetBalanceSlotsCommand(account=self.account_1.id, slots=4)
+        )
+        # slots of funds and stats are picked in turn
+        picks = itertools.count()
+        monkeypatch.setattr(
+            daily_stats_usecases.random,
+            "randrange",
+            lambda n: next(picks) % n,
+        )
+        deposit, transfer, withdraw = self._commands()
+
+        DepositUsecase().execute(deposit)
+        TransferUsecase().execute(transfer)
+        WithdrawUsecase().execute(withdraw)
+
+        assert (
+            DailyAccountStats.objects.filter(account=self.account_1).count()
+            > 1
+        )
+        report = daily_stats_queries.get_report(
+            self.account_1.id, self.today, self.today
+        )
+        assert [
+            (s.day, s.inflow, s.outflow, s.transfers_in, s.transfers_out)
+            for s in report
+        ] == [self._expected()[self.account_1.id]]
@@ -1,11 +1,10 @@
-from decimal import Decimal
-
 from django.urls import reverse
 
 import pytest
 
 from ..models import Account, Currency, Transfer
-from .utils import funds_to_decimal, generate_fake_money_value
+from ..money import Money
+from .utils import funds_to_money, generate_fake_money_value
 
 
 @pytest.mark.django_db()
@@ -38,7 +37,7 @@ class TestDepositsUsecases:
             "currency": self.currency.id,
             "value": generate_fake_money_value(),
         }
-        expected_funds = self.account.funds + funds_to_decimal(data["value"])
+        expected_funds = self.account.funds + funds_to_money(data["value"])
 
         resp = self.client.post(self.url, data=data)
 
@@ -49,7 +48,7 @@ class TestDepositsUsecases:
         assert all_transfers[0].from_account is None
         assert all_transfers[0].to_account == self.account
         assert all_transfers[0].currency == self.currency
-        assert all_transfers[0].value == Decimal(str(data["value"]))
+        assert all_transfers[0].value == Money.parse(data["value"])
         self.account.refresh_from_db()
         assert self.account.funds == expected_funds
 
@@ -67,7 +66,7 @@ class TestDepositsUsecases:
             "value": generate_fake_money_value(),
         }
         expected_funds = self.account.funds + (
-            Decimal(str(data_1["value"])) + funds_to_decimal(data_2["value"])
+            Money.parse(data_1["value"]) + funds_to_money(data_2["value"])
         )
 
         self.client.post(self.url, data=data_1)
@@ -80,12 +79,12 @@ class TestDepositsUsecases:
         assert all_transfers[0].from_account is None
         assert all_transfers[0].to_account == self.account
         assert all_transfers[0].currency == self.currency
-        assert all_transfers[0].value == funds_to_decimal(data_1["value"])
+        assert all_transfers[0].value == funds_to_money(data_1["value"])
         assert all_transfers[1].name == data_2["name"]
         assert all_transfers[1].from_account is None
         assert all_transfers[1].to_account == self.account
         assert all_transfers[1].currency == self.currency
-        assert all_transfers[1].value == funds_to_decimal(data_2["value"])
+        assert all_transfers[1].value == funds_to_money(data_2["value"])
         self.account.refresh_from_db()
         assert self.account.funds == expected_funds
 
@@ -0,0 +1,272 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+import pytest
+
+from ..analytics import load_transfers, net_flow
+from ..exceptions import (
+    InvalidExchangeRateException,
+    InvalidTransferCurrencyException,
+)
+from ..models import Account, AccountEntry, Currency, ExchangeRate, Transfer
+from ..money import Money
+from ..partitions import add_months, current_month
+from ..queries import balance_queries, exchange_rate_queries
+from ..usecases import (
+    BatchTransferUsecase,
+    FastTransferUsecase,
+    LoadExchangeRatesCommand,
+    LoadExchangeRatesUsecase,
+    TransferCommand,
+    TransferUsecase,
+)
+
+
+@pytest.mark.django_db()
+class TestExchangeRates:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.now = timezone.now()
+        self.usd = Currency.objects.create(symbol="USD")
+        self.eur = Currency.objects.create(symbol="EUR")
+        self.usd_account = Account.objects.create(
+            name="test1", currency=self.usd, funds=Money.parse("100")
+        )
+        self.eur_account = Account.objects.create(
+            name="test2", currency=self.eur, funds=Money.parse("100")
+        )
+
+    def _load(self, *rates):
+        return LoadExchangeRatesUsecase().execute(
+            LoadExchangeRatesCommand(
+                rates=[
+                    (self.usd.pk, self.eur.pk, Decimal(rate), effective_from)
+                    for rate, effective_from in rates
+                ]
+            )
+        )
+
+    def _command(self, value="10"):
+        return TransferCommand(
+            name="transfer1",
+            from_account=self.usd_account.id,
+            to_account=self.eur_account.id,
+            currency=self.usd.id,
+            value=Money.parse(value),
+        )
+
+    def test_rate_in_effect_is_found(self, django_assert_num_queries):
+        self._load(
+            ("0.90", self.now - timedelta(days=2)),
+            ("0.95", self.now - timedelta(days=1)),
+            ("0.80", self.now + timedelta(days=1)),
+        )
+        exchange_rate_queries.get_rate(self.usd.pk, self.eur.pk, self.now)
+
+        with django_assert_num_queries(0):
+            rates = [
+                exchange_rate_queries.get_rate(
+                    self.usd.pk, self.eur.pk, self.now + timedelta(days=days)
+                )
+                for days in (-3, -2, 0, 1)
+            ]
+            missing = exchange_rate_queries.get_rate(
+                self.eur.pk, self.usd.pk, self.now
+            )
+
+        assert rates[0] is None
+        assert [rate.rate for rate in rates[1:]] == [
+            Decimal("0.90"),
+            Decimal("0.95"),
+            Decimal("0.80"),
+        ]
+        assert missing is None
+
+    def test_loading_rates_invalidates_cache(self):
+        self._load(("0.90", self.now - timedelta(days=2)))
+        rate = exchange_rate_queries.get_rate(
+            self.usd.pk, self.eur.pk, self.now
+        )
+
+        assert rate.rate == Decimal("0.90")
+
+        assert self._load(("0.95", self.now - timedelta(days=1))) == 1
+        assert self._load(("0.95", self.now - timedelta(days=1))) == 0
+
+        rate = exchange_rate_queries.get_rate(
+            self.usd.pk, self.eur.pk, self.now
+        )
+        assert rate.rate == Decimal("0.95")
+
+    def test_only_added_rates_are_counted(self):
+        self._load(("0.90", self.now - timedelta(days=2)))
+
+        added = self._load(
+            ("0.91", self.now - timedelta(days=2)),
+            ("0.95", self.now - timedelta(days=1)),
+            ("0.96", self.now - timedelta(days=1)),
+        )
+
+        assert added == 1
+        assert sorted(ExchangeRate.objects.values_list("rate", flat=True)) == [
+            Decimal("0.90"),
+            Decimal("0.95"),
+        ]
+
+    def test_transfer_uses_one_rate_lookup_time(self, monkeypatch):
+        switch = self.now + timedelta(minutes=1)
+        self._load(
+            ("0.5", self.now - timedelta(days=1)),
+            ("2", switch),
+        )
+        # clock passes rate switch while transfer is being made
+        times = iter([switch - timedelta(microseconds=1)])
+        monkeypatch.setattr(
+            timezone, "now", lambda: next(times, switch + timedelta(seconds=1))
+        )
+
+        transfer = TransferUsecase().execute(self._command("10"))
+
+        assert transfer.exchange_rate.rate == Decimal("0.5")
+        assert transfer.to_value == Money.parse("5")
+
+    def test_rates_loaded_by_other_process_are_seen(self):
+        self._load(("0.90", self.now - timedelta(days=2)))
+        exchange_rate_queries.get_rate(self.usd.pk, self.eur.pk, self.now)
+        # other process adds rate and bumps version through its own
+        # connection to shared cache
+        ExchangeRate.objects.create(
+            from_currency=self.usd,
+            to_currency=self.eur,
+            rate=Decimal("0.95"),
+            effective_from=self.now - timedelta(days=1),
+        )
+        caches.create_connection("default").incr(
+            exchange_rate_queries.cache.version_key
+        )
+
+        rate = exchange_rate_queries.get_rate(
+            self.usd.pk, self.eur.pk, self.now
+        )
+
+        assert rate.rate == Decimal("0.95")
+
+    @pytest.mark.parametrize("rate, currency", [("0", "eur"), ("1", "usd")])
+    def test_invalid_rate(self, rate, currency):
+        with pytest.raises(InvalidExchangeRateException):
+            LoadExchangeRatesUsecase().execute(
+                LoadExchangeRatesCommand(
+                    rates=[
+                        (
+                            self.usd.pk,
+                            getattr(self, currency).pk,
+                            Decimal(rate),
+                            self.now,
+                        )
+                    ]
+                )
+            )
+
+    @pytest.mark.parametrize("usecase", [TransferUsecase, FastTransferUsecase])
+    def test_transfer_is_converted(self, usecase):
+        self._load(("0.925", self.now - timedelta(days=1)))
+
+        transfer = usecase().execute(self._command("10.05"))
+
+        transfer.refresh_from_db()
+        self.usd_account.refresh_from_db()
+        self.eur_account.refresh_from_db()
+        # 9.29625 rounds to 9.30
+        assert transfer.value == Money.parse("10.05")
+        assert transfer.to_value == Money.parse("9.30")
+        assert transfer.exchange_rate.rate == Decimal("0.925")
+        assert self.usd_account.funds == Money.parse("89.95")
+        assert self.eur_account.funds == Money.parse("109.30")
+        assert sorted(
+            AccountEntry.objects.values_list("account_id", "amount")
+        ) == [
+            (self.usd_account.pk, Money.parse("-10.05")),
+            (self.eur_account.pk, Money.parse("9.30")),
+        ]
+        # accounts have no opening checkpoint, ledger holds transfers only
+        assert {
+            balance.account_id: balance.expected
+            for balance in balance_queries.get_ledger("range", (0, 10**9))
+        } == {
+            self.usd_account.pk: Money.parse("-10.05"),
+            self.eur_account.pk: Money.parse("9.30"),
+        }
+
+    def test_transfer_without_rate(self):
+        self._load(("0.90", self.now + timedelta(days=1)))
+
+        with pytest.raises(InvalidTransferCurrencyException):
+            TransferUsecase().execute(self._command())
+
+        assert not Transfer.objects.exists()
+
+    def test_batch_transfer_is_converted(self):
+        self._load(("2", self.now - timedelta(days=1)))
+
+        (result,) = BatchTransferUsecase().execute([self._command("1.50")])
+
+        assert result.applied
+        assert result.transfer.to_value == Money.parse("3")
+        self.eur_account.refresh_from_db()
+        assert self.eur_account.funds == Money.parse("103")
+
+    def test_load_command(self):
+        path = self.tmp_path / "rates.csv"
+        path.write_text(
+            "from_currency,to_currency,rate,effective_from\n"
+            "USD,EUR,0.9,2020-01-01T00:00:00\n"
+            "EUR,USD,1.1,2020-01-01T00:00:00+01:00\n"
+        )
+
+        call_command("load_exchange_rates", str(path))
+        call_command("load_exchange_rates", str(path))
+
+        assert ExchangeRate.objects.count() == 2
+        assert exchange_rate_queries.get_rate(
+            self.eur.pk, self.usd.pk, self.now
+        ).rate == Decimal("1.1")
+
+    def test_load_command_rejects_unknown_currency(self):
+        path = self.tmp_path / "rates.csv"
+        path.write_text(
+            "from_currency,to_currency,rate,effective_from\n"
+            "USD,GBP,0.8,2020-01-01T00:00:00\n"
+        )
+
+        with pytest.raises(CommandError):
+            call_command("load_exchange_rates", str(path))
+
+        assert not ExchangeRate.objects.exists()
+
+    def test_archived_transfer_keeps_converted_value(self, settings):
+        settings.TRANSFER_ARCHIVE_DIR = str(self.tmp_path)
+        month = add_months(current_month(), -2)
+        self._load(("0.5", datetime(2000, 1, 1, tzinfo=dt_timezone.utc)))
+        transfer = TransferUsecase().execute(self._command("10"))
+        Transfer.objects.filter(pk=transfer.pk).update(
+            transfer_date=datetime(
+                month.year, month.month, 2, tzinfo=dt_timezone.utc
+            )
+        )
+        ledger = balance_queries.get_ledger("range", (0, 10**9))
+
+        call_command("archive_transfers", "--months", "1")
+
+        assert not Transfer.objects.exists()
+        assert balance_queries.get_ledger("range", (0, 10**9)) == ledger
+        assert {
+            flow.account_id: flow.net for flow in net_flow(load_transfers())
+        } == {
+            self.usd_account.pk: Money.parse("-10"),
+            self.eur_account.pk: Money.parse("5"),
+        }
@@ -0,0 +1,116 @@
+import csv
+import gzip
+import io
+import json
+
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+
+from ..exports import EXPORT_COLUMNS
+from ..models import Account, Currency
+from ..money import Money
+from .utils import create_transfer
+
+
+@pytest.mark.django_db()
+class TestHistoryExport:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client, settings):
+        settings.EXPORT_CHUNK_SIZE = 2
+        self.client = client
+        self.url = reverse("bank-accounts:history-export")
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account_1 = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("1000")
+        )
+        self.account_2 = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("1000")
+        )
+        self.transfers = [
+            create_transfer(
+                name=f"transfer_{i}",
+                from_account=self.account_1 if i % 2 else None,
+                to_account=self.account_2,
+                currency=self.currency,
+                value=Money.parse("1.50"),
+            )
+            for i in range(5)
+        ]
+
+    def _csv(self, content):
+        return list(csv.DictReader(io.StringIO(content.decode())))
+
+    def test_export_csv(self):
+        resp = self.client.get(self.url)
+
+        assert resp.status_code == 200
+        assert resp.streaming
+        assert resp["Content-Type"] == "text/csv"
+        rows = self._csv(b"".join(resp.streaming_content))
+        assert [int(row["pk"]) for row in rows] == [
+            t.pk for t in self.transfers
+        ]
+        assert rows[1] == {
+            "pk": str(self.transfers[1].pk),
+            "name": "transfer_1",
+            "from_account": "test1",
+            "to_account": "test2",
+            "value": "1.50",
+            "currency": "USD",
+            "transfer_date": self.transfers[1].transfer_date.isoformat(),
+        }
+
+    def test_export_ndjson_by_account(self):
+        resp = self.client.get(
+            self.url, {"format": "ndjson", "by_account": self.account_1.pk}
+        )
+
+        assert resp.status_code == 200
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [row["pk"] for row in rows] == [
+            t.pk for t in self.transfers[1::2]
+        ]
+        assert list(rows[0]) == EXPORT_COLUMNS
+
+    def test_export_gzip(self):
+        resp = self.client.get(self.url, {"gzip": "1"})
+
+        assert resp["Content-Encoding"] == "gzip"
+        content = gzip.decompress(b"".join(resp.streaming_content))
+        assert len(self._csv(content)) == 5
+
+    def test_header_is_sent_before_query(self, django_assert_num_queries):
+        resp = self.client.get(self.url)
+
+        with django_assert_num_queries(0):
+            header = next(iter(resp.streaming_content))
+
+        assert header.decode().strip() == ",".join(EXPORT_COLUMNS)
+
+    @pytest.mark.parametrize(
+        "params", [{"format": "xml"}, {"by_account": "missing"}]
+    )
+    def test_invalid_params(self, params):
+        resp = self.client.get(self.url, params)
+
+        assert resp.status_code == 400
+
+    def test_command(self, tmp_path):
+        output = tmp_path / "transfers.csv.gz"
+
+        call_command(
+            "export_transfers",
+            "--account",
+            str(self.account_1.pk),
+            "--gzip",
+            "--output",
+            str(output),
+        )
+
+        rows = self._csv(gzip.decompress(output.read_bytes()))
+        assert [int(row["pk"]) for row in rows] == [
+            t.pk for t in self.transfers[1::2]
+        ]
@@ -0,0 +1,86 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from ..models import Account, Currency, Transfer
+from ..money import Money
+from ..usecases import (
+    FastTransferUsecase,
+    FastWithdrawUsecase,
+    TransferCommand,
+    WithdrawCommand,
+)
+from . import test_transfers, test_withdrawals
+
+
+def _data_queries(queries):
+    return [
+        query["sql"]
+        for query in queries
+        if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))
+    ]
+
+
+class TestFastPathTransfers(test_transfers.TestTransfersUsecases):
+    @pytest.fixture(autouse=True, scope="function")
+    def _fast_path(self, settings):
+        settings.TRANSFER_FAST_PATH = True
+
+
+class TestFastPathWithdrawals(test_withdrawals.TestWithdrawalsUsecases):
+    @pytest.fixture(autouse=True, scope="function")
+    def _fast_path(self, settings):
+        settings.TRANSFER_FAST_PATH = True
+
+
+@pytest.mark.django_db()
+class TestFastPathRoundTrips:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+        self.from_account = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("1000")
+        )
+        self.to_account = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("1000")
+        )
+
+    def test_transfer_does_not_select(self):
+        command = TransferCommand(
+            name="transfer1",
+            from_account=self.from_account.id,
+            to_account=self.to_account.id,
+            currency=self.currency.id,
+            value=Money.parse("10.50"),
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            FastTransferUsecase().execute(command)
+
+        queries = _data_queries(ctx.captured_queries)
+        assert len(queries) == 5
+        assert not [sql for sql in queries if sql.startswith("SELECT")]
+        self.from_account.refresh_from_db()
+        self.to_account.refresh_from_db()
+        assert self.from_account.funds == Money.parse("989.50")
+        assert self.to_account.funds == Money.parse("1010.50")
+        assert Transfer.objects.count() == 1
+
+    def test_withdraw_does_not_select(self):
+        command = WithdrawCommand(
+            name="withdraw1",
+            from_account=self.from_account.id,
+            currency=self.currency.id,
+            value=Money.parse("10.50"),
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            FastWithdrawUsecase().execute(command)
+
+        queries = _data_queries(ctx.captured_queries)
+        assert len(queries) == 4
+        assert not [sql for sql in queries if sql.startswith("SELECT")]
+        self.from_account.refresh_from_db()
+        assert self.from_account.funds == Money.parse("989.50")
+        assert Transfer.objects.count() == 1
@@ -0,0 +1,148 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.urls import reverse
+
+import pytest
+
+from ..exceptions import (
+    ConcurrentUpdateException,
+    InvalidDepositAmountException,
+)
+from ..models import Account, Currency, Transfer
+from ..money import Money
+from ..usecases import (
+    BatchTransferUsecase,
+    DepositCommand,
+    GroupCommitExecutor,
+    group_commit,
+)
+
+DEPOSITS = 8
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGroupCommit:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+        self.accounts = [
+            Account.objects.create(
+                name=f"test{idx}", currency=self.currency, funds=0
+            )
+            for idx in range(2)
+        ]
+        self.executor = GroupCommitExecutor(max_batch=DEPOSITS, max_wait=0.5)
+
+    def _command(self, idx, value="1"):
+        return DepositCommand(
+            name=f"deposit{idx}",
+            to_account=self.accounts[idx % 2].id,
+            currency=self.currency.id,
+            value=Money.parse(value),
+        )
+
+    def _execute_concurrently(self, commands):
+        def execute(command):
+            try:
+                return self.executor.execute(command)
+            except InvalidDepositAmountException as ex:
+                return ex
+
+        with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+            return list(pool.map(execute, commands))
+
+    def test_concurrent_deposits_share_commits(self):
+        commands = [self._command(idx) for idx in range(DEPOSITS)]
+
+        transfers = self._execute_concurrently(commands)
+
+        assert [t.name for t in transfers] == [c.name for c in commands]
+        assert Transfer.objects.count() == DEPOSITS
+        assert 1 <= self.executor.commits < DEPOSITS
+
+        for account in self.accounts:
+            account.refresh_from_db()
+            assert account.funds == Money.parse(DEPOSITS // 2)
+
+    def test_each_caller_gets_own_failure(self):
+        commands = [self._command(idx) for idx in range(DEPOSITS)]
+        commands[3] = self._command(3, value="-1")
+
+        results = self._execute_concurrently(commands)
+
+        assert isinstance(results[3], InvalidDepositAmountException)
+        assert all(
+            isinstance(result, Transfer)
+            for idx, result in enumerate(results)
+            if idx != 3
+        )
+        assert Transfer.objects.count() == DEPOSITS - 1
+
+    def test_failed_group_is_retried_one_by_one(self, monkeypatch):
+        execute = BatchTransferUsecase.execute
+
+        def fail_groups(usecase, commands):
+            if len(commands) > 1:
+                raise RuntimeError("group failed")
+
+            return execute(usecase, commands)
+
+        monkeypatch.setattr(BatchTransferUsecase, "execute", fail_groups)
+        commands = [self._command(idx) for idx in range(DEPOSITS)]
+
+        transfers = self._execute_concurrently(commands)
+
+        assert [t.name for t in transfers] == [c.name for c in commands]
+        assert Transfer.objects.count() == DEPOSITS
+
+    def test_connection_failure_reaches_callers(self, monkeypatch):
+        def fail():
+            raise RuntimeError("connection failed")
+
+        monkeypatch.setattr(group_commit, "close_old_connections", fail)
+
+        with pytest.raises(RuntimeError):
+            self.executor.execute(self._command(0))
+
+        assert not Transfer.objects.exists()
+
+    def test_caller_waits_at_most_timeout(self, monkeypatch):
+        release = threading.Event()
+
+        def stuck(usecase, commands):
+            release.wait()
+            raise RuntimeError("released")
+
+        monkeypatch.setattr(BatchTransferUsecase, "execute", stuck)
+        executor = GroupCommitExecutor(max_batch=1, max_wait=0, timeout=0.1)
+
+        try:
+            # first deposit is stuck in commit, second one in queue
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [
+                    pool.submit(executor.execute, self._command(idx))
+                    for idx in range(2)
+                ]
+
+                for future in futures:
+                    with pytest.raises(ConcurrentUpdateException):
+                        future.result()
+        finally:
+            release.set()
+
+    def test_deposit_view_uses_group_commit(self, client, settings):
+        settings.DEPOSIT_GROUP_COMMIT = True
+        data = {
+            "name": "deposit1",
+            "to_account": self.accounts[0].id,
+            "currency": self.currency.id,
+            "value": "10",
+        }
+
+        resp = client.post(reverse("bank-accounts:deposit"), data=data)
+
+        assert resp.status_code == 200
+        assert resp.context["success"]
+        self.accounts[0].refresh_from_db()
+        assert self.accounts[0].funds == Money.parse("10")
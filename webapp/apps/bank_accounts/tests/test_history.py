@@ -2,8 +2,11 @@ from django.urls import reverse
 
 import pytest
 
-from ..models import Account, Currency, Transfer
-from .utils import generate_fake_money_value
+from ..models import Account, Currency
+from ..money import Money
+from ..queries import transfer_queries
+from ..queries.transfers import TransferRow
+from .utils import create_transfer, generate_fake_money_value
 
 
 @pytest.mark.django_db()
@@ -17,49 +20,49 @@ class TestCurrenciesUsecases:
             name="test1",
             description="desc1",
             currency=self.currency,
-            funds=1000,
+            funds=Money.parse("1000"),
         )
         self.account_2 = Account.objects.create(
             name="test2",
             description="desc2",
             currency=self.currency,
-            funds=1000,
+            funds=Money.parse("1000"),
         )
 
     def _generate_fake_transactions(self):
-        transfer_1 = Transfer.objects.create(
+        transfer_1 = create_transfer(
             name="transfer_1",
             from_account=self.account_1,
             to_account=self.account_2,
             currency=self.currency,
             value=generate_fake_money_value(),
         )
-        transfer_2 = Transfer.objects.create(
+        transfer_2 = create_transfer(
             name="transfer_2",
             from_account=self.account_1,
             to_account=self.account_2,
             currency=self.currency,
             value=generate_fake_money_value(),
         )
-        deposit_1 = Transfer.objects.create(
+        deposit_1 = create_transfer(
             name="deposit_1",
             to_account=self.account_1,
             currency=self.currency,
             value=generate_fake_money_value(),
         )
-        deposit_2 = Transfer.objects.create(
+        deposit_2 = create_transfer(
             name="deposit_2",
             to_account=self.account_2,
             currency=self.currency,
             value=generate_fake_money_value(),
         )
-        withdrawal_1 = Transfer.objects.create(
+        withdrawal_1 = create_transfer(
             name="withdrawal_1",
             to_account=self.account_1,
             currency=self.currency,
             value=generate_fake_money_value(),
         )
-        withdrawal_2 = Transfer.objects.create(
+        withdrawal_2 = create_transfer(
             name="withdrawal_2",
             to_account=self.account_2,
             currency=self.currency,
@@ -83,7 +86,9 @@ class TestCurrenciesUsecases:
         assert resp.status_code == 200
         result_transfers = list(resp.context_data["transfers"])
         assert len(result_transfers) == 6
-        assert result_transfers == prepared_objects
+        assert [t.pk for t in result_transfers] == [
+            t.pk for t in prepared_objects
+        ]
 
     def test_history_show_filtered(self):
         prepared_objects = self._generate_fake_transactions()
@@ -100,7 +105,20 @@ class TestCurrenciesUsecases:
         assert resp.status_code == 200
         result_transfers = list(resp.context_data["transfers"])
         assert len(result_transfers) == 4
-        assert result_transfers == expected_result
+        assert [t.pk for t in result_transfers] == [
+            t.pk for t in expected_result
+        ]
+
+    @pytest.mark.parametrize("by_account", ["abc", "999999"])
+    def test_history_invalid_filter(self, by_account):
+        self._generate_fake_transactions()
+
+        resp = self.client.get(
+            self.url, {"by_account": by_account, "cursor": "bad"}
+        )
+
+        assert resp.status_code == 400
+        assert "by_account" in resp.context["history_filters"].errors
 
     def test_history_show_all_but_no_entries(self):
         resp = self.client.get(self.url)
@@ -108,3 +126,45 @@ class TestCurrenciesUsecases:
         assert resp.status_code == 200
         result_transfers = resp.context_data["transfers"]
         assert len(result_transfers) == 0
+
+    def test_history_rows_show_display_values(self):
+        transfer = self._generate_fake_transactions()[0]
+
+        resp = self.client.get(self.url)
+
+        row = resp.context_data["transfers"][0]
+        assert row == TransferRow(
+            pk=transfer.pk,
+            name="transfer_1",
+            from_account="test1",
+            to_account="test2",
+            value=transfer.value,
+            currency="USD",
+            transfer_date=transfer.transfer_date,
+        )
+        assert not hasattr(row, "__dict__")
+
+    @pytest.mark.parametrize("page_size", [1, 3, 50])
+    @pytest.mark.parametrize("by_account", [False, True])
+    def test_history_page_is_single_query(
+        self, django_assert_num_queries, page_size, by_account
+    ):
+        self._generate_fake_transactions()
+        account = self.account_1.pk if by_account else None
+
+        with django_assert_num_queries(1):
+            page = transfer_queries.get_row_page(page_size, account=account)
+            [(t.from_account, t.to_account, t.currency) for t in page.items]
+
+    def test_history_view_query_count_does_not_depend_on_rows(
+        self, django_assert_num_queries
+    ):
+        self.client.get(self.url)
+
+        with django_assert_num_queries(1):
+            self.client.get(self.url)
+
+        self._generate_fake_transactions()
+
+        with django_assert_num_queries(1):
+            self.client.get(self.url)
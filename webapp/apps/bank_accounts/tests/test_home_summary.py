@@ -0,0 +1,151 @@
+from django.core.cache import caches
+from django.urls import reverse
+
+import pytest
+
+from .. import views
+from ..models import Account, AccountBalanceSlot, Currency
+from ..money import Money
+from ..queries import summary_queries
+from ..usecases import (
+    AddAccountCommand,
+    AddAccountUsecase,
+    DepositCommand,
+    DepositUsecase,
+)
+
+
+@pytest.mark.django_db()
+class TestHomeSummary:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client):
+        self.client = client
+        self.url = reverse("bank-accounts:home")
+        self.usd = Currency.objects.create(symbol="USD")
+        self.eur = Currency.objects.create(symbol="EUR")
+        self.accounts = [
+            Account.objects.create(
+                name=f"test{i}", currency=self.usd, funds=Money.parse("10")
+            )
+            for i in range(3)
+        ]
+        Account.objects.create(
+            name="eur", currency=self.eur, funds=Money.parse("5")
+        )
+        summary_queries.invalidate()
+
+    def test_summary(self):
+        hot = self.accounts[0]
+        Account.objects.filter(pk=hot.pk).update(balance_slots=1)
+        AccountBalanceSlot.objects.create(
+            account=hot, slot=0, funds=Money.parse("7")
+        )
+
+        summary = summary_queries.get_summary()
+
+        assert summary.accounts_count == 4
+        assert [
+            (c.symbol, c.accounts, c.funds) for c in summary.currencies
+        ] == [
+            ("USD", 3, Money.parse("37")),
+            ("EUR", 1, Money.parse("5")),
+        ]
+
+    def test_summary_is_cached(self, django_assert_num_queries):
+        summary_queries.get_summary()
+
+        with django_assert_num_queries(0):
+            summary_queries.get_summary()
+
+    def test_usecases_invalidate_summary(self):
+        before = summary_queries.get_summary()
+
+        DepositUsecase().execute(
+            DepositCommand(
+                name="deposit",
+                to_account=self.accounts[1].pk,
+                currency=self.usd.pk,
+                value=Money.parse("1"),
+            )
+        )
+        after_deposit = summary_queries.get_summary()
+        AddAccountUsecase().execute(
+            AddAccountCommand(
+                name="new", description="", currency=self.eur.pk, funds=0
+            )
+        )
+        after_add = summary_queries.get_summary()
+
+        assert after_deposit.version != before.version
+        assert after_deposit.currencies[0].funds == Money.parse("31")
+        assert after_add.accounts_count == 5
+
+    def test_conditional_get(self):
+        resp = self.client.get(self.url)
+
+        assert resp.status_code == 200
+        assert resp["Cache-Control"] == "no-cache"
+
+        cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=resp["ETag"])
+        assert cached.status_code == 304
+
+        cached = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"]
+        )
+        assert cached.status_code == 304
+
+        summary_queries.invalidate()
+
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=resp["ETag"])
+        assert resp.status_code == 200
+
+    def test_write_by_other_worker_changes_etag(self):
+        resp = self.client.get(self.url)
+        # other worker deposits and bumps version through its own
+        # connection to shared cache
+        Account.objects.filter(pk=self.accounts[0].pk).update(
+            funds=Money.parse("20")
+        )
+        caches.create_connection("default").incr(
+            summary_queries.summary_cache.version_key
+        )
+
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=resp["ETag"])
+
+        assert resp.status_code == 200
+        assert resp.context["summary"].currencies[0].funds == Money.parse("40")
+
+    def test_lost_version_is_not_reused(self):
+        shared_cache = caches.create_connection("default")
+        shared_cache.clear()
+        resp = self.client.get(self.url)
+
+        shared_cache.clear()
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=resp["ETag"])
+
+        assert resp.status_code == 200
+
+    def test_etag_depends_on_page(self, monkeypatch):
+        monkeypatch.setattr(views, "ACCOUNTS_PAGE_SIZE", 2)
+
+        first = self.client.get(self.url)
+        second = self.client.get(
+            self.url, {"cursor": first.context["next_cursor"]}
+        )
+
+        assert first["ETag"] != second["ETag"]
+        assert [acc.name for acc in second.context["available_accounts"]] == [
+            "test2",
+            "eur",
+        ]
+
+    def test_query_count_does_not_grow_with_accounts(
+        self, django_assert_num_queries, monkeypatch
+    ):
+        monkeypatch.setattr(views, "ACCOUNTS_PAGE_SIZE", 2)
+        self.client.get(self.url)
+
+        with django_assert_num_queries(1):
+            resp = self.client.get(self.url)
+
+        assert len(resp.context["available_accounts"]) == 2
@@ -0,0 +1,194 @@
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+
+from ..exceptions import InvalidWithdrawAmountException
+from ..models import Account, AccountBalanceSlot, Currency, Transfer
+from ..money import Money
+from ..queries.balance_slots import BalanceSlotQueries
+from ..usecases import (
+    BatchTransferUsecase,
+    DepositCommand,
+    DepositUsecase,
+    FastTransferUsecase,
+    FastWithdrawUsecase,
+    SetBalanceSlotsCommand,
+    SetBalanceSlotsUsecase,
+    TransferCommand,
+    TransferUsecase,
+    WithdrawCommand,
+    WithdrawUsecase,
+)
+
+
+@pytest.mark.django_db()
+class TestHotAccounts:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client):
+        self.client = client
+        self.currency = Currency.objects.create(symbol="USD")
+        self.hot_account = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("100")
+        )
+        self.account = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("100")
+        )
+        SetBalanceSlotsUsecase().execute(
+            SetBalanceSlotsCommand(account=self.hot_account.id, slots=4)
+        )
+
+    def _balance(self, account):
+        account.refresh_from_db()
+        slots = AccountBalanceSlot.objects.filter(account=account)
+        return account.funds + sum(slot.funds for slot in slots)
+
+    def _withdraw_command(self, value):
+        return WithdrawCommand(
+            name="withdraw1",
+            from_account=self.hot_account.id,
+            currency=self.currency.id,
+            value=Money.parse(value),
+        )
+
+    def test_set_balance_slots_spreads_funds(self):
+        self.hot_account.refresh_from_db()
+
+        assert self.hot_account.balance_slots == 4
+        assert self.hot_account.funds == 0
+        assert (
+            list(
+                AccountBalanceSlot.objects.order_by("slot").values_list(
+                    "funds", flat=True
+                )
+            )
+            == [Money.parse("25")] * 4
+        )
+
+    def test_set_balance_slots_keeps_remainder(self):
+        Account.objects.filter(pk=self.account.pk).update(
+            funds=Money.parse("100.01")
+        )
+
+        SetBalanceSlotsUsecase().execute(
+            SetBalanceSlotsCommand(account=self.account.id, slots=3)
+        )
+
+        assert self._balance(self.account) == Money.parse("100.01")
+
+    def test_set_balance_slots_to_zero_folds_slots(self):
+        call_command("set_balance_slots", self.hot_account.id, slots=0)
+
+        self.hot_account.refresh_from_db()
+        assert self.hot_account.balance_slots == 0
+        assert self.hot_account.funds == Money.parse("100")
+        assert not AccountBalanceSlot.objects.exists()
+
+    @pytest.mark.parametrize(
+        "usecase_class", [WithdrawUsecase, FastWithdrawUsecase]
+    )
+    def test_withdraw_borrows_across_slots(self, usecase_class):
+        usecase_class().execute(self._withdraw_command("60"))
+
+        assert self._balance(self.hot_account) == Money.parse("40")
+        assert not AccountBalanceSlot.objects.filter(funds__lt=0).exists()
+
+    @pytest.mark.parametrize(
+        "usecase_class", [WithdrawUsecase, FastWithdrawUsecase]
+    )
+    def test_withdraw_more_than_balance(self, usecase_class):
+        with pytest.raises(InvalidWithdrawAmountException):
+            usecase_class().execute(self._withdraw_command("100.01"))
+
+        assert self._balance(self.hot_account) == Money.parse("100")
+        assert Transfer.objects.count() == 0
+
+    def test_deposit_to_hot_account(self):
+        command = DepositCommand(
+            name="deposit1",
+            to_account=self.hot_account.id,
+            currency=self.currency.id,
+            value=Money.parse("10"),
+        )
+
+        DepositUsecase().execute(command)
+
+        assert self._balance(self.hot_account) == Money.parse("110")
+
+    @pytest.mark.parametrize(
+        "usecase_class", [TransferUsecase, FastTransferUsecase]
+    )
+    def test_transfer_between_hot_and_regular_account(self, usecase_class):
+        usecase_class().execute(
+            TransferCommand(
+                name="transfer1",
+                from_account=self.account.id,
+                to_account=self.hot_account.id,
+                currency=self.currency.id,
+                value=Money.parse("30"),
+            )
+        )
+        usecase_class().execute(
+            TransferCommand(
+                name="transfer2",
+                from_account=self.hot_account.id,
+                to_account=self.account.id,
+                currency=self.currency.id,
+                value=Money.parse("120"),
+            )
+        )
+
+        assert self._balance(self.hot_account) == Money.parse("10")
+        assert self._balance(self.account) == Money.parse("190")
+
+    def test_home_shows_full_balance(self):
+        resp = self.client.get(reverse("bank-accounts:home"))
+
+        balances = {
+            acc.pk: acc.balance for acc in resp.context["available_accounts"]
+        }
+        assert balances[self.hot_account.id] == Money.parse("100")
+        assert balances[self.account.id] == Money.parse("100")
+
+    @pytest.mark.parametrize(
+        "usecase_class, command_class",
+        [
+            (WithdrawUsecase, WithdrawCommand),
+            (FastWithdrawUsecase, WithdrawCommand),
+            (TransferUsecase, TransferCommand),
+            (FastTransferUsecase, TransferCommand),
+            (BatchTransferUsecase, TransferCommand),
+        ],
+    )
+    def test_slots_drained_meanwhile_is_missing_funds(
+        self, monkeypatch, usecase_class, command_class
+    ):
+        debit = BalanceSlotQueries.debit
+
+        def drain_first(queries, account, value):
+            # other request withdraws almost everything in the meantime
+            AccountBalanceSlot.objects.filter(account_id=account.pk).update(
+                funds=Money.parse("1")
+            )
+            return debit(queries, account, value)
+
+        monkeypatch.setattr(BalanceSlotQueries, "debit", drain_first)
+        command = command_class(
+            name="withdraw1",
+            from_account=self.hot_account.id,
+            currency=self.currency.id,
+            value=Money.parse("60"),
+            **(
+                {"to_account": self.account.id}
+                if command_class is TransferCommand
+                else {}
+            ),
+        )
+
+        with pytest.raises(InvalidWithdrawAmountException):
+            if usecase_class is BatchTransferUsecase:
+                usecase_class().execute([command])
+            else:
+                usecase_class().execute(command)
+
+        assert not Transfer.objects.exists()
@@ -0,0 +1,190 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from ..exceptions import (
+    IdempotencyKeyConflictException,
+    InvalidDepositAmountException,
+)
+from ..models import Account, Currency, IdempotencyKey, Transfer
+from ..money import Money
+from ..usecases import (
+    BatchTransferUsecase,
+    DepositCommand,
+    DepositUsecase,
+    TransferCommand,
+    TransferUsecase,
+)
+from ..usecases.idempotency import idempotency_keys
+
+
+@pytest.mark.django_db()
+class TestIdempotencyKeys:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client):
+        self.client = client
+        idempotency_keys.clear_cache()
+        self.currency = Currency.objects.create(symbol="USD")
+        self.from_account = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("1000")
+        )
+        self.to_account = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("1000")
+        )
+        yield
+        idempotency_keys.clear_cache()
+
+    def _transfer_command(self, key, value="10"):
+        return TransferCommand(
+            name="transfer1",
+            from_account=self.from_account.id,
+            to_account=self.to_account.id,
+            currency=self.currency.id,
+            value=Money.parse(value),
+            idempotency_key=key,
+        )
+
+    def _assert_booked_once(self):
+        assert Transfer.objects.count() == 1
+        self.from_account.refresh_from_db()
+        self.to_account.refresh_from_db()
+        assert self.from_account.funds == Money.parse("990")
+        assert self.to_account.funds == Money.parse("1010")
+
+    @pytest.mark.parametrize("fast_path", [False, True])
+    def test_retried_post_is_booked_once(self, settings, fast_path):
+        settings.TRANSFER_FAST_PATH = fast_path
+        data = {
+            "name": "transfer1",
+            "from_account": self.from_account.id,
+            "to_account": self.to_account.id,
+            "currency": self.currency.id,
+            "value": "10",
+            "idempotency_key": "retried-key",
+        }
+        url = reverse("bank-accounts:transfer")
+
+        first = self.client.post(url, data=data)
+        second = self.client.post(url, data=data)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        self._assert_booked_once()
+
+    def test_replay_returns_original_transfer(self):
+        usecase = TransferUsecase()
+
+        original = usecase.execute(self._transfer_command("key-1"))
+        replayed = usecase.execute(self._transfer_command("key-1"))
+
+        assert replayed == original
+        self._assert_booked_once()
+
+    def test_replay_from_cache_does_not_touch_database(
+        self, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        usecase = TransferUsecase()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            original = usecase.execute(self._transfer_command("key-1"))
+
+        with django_assert_num_queries(0):
+            replayed = usecase.execute(self._transfer_command("key-1"))
+
+        assert replayed == original
+        self._assert_booked_once()
+
+    def test_failed_request_does_not_store_key(self):
+        command = DepositCommand(
+            name="deposit1",
+            to_account=self.to_account.id,
+            currency=self.currency.id,
+            value=Money.parse("-1"),
+            idempotency_key="key-1",
+        )
+
+        with pytest.raises(InvalidDepositAmountException):
+            DepositUsecase().execute(command)
+
+        assert not IdempotencyKey.objects.exists()
+
+    def test_batch_skips_replayed_commands(self):
+        TransferUsecase().execute(self._transfer_command("key-1"))
+        commands = [
+            self._transfer_command("key-1"),
+            self._transfer_command("key-2"),
+            self._transfer_command("key-2"),
+        ]
+
+        results = BatchTransferUsecase().execute(commands)
+
+        assert [r.replayed for r in results] == [True, False, True]
+        assert [r.applied for r in results] == [False, True, False]
+        assert Transfer.objects.count() == 2
+        assert IdempotencyKey.objects.count() == 2
+
+    @pytest.mark.parametrize("cached", [False, True])
+    def test_key_reused_for_other_payload_conflicts(
+        self, cached, django_capture_on_commit_callbacks
+    ):
+        usecase = TransferUsecase()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            usecase.execute(self._transfer_command("key-1"))
+
+        if not cached:
+            idempotency_keys.clear_cache()
+
+        with pytest.raises(IdempotencyKeyConflictException):
+            usecase.execute(self._transfer_command("key-1", value="20"))
+
+        with pytest.raises(IdempotencyKeyConflictException):
+            DepositUsecase().execute(
+                DepositCommand(
+                    name="transfer1",
+                    to_account=self.to_account.id,
+                    currency=self.currency.id,
+                    value=Money.parse("10"),
+                    idempotency_key="key-1",
+                )
+            )
+
+        self._assert_booked_once()
+
+    def test_batch_reports_conflicting_key(self):
+        TransferUsecase().execute(self._transfer_command("key-1"))
+        commands = [
+            self._transfer_command("key-1", value="20"),
+            self._transfer_command("key-2"),
+            self._transfer_command("key-2", value="20"),
+        ]
+
+        results = BatchTransferUsecase(skip_failed=True).execute(commands)
+
+        assert [r.applied for r in results] == [False, True, False]
+        assert isinstance(
+            results[0].exception, IdempotencyKeyConflictException
+        )
+        assert isinstance(
+            results[2].exception, IdempotencyKeyConflictException
+        )
+        assert Transfer.objects.count() == 2
+
+    def test_purge_expired_keys(self):
+        usecase = TransferUsecase()
+        usecase.execute(self._transfer_command("old-1"))
+        usecase.execute(self._transfer_command("old-2"))
+        usecase.execute(self._transfer_command("new-1"))
+        IdempotencyKey.objects.filter(key__startswith="old").update(
+            created_date=timezone.now() - timedelta(days=30)
+        )
+
+        call_command("purge_idempotency_keys", batch_size=1)
+
+        assert list(IdempotencyKey.objects.values_list("key", flat=True)) == [
+            "new-1"
+        ]
@@ -0,0 +1,148 @@
+import json
+
+from django.core.management import CommandError, call_command
+
+import pytest
+
+from ..models import Account, Currency, ImportJob, Transfer
+from ..money import Money
+
+
+@pytest.mark.django_db()
+class TestImportTransfersCommand:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account_1 = Account.objects.create(
+            name="test1", currency=self.currency, funds=0
+        )
+        self.account_2 = Account.objects.create(
+            name="test2", currency=self.currency, funds=0
+        )
+
+    def _rows(self):
+        return [
+            {
+                "type": "deposit",
+                "name": "deposit1",
+                "to_account": self.account_1.id,
+                "currency": self.currency.id,
+                "value": "100.00",
+            },
+            {
+                "type": "transfer",
+                "name": "transfer1",
+                "from_account": self.account_1.id,
+                "to_account": self.account_2.id,
+                "currency": self.currency.id,
+                "value": "40.50",
+            },
+            {
+                "type": "withdraw",
+                "name": "withdraw1",
+                "from_account": self.account_2.id,
+                "currency": self.currency.id,
+                "value": "10.25",
+            },
+        ]
+
+    def _write_csv(self, rows):
+        path = self.tmp_path / "movements.csv"
+        header = "type,name,from_account,to_account,currency,value"
+        lines = [header] + [
+            ",".join(str(row.get(key, "")) for key in header.split(","))
+            for row in rows
+        ]
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    def _write_ndjson(self, rows):
+        path = self.tmp_path / "movements.ndjson"
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+        return path
+
+    def _assert_funds(self, expected_1, expected_2):
+        self.account_1.refresh_from_db()
+        self.account_2.refresh_from_db()
+        assert self.account_1.funds == Money.parse(expected_1)
+        assert self.account_2.funds == Money.parse(expected_2)
+
+    @pytest.mark.parametrize("file_format", ["csv", "ndjson"])
+    def test_import(self, file_format):
+        writer = getattr(self, f"_write_{file_format}")
+        path = writer(self._rows())
+
+        call_command("import_transfers", str(path), chunk_size=2)
+
+        assert Transfer.objects.count() == 3
+        self._assert_funds("59.50", "30.25")
+        assert ImportJob.objects.get().rows_committed == 3
+
+    def test_import_resumes_after_last_committed_chunk(self):
+        path = self._write_csv(self._rows())
+        ImportJob.objects.create(name=str(path), rows_committed=1)
+        Account.objects.filter(pk=self.account_1.pk).update(
+            funds=Money.parse("100")
+        )
+
+        call_command("import_transfers", str(path))
+
+        assert Transfer.objects.count() == 2
+        self._assert_funds("59.50", "30.25")
+        assert ImportJob.objects.get().rows_committed == 3
+
+    def test_import_stops_on_invalid_chunk(self):
+        rows = self._rows()
+        rows[2]["value"] = "1000"
+        path = self._write_csv(rows)
+
+        with pytest.raises(CommandError):
+            call_command("import_transfers", str(path), chunk_size=2)
+
+        assert Transfer.objects.count() == 2
+        self._assert_funds("59.50", "40.50")
+        assert ImportJob.objects.get().rows_committed == 2
+
+    def test_import_skip_failed(self):
+        rows = self._rows()
+        rows[2]["value"] = "1000"
+        path = self._write_ndjson(rows)
+
+        call_command("import_transfers", str(path), skip_failed=True)
+
+        assert Transfer.objects.count() == 2
+        self._assert_funds("59.50", "40.50")
+        assert ImportJob.objects.get().rows_committed == 3
+
+    def _write_with_malformed_rows(self):
+        rows = self._rows()
+        rows[1]["from_account"] = "abc"
+        lines = [json.dumps(row) for row in rows]
+        lines.insert(1, '{"type": "deposit", "name": ')
+        path = self.tmp_path / "movements.ndjson"
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    def test_import_skip_failed_reports_malformed_rows(self, capsys):
+        path = self._write_with_malformed_rows()
+
+        call_command("import_transfers", str(path), skip_failed=True)
+
+        assert capsys.readouterr().err.splitlines() == [
+            "Row 2: invalid row",
+            "Row 3: invalid from_account 'abc'",
+            "Row 4: Withdraw amount cannot be higher than available funds",
+        ]
+        assert Transfer.objects.count() == 1
+        self._assert_funds("100", "0")
+        assert ImportJob.objects.get().rows_committed == 4
+
+    def test_import_stops_on_malformed_row(self):
+        path = self._write_with_malformed_rows()
+
+        with pytest.raises(CommandError):
+            call_command("import_transfers", str(path))
+
+        assert not Transfer.objects.exists()
+        assert ImportJob.objects.get().rows_committed == 0
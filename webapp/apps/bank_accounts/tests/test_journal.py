@@ -0,0 +1,154 @@
+from django.urls import reverse
+
+import pytest
+
+from ..exceptions import InvalidWithdrawAmountException
+from ..models import Account, AccountEntry, Currency
+from ..money import Money
+from ..queries import entry_queries
+from ..usecases import (
+    BatchTransferUsecase,
+    DepositCommand,
+    DepositUsecase,
+    FastTransferUsecase,
+    FastWithdrawUsecase,
+    SetBalanceSlotsCommand,
+    SetBalanceSlotsUsecase,
+    TransferCommand,
+    TransferUsecase,
+    WithdrawCommand,
+    WithdrawUsecase,
+)
+
+
+@pytest.mark.django_db()
+class TestAccountJournal:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account_1 = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("100")
+        )
+        self.account_2 = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("100")
+        )
+
+    def _commands(self):
+        return [
+            DepositCommand(
+                name="deposit1",
+                to_account=self.account_1.id,
+                currency=self.currency.id,
+                value=Money.parse("50"),
+            ),
+            TransferCommand(
+                name="transfer1",
+                from_account=self.account_1.id,
+                to_account=self.account_2.id,
+                currency=self.currency.id,
+                value=Money.parse("30"),
+            ),
+            WithdrawCommand(
+                name="withdraw1",
+                from_account=self.account_1.id,
+                currency=self.currency.id,
+                value=Money.parse("5.50"),
+            ),
+        ]
+
+    def _statement(self, account):
+        return [
+            (entry.transfer.name, entry.amount, entry.balance)
+            for entry in entry_queries.get_statement(account.id)
+        ]
+
+    def _assert_journal(self):
+        assert self._statement(self.account_1) == [
+            ("deposit1", Money.parse("50"), Money.parse("150")),
+            ("transfer1", Money.parse("-30"), Money.parse("120")),
+            ("withdraw1", Money.parse("-5.50"), Money.parse("114.50")),
+        ]
+        assert self._statement(self.account_2) == [
+            ("transfer1", Money.parse("30"), Money.parse("130")),
+        ]
+
+    @pytest.mark.parametrize("fast_path", [False, True])
+    def test_usecases_write_entries(self, fast_path):
+        deposit, transfer, withdraw = self._commands()
+
+        DepositUsecase().execute(deposit)
+        (FastTransferUsecase if fast_path else TransferUsecase)().execute(
+            transfer
+        )
+        (FastWithdrawUsecase if fast_path else WithdrawUsecase)().execute(
+            withdraw
+        )
+
+        self._assert_journal()
+
+    def test_batch_writes_entries(self):
+        BatchTransferUsecase().execute(self._commands())
+
+        self._assert_journal()
+
+    def test_failed_command_does_not_write_entries(self):
+        command = WithdrawCommand(
+            name="withdraw1",
+            from_account=self.account_1.id,
+            currency=self.currency.id,
+            value=Money.parse("1000"),
+        )
+
+        with pytest.raises(InvalidWithdrawAmountException):
+            WithdrawUsecase().execute(command)
+
+        assert not AccountEntry.objects.exists()
+
+    def test_hot_account_entries_have_no_balance(self):
+        SetBalanceSlotsUsecase().execute(
+            SetBalanceSlotsCommand(account=self.account_2.id, slots=2)
+        )
+
+        TransferUsecase().execute(self._commands()[1])
+
+        assert self._statement(self.account_1) == [
+            ("transfer1", Money.parse("-30"), Money.parse("70")),
+        ]
+        assert self._statement(self.account_2) == [
+            ("transfer1", Money.parse("30"), None),
+        ]
+
+    def test_statement_endpoint_pages(self, client, monkeypatch):
+        from .. import views
+
+        monkeypatch.setattr(views, "STATEMENT_PAGE_SIZE", 2)
+        BatchTransferUsecase().execute(self._commands())
+        url = reverse("bank-accounts:statement", args=[self.account_1.pk])
+
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert [
+            (row["name"], row["amount"], row["balance"])
+            for row in resp.json()["results"]
+        ] == [
+            ("deposit1", "50.00", "150.00"),
+            ("transfer1", "-30.00", "120.00"),
+        ]
+
+        resp = client.get(url, {"after": resp.json()["next_after"]})
+        assert [row["name"] for row in resp.json()["results"]] == ["withdraw1"]
+        assert resp.json()["next_after"] is None
+
+    @pytest.mark.parametrize(
+        "account, params, status",
+        [(None, {"after": "abc"}, 400), (999999, {}, 404)],
+    )
+    def test_statement_endpoint_errors(self, client, account, params, status):
+        resp = client.get(
+            reverse(
+                "bank-accounts:statement", args=[account or self.account_1.pk]
+            ),
+            params,
+        )
+
+        assert resp.status_code == status
@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+import pytest
+
+from ..forms import DepositForm
+from ..models import Account, Currency
+from ..money import MAX_MINOR_UNITS, Money
+
+
+class TestMoney:
+    @pytest.mark.parametrize(
+        "value, cents",
+        [
+            ("12.30", 1230),
+            ("12.3", 1230),
+            ("0.01", 1),
+            ("-5", -500),
+            (Decimal("7.25"), 725),
+            ("92233720368547758.07", MAX_MINOR_UNITS),
+        ],
+    )
+    def test_parse(self, value, cents):
+        assert Money.parse(value) == cents
+
+    @pytest.mark.parametrize(
+        "value", ["0.001", "abc", "NaN", "Infinity", "92233720368547758.08"]
+    )
+    def test_parse_rejects(self, value):
+        with pytest.raises(ValueError):
+            Money.parse(value)
+
+    @pytest.mark.parametrize(
+        "cents, text", [(1230, "12.30"), (5, "0.05"), (-105, "-1.05")]
+    )
+    def test_str(self, cents, text):
+        assert str(Money(cents)) == text
+
+    def test_arithmetic_is_integer(self):
+        assert Money(150) - Money(50) + 1 == 101
+
+
+@pytest.mark.django_db()
+class TestMoneyField:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+
+    def test_round_trip(self):
+        account = Account.objects.create(
+            name="test1", currency=self.currency, funds=MAX_MINOR_UNITS
+        )
+        account.refresh_from_db()
+
+        assert isinstance(account.funds, Money)
+        assert account.funds == MAX_MINOR_UNITS
+
+    def test_decimal_is_rejected(self):
+        with pytest.raises(TypeError):
+            Account.objects.create(
+                name="test1", currency=self.currency, funds=Decimal("1.50")
+            )
+
+
+@pytest.mark.django_db()
+class TestMoneyAmountField:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        currency = Currency.objects.create(symbol="USD")
+        self.data = {
+            "name": "deposit1",
+            "to_account": Account.objects.create(
+                name="test1", currency=currency
+            ).pk,
+            "currency": currency.pk,
+        }
+
+    @pytest.mark.parametrize(
+        "value, error",
+        [
+            ("abc", "Enter a number."),
+            ("1.234", "Ensure that there are no more than 2 decimal places."),
+            ("1" * 20, "Amount is too large."),
+        ],
+    )
+    def test_invalid(self, value, error):
+        form = DepositForm({**self.data, "value": value})
+
+        assert not form.is_valid()
+        assert form.errors["value"] == [error]
+
+    def test_cleaned_to_money(self):
+        form = DepositForm({**self.data, "value": "10.5"})
+
+        assert form.is_valid(), form.errors
+        assert form.cleaned_data["value"] == Money(1050)
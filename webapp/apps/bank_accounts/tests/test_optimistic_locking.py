@@ -0,0 +1,114 @@
+from django.db.models import F
+from django.urls import reverse
+
+import pytest
+
+from ..exceptions import ConcurrentUpdateException
+from ..models import Account, Currency, Transfer
+from ..money import Money
+from ..queries import account_queries
+from ..usecases import DepositCommand, DepositUsecase
+from ..usecases.base import write_stats
+from . import test_deposits, test_transfers, test_withdrawals
+
+
+class TestOptimisticDeposits(test_deposits.TestDepositsUsecases):
+    @pytest.fixture(autouse=True, scope="function")
+    def _optimistic(self, settings):
+        settings.OPTIMISTIC_LOCKING = True
+
+
+class TestOptimisticWithdrawals(test_withdrawals.TestWithdrawalsUsecases):
+    @pytest.fixture(autouse=True, scope="function")
+    def _optimistic(self, settings):
+        settings.OPTIMISTIC_LOCKING = True
+
+
+class TestOptimisticTransfers(test_transfers.TestTransfersUsecases):
+    @pytest.fixture(autouse=True, scope="function")
+    def _optimistic(self, settings):
+        settings.OPTIMISTIC_LOCKING = True
+
+
+@pytest.mark.django_db()
+class TestOptimisticConflicts:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client, settings, monkeypatch):
+        settings.OPTIMISTIC_LOCKING = True
+        settings.OPTIMISTIC_LOCKING_RETRIES = 2
+        settings.OPTIMISTIC_LOCKING_RETRY_DELAY = 0
+        write_stats.reset()
+        self.client = client
+        self.monkeypatch = monkeypatch
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("100")
+        )
+        self.command = DepositCommand(
+            name="deposit1",
+            to_account=self.account.id,
+            currency=self.currency.id,
+            value=Money.parse("10"),
+        )
+
+    def _interleave_writes(self, times):
+        # simulated concurrent write runs inside usecase savepoint, so it
+        # is rolled back together with the attempt which lost the race
+        get_many = account_queries.get_many
+        remaining = [times]
+
+        def get_many_and_write_concurrently(*ids):
+            accounts = get_many(*ids)
+
+            if remaining[0]:
+                remaining[0] -= 1
+                Account.objects.filter(pk__in=ids).update(
+                    funds=F("funds") + Money.parse("5"),
+                    version=F("version") + 1,
+                )
+
+            return accounts
+
+        self.monkeypatch.setattr(
+            account_queries, "get_many", get_many_and_write_concurrently
+        )
+
+    def test_conflict_is_retried(self):
+        self._interleave_writes(times=1)
+
+        DepositUsecase().execute(self.command)
+
+        self.account.refresh_from_db()
+        assert self.account.funds == Money.parse("110")
+        assert self.account.version == 1
+        assert Transfer.objects.count() == 1
+        assert write_stats.snapshot()["DepositUsecase"] == {
+            "attempts": 2,
+            "conflicts": 1,
+            "retries": 1,
+        }
+
+    def test_conflict_retries_are_bounded(self):
+        self._interleave_writes(times=3)
+
+        with pytest.raises(ConcurrentUpdateException):
+            DepositUsecase().execute(self.command)
+
+        self.account.refresh_from_db()
+        assert self.account.funds == Money.parse("100")
+        assert Transfer.objects.count() == 0
+        assert write_stats.snapshot()["DepositUsecase"] == {
+            "attempts": 3,
+            "conflicts": 3,
+            "retries": 2,
+            "failures": 1,
+        }
+
+    def test_write_stats_view(self):
+        self._interleave_writes(times=1)
+        DepositUsecase().execute(self.command)
+
+        resp = self.client.get(reverse("bank-accounts:write-stats"))
+
+        assert resp.status_code == 200
+        assert resp.json()["DepositUsecase"]["conflicts"] == 1
@@ -0,0 +1,188 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from .. import views
+from ..models import Account, Currency, Transfer
+from ..money import Money
+from ..queries import transfer_queries
+from ..queries.pagination import (
+    PREVIOUS,
+    decode_cursor,
+    decode_date_cursor,
+    encode_cursor,
+)
+from .utils import create_transfer
+
+
+@pytest.mark.django_db()
+class TestKeysetPagination:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client):
+        self.client = client
+        self.url = reverse("bank-accounts:history")
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account_1 = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("1000")
+        )
+        self.account_2 = Account.objects.create(
+            name="test2", currency=self.currency, funds=Money.parse("1000")
+        )
+        self.transfers = [
+            create_transfer(
+                name=f"transfer_{i}",
+                from_account=self.account_1 if i % 2 else None,
+                to_account=self.account_2,
+                currency=self.currency,
+                value=1,
+            )
+            for i in range(7)
+        ]
+
+    def _walk(self, limit, account=None):
+        pages = []
+        page = transfer_queries.get_row_page(limit, account=account)
+        pages.append(page)
+
+        while page.next_cursor:
+            page = transfer_queries.get_row_page(
+                limit, cursor=page.next_cursor, account=account
+            )
+            pages.append(page)
+
+        return pages
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor("2022-01-01T00:00:00+00:00", 5)
+
+        assert decode_cursor(cursor, str, int) == [
+            "2022-01-01T00:00:00+00:00",
+            5,
+        ]
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not a cursor",
+            "bnVsbA==",
+            "e30=",
+            encode_cursor(1, 2),
+            encode_cursor("2022-01-01T00:00:00+00:00"),
+            encode_cursor("2022-01-01T00:00:00+00:00", "5"),
+            encode_cursor("2022-01-01T00:00:00+00:00", True),
+        ],
+    )
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, str, int)
+
+    @pytest.mark.parametrize(
+        "transfer_date",
+        ["garbage", "2022-01-01T00:00:00", "2022-02-30T00:00:00+00:00"],
+    )
+    def test_invalid_date_cursor(self, transfer_date):
+        with pytest.raises(ValueError):
+            decode_date_cursor(encode_cursor(transfer_date, 1))
+
+    def _pks(self, transfers):
+        return [transfer.pk for transfer in transfers]
+
+    def test_walk_forward(self):
+        pages = self._walk(3)
+
+        assert [len(page.items) for page in pages] == [3, 3, 1]
+        assert self._pks(t for page in pages for t in page.items) == (
+            self._pks(self.transfers)
+        )
+        assert pages[0].previous_cursor is None
+        assert pages[-1].next_cursor is None
+
+    def test_walk_backward(self):
+        last = self._walk(3)[-1]
+
+        page = transfer_queries.get_row_page(
+            3, cursor=last.previous_cursor, direction=PREVIOUS
+        )
+        assert self._pks(page.items) == self._pks(self.transfers[3:6])
+        assert page.next_cursor is not None
+
+        page = transfer_queries.get_row_page(
+            3, cursor=page.previous_cursor, direction=PREVIOUS
+        )
+        assert self._pks(page.items) == self._pks(self.transfers[:3])
+        assert page.previous_cursor is None
+
+    def test_same_transfer_date_is_ordered_by_id(self):
+        Transfer.objects.update(transfer_date=timezone.now())
+
+        pages = self._walk(2)
+
+        assert self._pks(t for page in pages for t in page.items) == (
+            self._pks(self.transfers)
+        )
+
+    def test_walk_account(self):
+        pages = self._walk(2, account=self.account_1.pk)
+
+        assert self._pks(t for page in pages for t in page.items) == (
+            self._pks(self.transfers[1::2])
+        )
+        assert [len(page.items) for page in pages] == [2, 1]
+
+    def test_deep_page_costs_single_query(self):
+        cursor = self._walk(3)[1].next_cursor
+
+        with CaptureQueriesContext(connection) as queries:
+            transfer_queries.get_row_page(3, cursor=cursor)
+
+        assert len(queries) == 1
+
+    def test_view_pages(self, monkeypatch):
+        monkeypatch.setattr(views, "HISTORY_PAGE_SIZE", 3)
+
+        resp = self.client.get(self.url)
+        first = resp.context_data["transfers"]
+        next_cursor = resp.context_data["next_cursor"]
+
+        resp = self.client.get(self.url, {"cursor": next_cursor})
+
+        assert resp.status_code == 200
+        assert resp.context_data["transfers"] != first
+        assert resp.context_data["previous_cursor"] is not None
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "broken",
+            encode_cursor(1, 2),
+            encode_cursor("garbage", 1),
+            encode_cursor("2022-01-01T00:00:00", 1),
+        ],
+    )
+    @pytest.mark.parametrize("direction", ["next", PREVIOUS])
+    def test_view_invalid_cursor_shows_first_page(self, cursor, direction):
+        resp = self.client.get(
+            self.url, {"cursor": cursor, "direction": direction}
+        )
+
+        assert resp.status_code == 200
+        assert [t.pk for t in resp.context_data["transfers"]] == [
+            t.pk for t in self.transfers
+        ]
+        assert resp.context_data["previous_cursor"] is None
+
+    @pytest.mark.parametrize(
+        "cursor", [encode_cursor(1, 2), encode_cursor("garbage", 1)]
+    )
+    def test_view_invalid_account_cursor_shows_first_page(self, cursor):
+        resp = self.client.get(
+            self.url, {"cursor": cursor, "by_account": self.account_1.pk}
+        )
+
+        assert resp.status_code == 200
+        assert [t.pk for t in resp.context_data["transfers"]] == [
+            t.pk for t in self.transfers[1::2]
+        ]
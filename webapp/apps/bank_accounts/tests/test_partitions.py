@@ -0,0 +1,136 @@
+import json
+from datetime import date, timedelta
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.utils import timezone
+
+import pytest
+
+from ..archive import transfer_archive
+from ..models import Account, Currency, Transfer
+from ..partitions import (
+    add_months,
+    create_partitions,
+    current_month,
+    get_partitions,
+    is_partitioned,
+    partition_month,
+    partition_name,
+)
+from ..queries import transfer_queries
+from .utils import create_transfer
+
+
+@pytest.mark.parametrize(
+    "month, count, expected",
+    [
+        (date(2022, 1, 1), 1, date(2022, 2, 1)),
+        (date(2022, 12, 1), 1, date(2023, 1, 1)),
+        (date(2022, 1, 1), -1, date(2021, 12, 1)),
+        (date(2022, 5, 1), 27, date(2024, 8, 1)),
+    ],
+)
+def test_add_months(month, count, expected):
+    assert add_months(month, count) == expected
+
+
+def test_partition_name_round_trip():
+    name = partition_name(date(2022, 3, 1))
+
+    assert name == "bank_accounts_transfer_p2022_03"
+    assert partition_month(name) == date(2022, 3, 1)
+
+
+@pytest.mark.django_db()
+def test_partitioning_needs_postgresql():
+    if connection.vendor == "postgresql":
+        pytest.skip("Checks behaviour on other databases")
+
+    assert not is_partitioned()
+
+    with pytest.raises(CommandError):
+        call_command("partition_transfers")
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="Partitioning needs PostgreSQL",
+)
+@pytest.mark.django_db(transaction=True)
+class TestPartitionedTransfers:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+        self.account = Account.objects.create(
+            name="test1", currency=self.currency
+        )
+
+        # test database stays partitioned once converted
+        if not is_partitioned():
+            call_command("partition_transfers", "--convert", "--ahead", "2")
+
+        call_command("partition_transfers", "--ahead", "2")
+        create_partitions(
+            add_months(current_month(), -4), add_months(current_month(), -3)
+        )
+        self.old = create_transfer(
+            name="old",
+            to_account=self.account,
+            currency=self.currency,
+            value=1,
+        )
+        # moves row to partition of its new month
+        Transfer.objects.filter(pk=self.old.pk).update(
+            transfer_date=timezone.now() - timedelta(days=100)
+        )
+        self.new = create_transfer(
+            name="new",
+            to_account=self.account,
+            currency=self.currency,
+            value=2,
+        )
+
+    def test_rows_and_partitions(self):
+        assert is_partitioned()
+        assert set(Transfer.objects.values_list("name", flat=True)) == {
+            "old",
+            "new",
+        }
+        assert get_partitions()[-1] == add_months(current_month(), 2)
+
+    def test_new_transfers_get_ids(self):
+        transfer = create_transfer(
+            name="after",
+            to_account=self.account,
+            currency=self.currency,
+            value=3,
+        )
+
+        assert transfer.pk > self.new.pk
+
+    def test_date_bounded_query_prunes_partitions(self):
+        queryset = transfer_queries.get_by_account(
+            self.account.pk, after=timezone.now() - timedelta(days=1)
+        )
+        sql, params = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            (plan,) = cursor.fetchone()
+
+        plan = json.dumps(plan)
+        assert partition_name(current_month()) in plan
+        assert partition_name(add_months(current_month(), -3)) not in plan
+
+    def test_archive(self, settings, tmp_path):
+        settings.TRANSFER_ARCHIVE_DIR = str(tmp_path)
+        call_command("archive_transfers", "--months", "1")
+
+        assert list(Transfer.objects.values_list("name", flat=True)) == ["new"]
+        assert transfer_archive.months()
+        assert get_partitions()[0] >= add_months(current_month(), -1)
+        assert [row.name for row in transfer_queries.iter_rows()] == [
+            "old",
+            "new",
+        ]
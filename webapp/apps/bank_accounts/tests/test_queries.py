@@ -1,8 +1,8 @@
 import pytest
 
-from ..models import Account, Currency, Transfer
+from ..models import Account, Currency
 from ..queries import currency_queries, transfer_queries
-from .utils import generate_fake_money_value
+from .utils import create_transfer, generate_fake_money_value
 
 
 @pytest.mark.django_db()
@@ -34,33 +34,33 @@ class TestTransferQueries:
         curr = Currency.objects.create(symbol="USD")
         acc1 = Account.objects.create(name="account 1", currency=curr)
         acc2 = Account.objects.create(name="account 2", currency=curr)
-        self.trans1 = Transfer.objects.create(
+        self.trans1 = create_transfer(
             name="trx1",
             currency=curr,
             from_account=acc1,
             value=generate_fake_money_value(),
         )
-        self.trans2 = Transfer.objects.create(
+        self.trans2 = create_transfer(
             name="trx2",
             currency=curr,
             to_account=acc1,
             value=generate_fake_money_value(),
         )
-        self.trans3 = Transfer.objects.create(
+        self.trans3 = create_transfer(
             name="trx3",
             currency=curr,
             from_account=acc1,
             to_account=acc2,
             value=generate_fake_money_value(),
         )
-        self.trans4 = Transfer.objects.create(
+        self.trans4 = create_transfer(
             name="trx4",
             currency=curr,
             from_account=acc2,
             to_account=acc1,
             value=generate_fake_money_value(),
         )
-        self.trans5 = Transfer.objects.create(
+        self.trans5 = create_transfer(
             name="trx5",
             currency=curr,
             from_account=acc2,
@@ -69,11 +69,23 @@ class TestTransferQueries:
         )
         self.filter_by = acc1
 
-    def test_get_filtered_by_account(self):
-        transfers = self.query.get_filtered_by_account(self.filter_by)
+    def test_get_by_account(self):
+        transfers = self.query.get_by_account(self.filter_by)
         assert list(transfers) == [
             self.trans1,
             self.trans2,
             self.trans3,
             self.trans4,
         ]
+
+    def test_get_by_account_window(self):
+        after = self.trans1.transfer_date
+        until = self.trans3.transfer_date
+
+        transfers = self.query.get_by_account(self.filter_by, after, until)
+
+        assert list(transfers) == [self.trans2, self.trans3]
+
+    def test_get_by_account_lists_self_transfer_once(self):
+        transfers = self.query.get_by_account(self.trans5.to_account_id)
+        assert list(transfers).count(self.trans5) == 1
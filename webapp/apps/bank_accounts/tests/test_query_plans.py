@@ -0,0 +1,95 @@
+import json
+
+from django.db import connection
+
+import pytest
+
+from ..models import Account, Currency, Transfer
+from ..queries import transfer_queries
+
+SEEDED_TRANSFERS = 20_000
+SEEDED_ACCOUNTS = 1_000
+
+
+def plan_nodes(plan):
+    yield plan
+
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="Query plans are only checked on PostgreSQL",
+)
+@pytest.mark.django_db()
+class TestPerAccountHistoryPlan:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        currency = Currency.objects.create(symbol="USD")
+        Account.objects.bulk_create(
+            Account(name=f"account {i}", currency=currency)
+            for i in range(SEEDED_ACCOUNTS)
+        )
+        first, last = (
+            Account.objects.order_by("pk").values_list("pk", flat=True)[0],
+            Account.objects.order_by("-pk").values_list("pk", flat=True)[0],
+        )
+        self.account = first + SEEDED_ACCOUNTS // 2
+        span = last - first + 1
+        table = Transfer._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table}
+                    (name, from_account_id, to_account_id, currency_id,
+                     value, transfer_date)
+                SELECT
+                    'seed',
+                    %(first)s + (i::bigint * 7919) %% %(span)s,
+                    %(first)s + (i::bigint * 104729 + 1) %% %(span)s,
+                    %(currency)s,
+                    1,
+                    now() - i * interval '1 second'
+                FROM generate_series(1, %(rows)s) AS i
+                """,
+                {
+                    "first": first,
+                    "span": span,
+                    "currency": currency.pk,
+                    "rows": SEEDED_TRANSFERS,
+                },
+            )
+            cursor.execute(f"ANALYZE {table}")
+
+    def _explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            # small seeded table would be read sequentially anyway, with
+            # sequential scans priced out plan uses index only when it
+            # serves query
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            (plan,) = cursor.fetchone()
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return list(plan_nodes(plan[0]["Plan"]))
+
+    def test_get_by_account_uses_index_range_scans(self):
+        nodes = self._explain(transfer_queries.get_by_account(self.account))
+
+        scans = [
+            node
+            for node in nodes
+            if node.get("Relation Name") == Transfer._meta.db_table
+        ]
+        assert scans
+        assert not [n for n in scans if n["Node Type"] == "Seq Scan"]
+        assert {n.get("Index Name") for n in nodes} >= {
+            "transfer_from_date_id_idx",
+            "transfer_to_date_id_idx",
+        }
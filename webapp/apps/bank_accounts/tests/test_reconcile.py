@@ -0,0 +1,98 @@
+from django.core.management import CommandError, call_command
+
+import pytest
+
+from ..models import Account, AccountBalanceSlot, Currency
+from ..money import Money
+from ..queries import balance_queries
+from ..usecases import (
+    AddAccountCommand,
+    AddAccountUsecase,
+    DepositCommand,
+    DepositUsecase,
+    TransferCommand,
+    TransferUsecase,
+)
+
+
+@pytest.mark.django_db()
+class TestReconcile:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self):
+        self.currency = Currency.objects.create(symbol="USD")
+
+        for name in ("test1", "test2", "test3"):
+            AddAccountUsecase().execute(
+                AddAccountCommand(
+                    name=name,
+                    description="",
+                    currency=self.currency.pk,
+                    funds=Money.parse("100"),
+                )
+            )
+
+        self.account_1, self.account_2, self.account_3 = (
+            Account.objects.order_by("pk")
+        )
+        DepositUsecase().execute(
+            DepositCommand(
+                name="deposit1",
+                to_account=self.account_1.pk,
+                currency=self.currency.pk,
+                value=Money.parse("20"),
+            )
+        )
+        TransferUsecase().execute(
+            TransferCommand(
+                name="transfer1",
+                from_account=self.account_1.pk,
+                to_account=self.account_2.pk,
+                currency=self.currency.pk,
+                value=Money.parse("50"),
+            )
+        )
+
+    def _reconcile(self, *args):
+        call_command("reconcile", "--workers", "0", "--range-size", "2", *args)
+
+    def test_ledger(self):
+        ledger = balance_queries.get_ledger(
+            "in", [self.account_1.pk, self.account_2.pk]
+        )
+
+        assert [(b.balance, b.expected, b.transfers) for b in ledger] == [
+            (Money.parse("70"), Money.parse("70"), 2),
+            (Money.parse("150"), Money.parse("150"), 1),
+        ]
+
+    def test_balanced_accounts_pass(self):
+        self._reconcile()
+
+    def test_drift_is_reported(self):
+        Account.objects.filter(pk=self.account_2.pk).update(
+            funds=Money.parse("140")
+        )
+
+        with pytest.raises(CommandError, match="1 accounts out of balance"):
+            self._reconcile()
+
+    def test_repair(self):
+        Account.objects.filter(pk=self.account_2.pk).update(
+            funds=Money.parse("140")
+        )
+        Account.objects.filter(pk=self.account_3.pk).update(
+            funds=Money.parse("10"), balance_slots=1
+        )
+        AccountBalanceSlot.objects.create(
+            account=self.account_3, slot=0, funds=Money.parse("95")
+        )
+
+        self._reconcile("--repair")
+
+        account_2, account_3 = Account.objects.filter(
+            pk__in=[self.account_2.pk, self.account_3.pk]
+        ).order_by("pk")
+        assert account_2.funds == Money.parse("150")
+        assert account_2.version == self.account_2.version + 2
+        assert account_3.funds == Money.parse("5")
+        self._reconcile()
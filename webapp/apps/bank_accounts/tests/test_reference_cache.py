@@ -0,0 +1,114 @@
+from django.urls import reverse
+
+import pytest
+
+from ..exceptions import InvalidTransferCurrencyException
+from ..models import Account, Currency
+from ..money import Money
+from ..queries import account_queries, currency_queries
+from ..usecases import (
+    AddCurrencyCommand,
+    AddCurrencyUsecase,
+    DepositCommand,
+    DepositUsecase,
+    SetBalanceSlotsCommand,
+    SetBalanceSlotsUsecase,
+)
+
+
+@pytest.mark.django_db()
+class TestReferenceCache:
+    @pytest.fixture(autouse=True, scope="function")
+    def _prepare(self, client):
+        self.client = client
+        self.currency = Currency.objects.create(symbol="USD")
+        self.other_currency = Currency.objects.create(symbol="EUR")
+        self.account = Account.objects.create(
+            name="test1", currency=self.currency, funds=Money.parse("100")
+        )
+
+    def _deposit(self, currency, value="10"):
+        return DepositCommand(
+            name="deposit1",
+            to_account=self.account.id,
+            currency=currency.id,
+            value=Money.parse(value),
+        )
+
+    def test_get_by_id_is_cached(self, django_assert_num_queries):
+        before = currency_queries.cache.stats()
+
+        with django_assert_num_queries(1):
+            first = currency_queries.get_by_id(self.currency.id)
+            second = currency_queries.get_by_id(self.currency.id)
+
+        assert first == second == self.currency
+        after = currency_queries.cache.stats()
+        assert after["hits"] - before["hits"] == 1
+        assert after["misses"] - before["misses"] == 1
+
+    def test_missing_rows_are_not_cached(self):
+        with pytest.raises(Currency.DoesNotExist):
+            currency_queries.get_by_id(0)
+
+        with pytest.raises(Account.DoesNotExist):
+            account_queries.get_metadata(0)
+
+    def test_add_currency_invalidates_cache(self):
+        assert currency_queries.get_all() == [
+            self.currency,
+            self.other_currency,
+        ]
+
+        AddCurrencyUsecase().execute(AddCurrencyCommand(symbol="PLN"))
+
+        assert [c.symbol for c in currency_queries.get_all()] == [
+            "USD",
+            "EUR",
+            "PLN",
+        ]
+
+    def test_entries_expire(self, monkeypatch, django_assert_num_queries):
+        monkeypatch.setattr(currency_queries.cache, "ttl", 0)
+
+        with django_assert_num_queries(2):
+            currency_queries.get_by_id(self.currency.id)
+            currency_queries.get_by_id(self.currency.id)
+
+    def test_invalid_currency_is_rejected_without_query(
+        self, django_assert_num_queries
+    ):
+        currency_queries.get_by_id(self.other_currency.id)
+        account_queries.get_metadata(self.account.id)
+
+        with django_assert_num_queries(0):
+            with pytest.raises(InvalidTransferCurrencyException):
+                DepositUsecase().execute(self._deposit(self.other_currency))
+
+    def test_funds_are_read_fresh(self):
+        DepositUsecase().execute(self._deposit(self.currency))
+        Account.objects.filter(pk=self.account.pk).update(
+            funds=Money.parse("500")
+        )
+
+        DepositUsecase().execute(self._deposit(self.currency))
+
+        self.account.refresh_from_db()
+        assert self.account.funds == Money.parse("510")
+
+    def test_set_balance_slots_invalidates_metadata(self):
+        assert account_queries.get_metadata(self.account.id).balance_slots == 0
+
+        SetBalanceSlotsUsecase().execute(
+            SetBalanceSlotsCommand(account=self.account.id, slots=2)
+        )
+
+        assert account_queries.get_metadata(self.account.id).balance_slots == 2
+
+    def test_cache_stats_view(self):
+        currency_queries.get_by_id(self.currency.id)
+
+        resp = self.client.get(reverse("bank-accounts:cache-stats"))
+
+        assert resp.status_code == 200
+        assert resp.json()["currencies"] == currency_queries.cache.stats()
@@ -1,11 +1,10 @@
-from decimal import Decimal
-
 from django.urls import reverse
 
 import pytest
 
 from ..models import Account, Currency, Transfer
-from .utils import funds_to_decimal, generate_fake_money_value
+from ..money import Money
+from .utils import funds_to_money, generate_fake_money_value
 
 
 @pytest.mark.django_db()
@@ -19,13 +18,13 @@ class TestTransfersUsecases:
             name="test1",
             description="desc1",
             currency=self.currency,
-            funds=1000,
+            funds=Money.parse("1000"),
         )
         self.to_account = Account.objects.create(
             name="test2",
             description="desc2",
             currency=self.currency,
-            funds=1000,
+            funds=Money.parse("1000"),
         )
 
     def _assert_error(
@@ -52,10 +51,10 @@ class TestTransfersUsecases:
             "currency": self.currency.id,
             "value": generate_fake_money_value(),
         }
-        expected_from_funds = self.from_account.funds - funds_to_decimal(
+        expected_from_funds = self.from_account.funds - funds_to_money(
             data["value"]
         )
-        expected_to_funds = self.to_account.funds + funds_to_decimal(
+        expected_to_funds = self.to_account.funds + funds_to_money(
             data["value"]
         )
 
@@ -68,7 +67,7 @@ class TestTransfersUsecases:
         assert all_transfers[0].from_account == self.from_account
         assert all_transfers[0].to_account == self.to_account
         assert all_transfers[0].currency == self.currency
-        assert all_transfers[0].value == Decimal(str(data["value"]))
+        assert all_transfers[0].value == Money.parse(data["value"])
         self.from_account.refresh_from_db()
         self.to_account.refresh_from_db()
         assert self.from_account.funds == expected_from_funds
@@ -89,7 +88,7 @@ class TestTransfersUsecases:
             "currency": self.currency.id,
             "value": generate_fake_money_value(),
         }
-        sum_values = funds_to_decimal(data_1["value"]) + funds_to_decimal(
+        sum_values = funds_to_money(data_1["value"]) + funds_to_money(
             data_2["value"]
         )
         expected_from_funds = self.from_account.funds - sum_values
@@ -105,12 +104,12 @@ class TestTransfersUsecases:
         assert all_transfers[0].from_account == self.from_account
         assert all_transfers[0].to_account == self.to_account
         assert all_transfers[0].currency == self.currency
-        assert all_transfers[0].value == funds_to_decimal(data_1["value"])
+        assert all_transfers[0].value == funds_to_money(data_1["value"])
         assert all_transfers[1].name == data_2["name"]
         assert all_transfers[1].from_account == self.from_account
         assert all_transfers[0].to_account == self.to_account
         assert all_transfers[1].currency == self.currency
-        assert all_transfers[1].value == funds_to_decimal(data_2["value"])
+        assert all_transfers[1].value == funds_to_money(data_2["value"])
         self.from_account.refresh_from_db()
         self.to_account.refresh_from_db()
         assert self.from_account.funds == expected_from_funds
@@ -210,7 +209,7 @@ class TestTransfersUsecases:
             name="test3",
             description="desc3",
             currency=another_currency,
-            funds=1000,
+            funds=Money.parse("1000"),
         )
         data = {
             "name": "withdraw1",
@@ -239,7 +238,7 @@ class TestTransfersUsecases:
             name="test3",
             description="desc3",
             currency=another_currency,
-            funds=1000,
+            funds=Money.parse("1000"),
         )
         data = {
             "name": "withdraw1",
@@ -1,11 +1,10 @@
-from decimal import Decimal
-
 from django.urls import reverse
 
 import pytest
 
 from ..models import Account, Currency, Transfer
-from .utils import funds_to_decimal, generate_fake_money_value
+from ..money import Money
+from .utils import funds_to_money, generate_fake_money_value
 
 
 @pytest.mark.django_db()
@@ -19,7 +18,7 @@ class TestWithdrawalsUsecases:
             name="test1",
             description="desc1",
             currency=self.currency,
-            funds=1000,
+            funds=Money.parse("1000"),
         )
 
     def _assert_error(self, resp, expected_errors, expected_funds):
@@ -41,7 +40,7 @@ class TestWithdrawalsUsecases:
             "currency": self.currency.id,
             "value": generate_fake_money_value(),
         }
-        expected_funds = self.account.funds - funds_to_decimal(data["value"])
+        expected_funds = self.account.funds - funds_to_money(data["value"])
 
         resp = self.client.post(self.url, data=data)
 
@@ -52,7 +51,7 @@ class TestWithdrawalsUsecases:
         assert all_transfers[0].from_account == self.account
         assert all_transfers[0].to_account is None
         assert all_transfers[0].currency == self.currency
-        assert all_transfers[0].value == Decimal(str(data["value"]))
+        assert all_transfers[0].value == Money.parse(data["value"])
         self.account.refresh_from_db()
         assert self.account.funds == expected_funds
 
@@ -64,7 +63,7 @@ class TestWithdrawalsUsecases:
             "value": generate_fake_money_value(),
         }
         expected_funds = self.account.funds - (
-            Decimal(str(data["value"])) + funds_to_decimal(data["value"])
+            Money.parse(data["value"]) + funds_to_money(data["value"])
         )
 
         self.client.post(self.url, data=data)
@@ -77,11 +76,11 @@ class TestWithdrawalsUsecases:
         assert all_transfers[0].from_account == self.account
         assert all_transfers[0].to_account is None
         assert all_transfers[0].currency == self.currency
-        assert all_transfers[0].value == Decimal(str(data["value"]))
+        assert all_transfers[0].value == Money.parse(data["value"])
         assert all_transfers[1].name == data["name"]
         assert all_transfers[1].from_account == self.account
         assert all_transfers[1].currency == self.currency
-        assert all_transfers[1].value == Decimal(str(data["value"]))
+        assert all_transfers[1].value == Money.parse(data["value"])
         self.account.refresh_from_db()
         assert self.account.funds == expected_funds
 
@@ -1,11 +1,22 @@
 import random
-from decimal import Decimal
 
+from ..models import Transfer
+from ..money import Money
+from ..usecases.journal import write_journal
 
-def funds_to_decimal(value):
-    return Decimal(str(value))
+
+def funds_to_money(value):
+    return Money.parse(value)
 
 
 def generate_fake_money_value():
-    rand_value = str(round(random.uniform(0.01, 100), 2))
-    return Decimal(rand_value)
+    return Money(random.randint(1, 10000))
+
+
+def create_transfer(**kwargs):
+    """
+    Create transfer together with its journal entries, as usecases do.
+    """
+    transfer = Transfer.objects.create(**kwargs)
+    write_journal(transfer)
+    return transfer
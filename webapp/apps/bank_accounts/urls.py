@@ -1,13 +1,21 @@
 from django.urls import path
 
 from .views import (
+    AccountAutocompleteView,
     AddAccountView,
     AddCurrencyView,
+    AnalyticsView,
+    CacheStatsView,
     DepositView,
+    HistoryExportView,
     HistoryView,
     HomeView,
+    StatementView,
     TransferView,
     WithdrawView,
+    WriteStatsView,
+    history_async,
+    home_async,
 )
 
 app_name = "bank_accounts"
@@ -32,6 +40,12 @@ urlpatterns = [
         kwargs={},
         name="history",
     ),
+    path(
+        "history/export/",
+        HistoryExportView.as_view(),
+        kwargs={},
+        name="history-export",
+    ),
     path(
         "deposit/",
         DepositView.as_view(),
@@ -50,4 +64,41 @@ urlpatterns = [
         kwargs={},
         name="transfer",
     ),
+    path("async/", home_async, kwargs={}, name="home-async"),
+    path(
+        "async/history/",
+        history_async,
+        kwargs={},
+        name="history-async",
+    ),
+    path(
+        "accounts/autocomplete/",
+        AccountAutocompleteView.as_view(),
+        kwargs={},
+        name="account-autocomplete",
+    ),
+    path(
+        "accounts/<int:account>/statement/",
+        StatementView.as_view(),
+        kwargs={},
+        name="statement",
+    ),
+    path(
+        "analytics/<slug:report>/",
+        AnalyticsView.as_view(),
+        kwargs={},
+        name="analytics",
+    ),
+    path(
+        "stats/writes/",
+        WriteStatsView.as_view(),
+        kwargs={},
+        name="write-stats",
+    ),
+    path(
+        "stats/cache/",
+        CacheStatsView.as_view(),
+        kwargs={},
+        name="cache-stats",
+    ),
 ]
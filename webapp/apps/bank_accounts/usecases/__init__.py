@@ -1,18 +1,57 @@
-from .accounts import AddAccountCommand, AddAccountUsecase
+from .accounts import (
+    AddAccountCommand,
+    AddAccountUsecase,
+    SetBalanceSlotsCommand,
+    SetBalanceSlotsUsecase,
+)
+from .archive import ArchiveMonthCommand, ArchiveMonthUsecase
+from .asynchronous import AsyncUsecase
+from .batch import (
+    BatchItemResult,
+    BatchTransferUsecase,
+    CopyBatchTransferUsecase,
+)
+from .checkpoints import (
+    CreateBalanceCheckpointsCommand,
+    CreateBalanceCheckpointsUsecase,
+)
 from .currencies import AddCurrencyCommand, AddCurrencyUsecase
+from .daily_stats import RebuildDailyStatsCommand, RebuildDailyStatsUsecase
 from .deposits import DepositCommand, DepositUsecase
-from .transfer import TransferCommand, TransferUsecase
-from .withdraws import WithdrawCommand, WithdrawUsecase
+from .exchange_rates import LoadExchangeRatesCommand, LoadExchangeRatesUsecase
+from .group_commit import GroupCommitExecutor
+from .reconcile import RepairBalancesCommand, RepairBalancesUsecase
+from .transfer import FastTransferUsecase, TransferCommand, TransferUsecase
+from .withdraws import FastWithdrawUsecase, WithdrawCommand, WithdrawUsecase
 
 __all__ = [
     "AddCurrencyUsecase",
     "AddCurrencyCommand",
     "AddAccountUsecase",
     "AddAccountCommand",
+    "SetBalanceSlotsCommand",
+    "SetBalanceSlotsUsecase",
+    "CreateBalanceCheckpointsCommand",
+    "CreateBalanceCheckpointsUsecase",
+    "RebuildDailyStatsCommand",
+    "RebuildDailyStatsUsecase",
     "DepositCommand",
     "DepositUsecase",
+    "GroupCommitExecutor",
     "WithdrawCommand",
     "WithdrawUsecase",
+    "FastWithdrawUsecase",
+    "RepairBalancesCommand",
+    "RepairBalancesUsecase",
+    "LoadExchangeRatesCommand",
+    "LoadExchangeRatesUsecase",
     "TransferCommand",
     "TransferUsecase",
+    "FastTransferUsecase",
+    "AsyncUsecase",
+    "ArchiveMonthCommand",
+    "ArchiveMonthUsecase",
+    "BatchItemResult",
+    "BatchTransferUsecase",
+    "CopyBatchTransferUsecase",
 ]
@@ -1,10 +1,10 @@
 from dataclasses import dataclass
-from decimal import Decimal
 
 from django.db import transaction
 
-from ..models import Account
-from ..queries import currency_queries
+from ..models import Account, AccountBalanceSlot, BalanceCheckpoint
+from ..money import Money
+from ..queries import account_queries, currency_queries, summary_queries
 
 
 @dataclass(frozen=True, slots=True)
@@ -12,7 +12,7 @@ class AddAccountCommand:
     name: str
     description: str
     currency: int
-    funds: Decimal
+    funds: Money
 
 
 class AddAccountUsecase:
@@ -20,9 +20,69 @@ class AddAccountUsecase:
         currency = currency_queries.get_by_id(command.currency)
 
         with transaction.atomic():
-            Account.objects.create(
+            account = Account.objects.create(
                 name=command.name,
                 description=command.description,
                 currency=currency,
                 funds=command.funds or 0,
             )
+            BalanceCheckpoint.objects.create(
+                account=account,
+                as_of=account.created_date,
+                balance=account.funds,
+            )
+            account_queries.metadata_cache.invalidate()
+            summary_queries.invalidate()
+
+
+@dataclass(frozen=True, slots=True)
+class SetBalanceSlotsCommand:
+    account: int
+    slots: int
+
+
+class SetBalanceSlotsUsecase:
+    """
+    Spread funds of a "hot" account across `slots` balance slots, so
+    concurrent writers update different rows instead of queueing on one.
+    Setting `slots` to 0 folds slots back into `Account.funds`.
+    """
+
+    def execute(self, command: SetBalanceSlotsCommand):
+        if command.slots < 0:
+            raise ValueError("Number of balance slots cannot be negative")
+
+        with transaction.atomic():
+            account = Account.objects.select_for_update().get(
+                pk=command.account
+            )
+            slots = list(
+                AccountBalanceSlot.objects.select_for_update()
+                .filter(account=account)
+                .order_by("slot")
+            )
+            balance = account.funds + sum(slot.funds for slot in slots)
+
+            AccountBalanceSlot.objects.filter(account=account).delete()
+
+            if command.slots:
+                share, remainder = divmod(balance, command.slots)
+                AccountBalanceSlot.objects.bulk_create(
+                    AccountBalanceSlot(
+                        account=account,
+                        slot=slot,
+                        funds=Money(share + (remainder if slot == 0 else 0)),
+                    )
+                    for slot in range(command.slots)
+                )
+                account.funds = 0
+
+            else:
+                account.funds = balance
+
+            account.balance_slots = command.slots
+            account.version += 1
+            account.save(update_fields=["funds", "balance_slots", "version"])
+            account_queries.metadata_cache.invalidate()
+
+        return account
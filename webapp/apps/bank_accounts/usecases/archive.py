@@ -0,0 +1,139 @@
+import heapq
+from dataclasses import dataclass
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from ..archive import ArchiveWriter, transfer_archive
+from ..models import AccountEntry, IdempotencyKey, Transfer
+from ..partitions import (
+    TABLE,
+    add_months,
+    current_month,
+    detach_partition,
+    get_partitions,
+    is_partitioned,
+    partition_name,
+)
+
+# `ArchiveWriter` row, as `values_list` lookups on `Transfer`
+ARCHIVE_ROW_LOOKUPS = (
+    "id",
+    "transfer_date",
+    "value",
+    "from_account_id",
+    "to_account_id",
+    "name",
+    "from_account__name",
+    "to_account__name",
+    "currency__symbol",
+    "to_value",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveMonthCommand:
+    month: date
+
+
+class ArchiveMonthUsecase:
+    """
+    Move transfers of closed UTC month from database to columnar archive
+    file, oldest month first. File is written and synced before rows are
+    removed, then journal entries of the month are deleted and its
+    partition detached and dropped, or its rows deleted when transfer table
+    is not partitioned. Month without transfers gets no file, only its
+    empty partition is dropped. Returns number of archived transfers.
+    """
+
+    chunk_size = 2000
+
+    def execute(self, command: ArchiveMonthCommand):
+        if not transfer_archive.directory:
+            raise ValueError("TRANSFER_ARCHIVE_DIR is not set")
+
+        if command.month >= current_month():
+            raise ValueError("Only closed months can be archived")
+
+        start = self._as_datetime(command.month)
+        end = self._as_datetime(add_months(command.month, 1))
+
+        if Transfer.objects.filter(transfer_date__lt=start).exists():
+            raise ValueError("Older months must be archived first")
+
+        transfers = Transfer.objects.filter(
+            transfer_date__gte=start, transfer_date__lt=end
+        )
+        count = (
+            self._write(transfers, transfer_archive.path(command.month))
+            if transfers.exists()
+            else 0
+        )
+        partitioned = is_partitioned()
+
+        with transaction.atomic():
+            AccountEntry.objects.filter(
+                transfer__transfer_date__gte=start,
+                transfer__transfer_date__lt=end,
+            ).delete()
+            IdempotencyKey.objects.filter(
+                transfer__transfer_date__gte=start,
+                transfer__transfer_date__lt=end,
+            ).update(transfer=None)
+
+            if not partitioned:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"DELETE FROM {connection.ops.quote_name(TABLE)} "
+                        "WHERE transfer_date >= %s AND transfer_date < %s",
+                        [start, end],
+                    )
+
+        if partitioned and command.month in get_partitions():
+            detach_partition(command.month)
+            name = connection.ops.quote_name(partition_name(command.month))
+
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {name}")
+
+        return count
+
+    def _write(self, transfers, path):
+        writer = ArchiveWriter(path)
+        rows = transfers.order_by("transfer_date", "id").values_list(
+            *ARCHIVE_ROW_LOOKUPS
+        )
+        count = 0
+
+        for row in rows.iterator(self.chunk_size):
+            writer.add_transfer(row)
+            count += 1
+
+        # each side is a range scan of `(account, transfer_date, id)` index,
+        # merged into one stream ordered by account
+        outgoing = (
+            transfers.filter(from_account__isnull=False)
+            .order_by("from_account_id", "transfer_date", "id")
+            .values_list(*ARCHIVE_ROW_LOOKUPS)
+        )
+        incoming = (
+            transfers.filter(to_account__isnull=False)
+            .exclude(from_account_id=F("to_account_id"))
+            .order_by("to_account_id", "transfer_date", "id")
+            .values_list(*ARCHIVE_ROW_LOOKUPS)
+        )
+        sides = heapq.merge(
+            ((row[3], row) for row in outgoing.iterator(self.chunk_size)),
+            ((row[4], row) for row in incoming.iterator(self.chunk_size)),
+            key=lambda side: (side[0], side[1][1], side[1][0]),
+        )
+
+        for account_id, row in sides:
+            writer.add_entry(account_id, row)
+
+        writer.close()
+        return count
+
+    def _as_datetime(self, month):
+        return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
@@ -0,0 +1,48 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_DB_THREADS,
+    thread_name_prefix="bank-accounts-db",
+)
+
+
+def _call_with_connection(func, *args, **kwargs):
+    # threads of the pool outlive requests, so connections are recycled
+    # the same way request_started / request_finished do it
+    close_old_connections()
+
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_in_db_thread(func, *args, **kwargs):
+    """
+    Run blocking ORM code in dedicated thread pool and await its result.
+    Unlike `sync_to_async`, calls are not serialized on one shared thread,
+    so up to `ASYNC_DB_THREADS` of them run concurrently.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        db_executor,
+        functools.partial(_call_with_connection, func, *args, **kwargs),
+    )
+
+
+class AsyncUsecase:
+    """
+    Async wrapper of write usecase. Whole `execute`, including its
+    transaction, runs in one thread of the db pool.
+    """
+
+    def __init__(self, usecase):
+        self.usecase = usecase
+
+    async def execute(self, command):
+        return await run_in_db_thread(self.usecase.execute, command)
@@ -0,0 +1,120 @@
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+from ..exceptions import (
+    ConcurrentUpdateException,
+    InvalidWithdrawAmountException,
+)
+from ..queries import account_queries
+
+
+class AccountVersionConflict(Exception):
+    """
+    Account was changed by another transaction since it was read.
+    """
+
+
+class WriteStats:
+    """
+    Per-usecase, per-process counters of optimistic writes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(Counter)
+
+    def incr(self, usecase, name):
+        with self._lock:
+            self._counters[usecase][name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                usecase: dict(counters)
+                for usecase, counters in self._counters.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+write_stats = WriteStats()
+
+
+def check_slot_funds(account):
+    """
+    Call when funds of account could not be saved. Raises
+    `InvalidWithdrawAmountException` when hot account was debited and its
+    slots do not hold the amount anymore, retrying would not help then.
+    """
+    if not account.balance_slots:
+        return
+
+    debited = account.loaded_funds - account.funds
+
+    if debited > 0 and not account_queries.slots_cover(account, debited):
+        raise InvalidWithdrawAmountException(
+            "Amount cannot be higher than available funds"
+        )
+
+
+class AccountWriteUsecase:
+    """
+    Base of usecases changing account funds.
+
+    By default accounts are locked with `SELECT ... FOR UPDATE` for whole
+    transaction. With optimistic locking accounts are read without locks
+    and written with compare-and-swap on `Account.version`; transaction
+    which lost the race is rolled back and retried with jittered backoff.
+    """
+
+    def __init__(self, optimistic=None):
+        if optimistic is None:
+            optimistic = settings.OPTIMISTIC_LOCKING
+
+        self.optimistic = optimistic
+        self.max_retries = settings.OPTIMISTIC_LOCKING_RETRIES
+        self.retry_delay = settings.OPTIMISTIC_LOCKING_RETRY_DELAY
+
+    def get_accounts(self, *ids):
+        if self.optimistic:
+            return account_queries.get_many(*ids)
+
+        return account_queries.get_for_update(*ids)
+
+    def save_accounts(self, *accounts):
+        # ascending id order, same as row locks taken by `get_for_update`
+        for account in sorted(accounts, key=lambda acc: acc.pk):
+            if not account_queries.save_funds(account):
+                check_slot_funds(account)
+                raise AccountVersionConflict(
+                    f"Account with id {account.pk} was changed concurrently"
+                )
+
+    def retry_on_conflict(self, func, *args):
+        name = type(self).__name__
+
+        for attempt in range(self.max_retries + 1):
+            write_stats.incr(name, "attempts")
+
+            try:
+                return func(*args)
+
+            except AccountVersionConflict:
+                write_stats.incr(name, "conflicts")
+
+                if attempt == self.max_retries:
+                    break
+
+                write_stats.incr(name, "retries")
+                time.sleep(random.uniform(0, self.retry_delay * 2**attempt))
+
+        write_stats.incr(name, "failures")
+        raise ConcurrentUpdateException(
+            "Account was changed by another request, try again"
+        )
@@ -0,0 +1,365 @@
+import csv
+import io
+from dataclasses import dataclass
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..exceptions import (
+    CannotTransferToSameAccountException,
+    ConcurrentUpdateException,
+    IdempotencyKeyConflictException,
+    InvalidDepositAmountException,
+    InvalidTransferCurrencyException,
+    InvalidWithdrawAmountException,
+)
+from ..models import Account, AccountEntry, Currency, IdempotencyKey, Transfer
+from ..queries import (
+    account_queries,
+    currency_queries,
+    idempotency_key_queries,
+    summary_queries,
+)
+from .base import check_slot_funds
+from .daily_stats import record_daily_stats
+from .deposits import DepositCommand, DepositUsecase
+from .idempotency import check_fingerprint, fingerprint, idempotency_keys
+from .journal import balance_of, journal_entries
+from .transfer import TransferCommand, TransferUsecase
+from .withdraws import WithdrawCommand, WithdrawUsecase
+
+BATCH_ITEM_ERRORS = (
+    CannotTransferToSameAccountException,
+    IdempotencyKeyConflictException,
+    InvalidDepositAmountException,
+    InvalidTransferCurrencyException,
+    InvalidWithdrawAmountException,
+    ObjectDoesNotExist,
+)
+
+
+@dataclass(slots=True)
+class BatchItemResult:
+    index: int
+    # None for rows which could not be parsed into command
+    command: DepositCommand | WithdrawCommand | TransferCommand | None
+    applied: bool = False
+    replayed: bool = False
+    transfer: Transfer | None = None
+    exception: Exception | None = None
+
+    @property
+    def error(self):
+        return "" if self.exception is None else str(self.exception)
+
+
+class BatchTransferUsecase:
+    """
+    Execute many deposit / withdraw / transfer commands in one transaction.
+
+    Every account and currency used by batch is fetched once (accounts are
+    locked in ascending id order), commands are validated in order against
+    in-memory balances, transfers are written with `bulk_create` and every
+    touched account gets exactly one UPDATE with its final balance.
+
+    By default batch is all-or-nothing: when any command is invalid nothing
+    is written. With `skip_failed=True` invalid commands are only reported
+    and rest of batch is committed. Commands with already used idempotency
+    key are reported as replayed and not executed again.
+    """
+
+    def __init__(self, skip_failed=False, batch_size=1000):
+        self.skip_failed = skip_failed
+        self.batch_size = batch_size
+        self._deposit = DepositUsecase()
+        self._withdraw = WithdrawUsecase()
+        self._transfer = TransferUsecase()
+
+    def execute(self, commands) -> list[BatchItemResult]:
+        results = [
+            BatchItemResult(index=index, command=command)
+            for index, command in enumerate(commands)
+        ]
+        currencies = currency_queries.get_in_bulk(
+            self._get_ids(command.currency for command in commands)
+        )
+        # every transfer of batch is converted with rates in effect at
+        # same moment
+        now = timezone.now()
+
+        with transaction.atomic():
+            accounts = account_queries.get_for_update_in_bulk(
+                self._get_account_ids(commands)
+            )
+            used_keys = {
+                key: (record.fingerprint, record.transfer)
+                for key, record in idempotency_key_queries.get_by_keys(
+                    [c.idempotency_key for c in commands if c.idempotency_key]
+                ).items()
+            }
+            transfers = []
+            balances = []
+            new_keys = []
+            touched_accounts = {}
+
+            for result in results:
+                key = result.command.idempotency_key
+
+                try:
+                    if key and key in used_keys:
+                        stored, transfer = used_keys[key]
+                        check_fingerprint(key, stored, result.command)
+                        result.replayed = True
+                        result.transfer = transfer
+                        continue
+
+                    transfer = self._prepare(
+                        result.command, accounts, currencies, now
+                    )
+
+                except BATCH_ITEM_ERRORS as ex:
+                    result.exception = ex
+                    continue
+
+                transfers.append(transfer)
+                result.transfer = transfer
+                balances.append(
+                    (
+                        self._balance_of(transfer.from_account),
+                        self._balance_of(transfer.to_account),
+                    )
+                )
+                result.applied = True
+
+                if key:
+                    stored = fingerprint(result.command)
+                    used_keys[key] = (stored, transfer)
+                    new_keys.append(
+                        IdempotencyKey(
+                            key=key, fingerprint=stored, transfer=transfer
+                        )
+                    )
+
+                for account in (transfer.from_account, transfer.to_account):
+                    if account is not None:
+                        touched_accounts[account.pk] = account
+
+            if not self.skip_failed and any(
+                r.exception is not None for r in results
+            ):
+                for result in results:
+                    result.applied = False
+                    result.transfer = None
+
+                return results
+
+            self.write_transfers(transfers)
+
+            for account in touched_accounts.values():
+                if not account_queries.save_funds(account):
+                    check_slot_funds(account)
+                    # hot account slots changed since they were read
+                    raise ConcurrentUpdateException(
+                        "Account was changed by another request, try again"
+                    )
+
+            # built once transfers have ids, so entries keep them cached
+            entries = [
+                entry
+                for transfer, (from_balance, to_balance) in zip(
+                    transfers, balances
+                )
+                for entry in journal_entries(
+                    transfer, from_balance, to_balance
+                )
+            ]
+            AccountEntry.objects.bulk_create(
+                entries, batch_size=self.batch_size
+            )
+            record_daily_stats(entries)
+            summary_queries.invalidate()
+            self.write_idempotency_keys(new_keys)
+
+        return results
+
+    def write_transfers(self, transfers):
+        Transfer.objects.bulk_create(transfers, batch_size=self.batch_size)
+
+    def write_idempotency_keys(self, keys):
+        for key in keys:
+            if key.transfer.pk is None:
+                key.transfer = None
+
+        IdempotencyKey.objects.bulk_create(keys, batch_size=self.batch_size)
+
+        for key in keys:
+            if key.transfer is not None:
+                transaction.on_commit(
+                    lambda k=key: idempotency_keys.remember(
+                        k.key, k.fingerprint, k.transfer
+                    )
+                )
+
+    def _prepare(self, command, accounts, currencies, now):
+        currency = self._get(currencies, Currency, command.currency)
+
+        if isinstance(command, DepositCommand):
+            account = self._get(accounts, Account, command.to_account)
+            self._deposit.validate(command, account, currency)
+            account.funds += command.value
+
+            return Transfer(
+                name=command.name,
+                to_account=account,
+                currency=currency,
+                value=command.value,
+            )
+
+        if isinstance(command, WithdrawCommand):
+            account = self._get(accounts, Account, command.from_account)
+            self._withdraw.validate(command, account, currency)
+            account.funds -= command.value
+
+            return Transfer(
+                name=command.name,
+                from_account=account,
+                currency=currency,
+                value=command.value,
+            )
+
+        if isinstance(command, TransferCommand):
+            from_account = self._get(accounts, Account, command.from_account)
+            to_account = self._get(accounts, Account, command.to_account)
+            self._transfer.validate(
+                command, from_account, to_account, currency, now
+            )
+            exchange_rate, to_value = self._transfer.convert(
+                command, currency, to_account, now
+            )
+            transfer = Transfer(
+                name=command.name,
+                from_account=from_account,
+                to_account=to_account,
+                currency=currency,
+                value=command.value,
+                exchange_rate=exchange_rate,
+                to_value=to_value,
+            )
+            from_account.funds -= command.value
+            to_account.funds += transfer.credited_value
+
+            return transfer
+
+        raise TypeError(f"Unsupported batch command: {command!r}")
+
+    def _balance_of(self, account):
+        return None if account is None else balance_of(account)
+
+    def _get(self, objects, model, idx):
+        try:
+            return objects[int(idx)]
+        except (KeyError, TypeError, ValueError):
+            raise model.DoesNotExist(
+                f"{model._meta.verbose_name} with id {idx} does not exist"
+            )
+
+    def _get_account_ids(self, commands):
+        return self._get_ids(
+            getattr(command, field, None)
+            for command in commands
+            for field in ("from_account", "to_account")
+        )
+
+    def _get_ids(self, values):
+        # invalid ids are left out, `_get` reports them for their command
+        ids = set()
+
+        for idx in values:
+            try:
+                ids.add(int(idx))
+            except (TypeError, ValueError):
+                pass
+
+        return ids
+
+
+class CopyBatchTransferUsecase(BatchTransferUsecase):
+    """
+    PostgreSQL only. Same as `BatchTransferUsecase`, but transfers are
+    streamed with COPY into temporary staging table and moved into transfer
+    table with single `INSERT ... SELECT`. Ids are reserved from transfer
+    sequence up front, so journal entries and idempotency keys can point
+    to copied transfers.
+    """
+
+    staging_table = "bank_accounts_transfer_staging"
+    columns = (
+        "id",
+        "name",
+        "from_account_id",
+        "to_account_id",
+        "currency_id",
+        "value",
+        "exchange_rate_id",
+        "to_value",
+        "transfer_date",
+    )
+
+    def write_transfers(self, transfers):
+        transfer_date = timezone.now()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+
+        for transfer, idx in zip(transfers, self._reserve_ids(len(transfers))):
+            transfer.pk = idx
+            transfer.transfer_date = transfer_date
+            row = [getattr(transfer, column) for column in self.columns]
+            # plain numbers of minor units, `str` of `Money` is for display
+            row[self.columns.index("value")] = int(transfer.value)
+
+            if transfer.to_value is not None:
+                row[self.columns.index("to_value")] = int(transfer.to_value)
+
+            writer.writerow(row)
+
+        buffer.seek(0)
+        table = connection.ops.quote_name(Transfer._meta.db_table)
+        columns = ", ".join(self.columns)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {self.staging_table} ("
+                "id bigint NOT NULL, "
+                "name varchar(50) NOT NULL, "
+                "from_account_id bigint, "
+                "to_account_id bigint, "
+                "currency_id bigint NOT NULL, "
+                "value bigint NOT NULL, "
+                "exchange_rate_id bigint, "
+                "to_value bigint, "
+                "transfer_date timestamp with time zone NOT NULL"
+                ") ON COMMIT DELETE ROWS"
+            )
+            # csv writer quotes empty values, they are NULLs all the same
+            cursor.copy_expert(
+                f"COPY {self.staging_table} ({columns}) "
+                "FROM STDIN WITH (FORMAT csv, FORCE_NULL ("
+                "from_account_id, to_account_id, exchange_rate_id, to_value"
+                "))",
+                buffer,
+            )
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM {self.staging_table}"
+            )
+            cursor.execute(f"TRUNCATE {self.staging_table}")
+
+    def _reserve_ids(self, count):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) "
+                "FROM generate_series(1, %s)",
+                [Transfer._meta.db_table, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+
+from django.db import transaction
+
+from ..models import BalanceCheckpoint
+from ..queries import account_queries, balance_queries
+
+
+@dataclass(frozen=True, slots=True)
+class CreateBalanceCheckpointsCommand:
+    as_of: datetime
+    batch_size: int = 1000
+
+
+class CreateBalanceCheckpointsUsecase:
+    """
+    Write checkpoint `as_of` given moment for every account which had
+    transfers since its previous checkpoint. `as_of` should lag behind
+    current time, so transactions still in flight cannot add transfers
+    dated before it.
+    """
+
+    def execute(self, command: CreateBalanceCheckpointsCommand):
+        missing = []
+        by_as_of = {}
+
+        for (
+            account_id,
+            checkpoint,
+        ) in balance_queries.get_latest_checkpoints().items():
+            if checkpoint is None:
+                missing.append(account_id)
+            elif checkpoint.as_of < command.as_of:
+                by_as_of.setdefault(checkpoint.as_of, []).append(checkpoint)
+
+        created = 0
+
+        for ids in _chunks(missing, command.batch_size):
+            created += self._create_initial(command, ids)
+
+        # accounts are usually checkpointed together, so there are only
+        # few distinct windows to aggregate
+        for as_of, checkpoints in by_as_of.items():
+            for chunk in _chunks(checkpoints, command.batch_size):
+                created += self._create_next(command, as_of, chunk)
+
+        return created
+
+    def _create_next(self, command, after, checkpoints):
+        balances = {cp.account_id: cp.balance for cp in checkpoints}
+        changes = balance_queries.get_net_changes(
+            list(balances), after, command.as_of
+        )
+        return len(
+            BalanceCheckpoint.objects.bulk_create(
+                BalanceCheckpoint(
+                    account_id=account_id,
+                    as_of=command.as_of,
+                    balance=balances[account_id] + change,
+                )
+                for account_id, change in changes.items()
+            )
+        )
+
+    def _create_initial(self, command, ids):
+        # accounts created before checkpoints existed: walk back from
+        # current balance, with accounts locked so it cannot move meanwhile
+        with transaction.atomic():
+            accounts = account_queries.get_for_update_in_bulk(ids)
+            changes = balance_queries.get_net_changes(ids, command.as_of, None)
+            return len(
+                BalanceCheckpoint.objects.bulk_create(
+                    BalanceCheckpoint(
+                        account_id=account_id,
+                        as_of=command.as_of,
+                        balance=account.funds - changes.get(account_id, 0),
+                    )
+                    for account_id, account in accounts.items()
+                )
+            )
+
+
+def _chunks(items, size):
+    items = iter(items)
+
+    while chunk := list(islice(items, size)):
+        yield chunk
@@ -4,6 +4,7 @@ from django.db import transaction
 
 from ..exceptions import InvalidCurrencyException
 from ..models import Currency
+from ..queries import currency_queries, summary_queries
 
 
 @dataclass(frozen=True, slots=True)
@@ -20,3 +21,5 @@ class AddCurrencyUsecase:
 
         with transaction.atomic():
             Currency.objects.create(symbol=command.symbol)
+            currency_queries.cache.invalidate()
+            summary_queries.invalidate()
@@ -0,0 +1,67 @@
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..queries import account_queries, daily_stats_queries
+
+
+def record_daily_stats(entries):
+    """
+    Add saved journal entries to daily stats of their accounts. Must be
+    called in same transaction as the entries are written. Hot accounts,
+    whose entries carry no balance, write into randomly chosen slot of the
+    day, like their funds.
+    """
+    deltas = defaultdict(lambda: [0, 0, 0, 0])
+    slots = {}
+
+    for entry in entries:
+        if entry.balance is not None:
+            slots[entry.account_id] = 0
+        elif entry.account_id not in slots:
+            balance_slots = account_queries.get_metadata(
+                entry.account_id
+            ).balance_slots
+            slots[entry.account_id] = (
+                random.randrange(balance_slots) if balance_slots else 0
+            )
+
+        day = timezone.localdate(entry.transfer.transfer_date)
+        delta = deltas[entry.account_id, day, slots[entry.account_id]]
+
+        if entry.amount > 0:
+            delta[0] += entry.amount
+            delta[2] += 1
+        else:
+            delta[1] -= entry.amount
+            delta[3] += 1
+
+    daily_stats_queries.increment(deltas)
+
+
+@dataclass(frozen=True, slots=True)
+class RebuildDailyStatsCommand:
+    account_ids: tuple
+
+
+class RebuildDailyStatsUsecase:
+    """
+    Replace daily stats of accounts with ones recomputed from journal and
+    archive.
+    Accounts are locked meanwhile, so transfers cannot be counted twice or
+    not at all. Hot accounts are never locked, rebuild them while idle.
+    """
+
+    def execute(self, command: RebuildDailyStatsCommand):
+        with transaction.atomic():
+            account_queries.get_for_update_in_bulk(command.account_ids)
+            stats = daily_stats_queries.compute_from_journal(
+                command.account_ids
+            )
+            daily_stats_queries.model.objects.filter(
+                account_id__in=command.account_ids
+            ).delete()
+            return len(daily_stats_queries.model.objects.bulk_create(stats))
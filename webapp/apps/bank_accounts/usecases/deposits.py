@@ -1,5 +1,4 @@
 from dataclasses import dataclass
-from decimal import Decimal
 
 from django.db import transaction
 
@@ -8,7 +7,11 @@ from ..exceptions import (
     InvalidTransferCurrencyException,
 )
 from ..models import Transfer
+from ..money import Money
 from ..queries import account_queries, currency_queries
+from .base import AccountWriteUsecase
+from .idempotency import idempotency_keys
+from .journal import balance_of, write_journal
 
 
 @dataclass(frozen=True, slots=True)
@@ -16,30 +19,57 @@ class DepositCommand:
     name: str
     to_account: int
     currency: int
-    value: Decimal
+    value: Money
+    idempotency_key: str | None = None
 
 
-class DepositUsecase:
+class DepositUsecase(AccountWriteUsecase):
     def execute(self, command: DepositCommand):
-        account = account_queries.get_by_id(command.to_account)
-        currency = currency_queries.get_by_id(command.currency)
+        replayed = idempotency_keys.get_cached(command)
 
-        if account.currency != currency:
-            raise InvalidTransferCurrencyException(
-                "Account currency does not match deposit currency"
-            )
+        if replayed is not None:
+            return replayed
 
-        if command.value <= 0:
-            raise InvalidDepositAmountException(
-                "Deposit amount must be higher than 0"
-            )
+        currency = currency_queries.get_by_id(command.currency)
+        self.validate_account(
+            account_queries.get_metadata(command.to_account), currency
+        )
+        return self.retry_on_conflict(self._execute, command, currency)
 
+    def _execute(self, command, currency):
         with transaction.atomic():
-            Transfer.objects.create(
+            if record := idempotency_keys.claim(command):
+                return record.transfer
+
+            (account,) = self.get_accounts(command.to_account)
+            self.validate(command, account, currency)
+
+            transfer = Transfer.objects.create(
                 name=command.name,
                 to_account=account,
                 currency=currency,
                 value=command.value,
             )
             account.funds += command.value
-            account.save()
+            self.save_accounts(account)
+            write_journal(transfer, to_balance=balance_of(account))
+            idempotency_keys.complete(command, transfer)
+
+        return transfer
+
+    def validate(self, command, account, currency):
+        self.validate_account(account, currency)
+
+        if command.value <= 0:
+            raise InvalidDepositAmountException(
+                "Deposit amount must be higher than 0"
+            )
+
+    def validate_account(self, account, currency):
+        """
+        Checks which need only `AccountMetadata`, done before transaction.
+        """
+        if account.currency_id != currency.pk:
+            raise InvalidTransferCurrencyException(
+                "Account currency does not match deposit currency"
+            )
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import transaction
+
+from ..exceptions import InvalidExchangeRateException
+from ..models import ExchangeRate
+from ..queries import exchange_rate_queries
+
+
+@dataclass(frozen=True, slots=True)
+class LoadExchangeRatesCommand:
+    # (from currency id, to currency id, rate, effective from)
+    rates: list[tuple[int, int, Decimal, datetime]]
+
+
+class LoadExchangeRatesUsecase:
+    """
+    Add effective-dated rates in one transaction and bump version of rate
+    cache, so every process reloads rates on next lookup. Rate already
+    loaded for same pair and date is kept, transfers may have used it.
+    Returns number of added rates.
+    """
+
+    def execute(self, command: LoadExchangeRatesCommand):
+        rates = {}
+
+        for from_currency, to_currency, rate, effective_from in command.rates:
+            if int(from_currency) == int(to_currency):
+                raise InvalidExchangeRateException(
+                    "Exchange rate must convert between two currencies"
+                )
+
+            if rate <= 0:
+                raise InvalidExchangeRateException(
+                    "Exchange rate must be higher than 0"
+                )
+
+            # first row for same pair and date wins, as it would in table
+            rates.setdefault(
+                (int(from_currency), int(to_currency), effective_from),
+                ExchangeRate(
+                    from_currency_id=from_currency,
+                    to_currency_id=to_currency,
+                    rate=rate,
+                    effective_from=effective_from,
+                ),
+            )
+
+        with transaction.atomic():
+            added = exchange_rate_queries.add_new(list(rates.values()))
+            exchange_rate_queries.invalidate()
+            return added
@@ -0,0 +1,135 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+
+from ..exceptions import ConcurrentUpdateException
+from .batch import BatchTransferUsecase
+from .deposits import DepositCommand
+from .idempotency import idempotency_keys
+
+
+class GroupCommitExecutor:
+    """
+    Group commit of concurrent deposits.
+
+    Callers of `execute` are queued, and a single worker thread commits up
+    to `max_batch` of them, collected within `max_wait` seconds, in one
+    transaction through `BatchTransferUsecase`. Every account gets one
+    UPDATE per group no matter how many deposits hit it. Each caller blocks
+    until its group is committed and gets its own transfer or exception.
+    When whole group fails, its deposits are committed one by one, so only
+    callers of bad ones get the error. Caller waits at most `timeout`
+    seconds. Must not be called inside a transaction, the commit happens
+    elsewhere.
+    """
+
+    def __init__(self, max_batch, max_wait, timeout=30.0):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.commits = 0
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def execute(self, command: DepositCommand):
+        replayed = idempotency_keys.get_cached(command)
+
+        if replayed is not None:
+            return replayed
+
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((command, future))
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            pass
+
+        if future.cancel():
+            raise ConcurrentUpdateException(
+                "Deposit was not committed in time, try again"
+            )
+
+        # group of deposit is being committed right now
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise ConcurrentUpdateException(
+                "Deposit is still being committed, retry with same "
+                "idempotency key to find out its result"
+            )
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="deposit-group-commit", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            group = []
+            self._take(group, self._queue.get())
+            deadline = time.monotonic() + self.max_wait
+
+            while len(group) < self.max_batch:
+                timeout = deadline - time.monotonic()
+
+                if timeout <= 0:
+                    break
+
+                try:
+                    self._take(group, self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            if group:
+                self._commit(group)
+
+    def _take(self, group, item):
+        # callers which gave up waiting have cancelled their future
+        if item[1].set_running_or_notify_cancel():
+            group.append(item)
+
+    def _commit(self, group):
+        try:
+            close_old_connections()
+            results = BatchTransferUsecase(
+                skip_failed=True, batch_size=self.max_batch
+            ).execute([command for command, _ in group])
+        except Exception as ex:
+            if len(group) == 1:
+                group[0][1].set_exception(ex)
+            else:
+                for item in group:
+                    self._commit([item])
+
+            return
+
+        self.commits += 1
+
+        for (_, future), result in zip(group, results):
+            if result.exception is not None:
+                future.set_exception(result.exception)
+            else:
+                future.set_result(result.transfer)
+
+        try:
+            close_old_connections()
+        except DatabaseError:
+            # group is committed already, next group opens new connection
+            pass
+
+
+deposit_group_commit = GroupCommitExecutor(
+    max_batch=settings.DEPOSIT_GROUP_COMMIT_MAX_BATCH,
+    max_wait=settings.DEPOSIT_GROUP_COMMIT_MAX_WAIT,
+    timeout=settings.DEPOSIT_GROUP_COMMIT_TIMEOUT,
+)
@@ -0,0 +1,161 @@
+import dataclasses
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ..exceptions import IdempotencyKeyConflictException
+from ..models import IdempotencyKey
+from ..queries import idempotency_key_queries
+
+
+def fingerprint(command):
+    """
+    Hash of command type and fields other than idempotency key, stored
+    with the key so it cannot be replayed for different request.
+    """
+    fields = {
+        field.name: str(getattr(command, field.name))
+        for field in dataclasses.fields(command)
+        if field.name != "idempotency_key"
+    }
+    payload = json.dumps([type(command).__name__, fields], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def check_fingerprint(key, stored, command):
+    """
+    Raise when key was stored for request with different payload. Keys
+    stored before fingerprints were kept match any request.
+    """
+    if stored and stored != fingerprint(command):
+        raise IdempotencyKeyConflictException(
+            f"Idempotency key {key!r} was already used for different request"
+        )
+
+
+class IdempotencyKeys:
+    """
+    Idempotency keys of write usecases.
+
+    Keys are stored in unique-indexed table inside usecase transaction, so
+    a retried request replays original outcome instead of booking it again.
+    Recently committed keys are also kept in bounded in-process LRU, which
+    answers duplicate retries without touching the database. Key reused
+    for request with different payload raises
+    `IdempotencyKeyConflictException`.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_cached(self, command):
+        """
+        Return transfer booked by original request when its key is in LRU.
+        """
+        key = command.idempotency_key
+
+        if not key:
+            return None
+
+        with self._lock:
+            try:
+                stored, transfer, stored_at = self._cache[key]
+            except KeyError:
+                return None
+
+            if time.monotonic() - stored_at > self.ttl:
+                del self._cache[key]
+                return None
+
+            self._cache.move_to_end(key)
+
+        check_fingerprint(key, stored, command)
+        return transfer
+
+    def claim(self, command):
+        """
+        Store key of command inside current transaction. Returns None for
+        new key, or stored record of original request when key was already
+        used. Concurrent request with same key waits on unique index until
+        the first one commits or rolls back.
+        """
+        key = command.idempotency_key
+
+        if not key:
+            return None
+
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(
+                    key=key, fingerprint=fingerprint(command)
+                )
+
+        except IntegrityError:
+            record = idempotency_key_queries.get_by_key(key)
+
+            if record is not None:
+                check_fingerprint(key, record.fingerprint, command)
+
+            return record
+
+        return None
+
+    def complete(self, command, transfer):
+        """
+        Attach outcome to key claimed in current transaction.
+        """
+        key = command.idempotency_key
+
+        if not key:
+            return
+
+        IdempotencyKey.objects.filter(key=key).update(transfer=transfer)
+        transaction.on_commit(
+            lambda: self.remember(key, fingerprint(command), transfer)
+        )
+
+    def remember(self, key, stored, transfer):
+        with self._lock:
+            self._cache[key] = (stored, transfer, time.monotonic())
+            self._cache.move_to_end(key)
+
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def purge_expired(self, batch_size=1000):
+        """
+        Delete expired keys in batches of `batch_size` rows, so no single
+        statement holds locks on large part of the table.
+        """
+        created_before = timezone.now() - timedelta(seconds=self.ttl)
+        purged = 0
+
+        while ids := idempotency_key_queries.get_expired_ids(
+            created_before, batch_size
+        ):
+            with transaction.atomic():
+                IdempotencyKey.objects.filter(pk__in=ids).delete()
+
+            purged += len(ids)
+
+        return purged
+
+
+idempotency_keys = IdempotencyKeys(
+    max_size=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_KEY_TTL,
+)
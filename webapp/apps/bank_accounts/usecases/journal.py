@@ -0,0 +1,56 @@
+from ..models import AccountEntry
+from ..queries import summary_queries
+from .daily_stats import record_daily_stats
+
+
+def balance_of(account):
+    """
+    Balance recorded in journal after write to `account`. Hot accounts
+    are written without account lock, so their balance is not recorded.
+    """
+    if account.balance_slots:
+        return None
+
+    return account.funds
+
+
+def journal_entries(transfer, from_balance=None, to_balance=None):
+    """
+    Build unsaved `AccountEntry` rows for every account side of transfer.
+    """
+    entries = []
+
+    if transfer.from_account_id is not None:
+        entries.append(
+            AccountEntry(
+                account_id=transfer.from_account_id,
+                transfer=transfer,
+                amount=-transfer.value,
+                balance=from_balance,
+            )
+        )
+
+    if transfer.to_account_id is not None:
+        entries.append(
+            AccountEntry(
+                account_id=transfer.to_account_id,
+                transfer=transfer,
+                amount=transfer.credited_value,
+                balance=to_balance,
+            )
+        )
+
+    return entries
+
+
+def write_journal(transfer, from_balance=None, to_balance=None):
+    """
+    Write journal entries and daily stats of saved transfer, and invalidate
+    summary. Must be called in same transaction as the funds update, after
+    account rows are locked.
+    """
+    entries = AccountEntry.objects.bulk_create(
+        journal_entries(transfer, from_balance, to_balance)
+    )
+    record_daily_stats(entries)
+    summary_queries.invalidate()
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import F
+
+from ..models import Account, AccountBalanceSlot
+from ..queries import balance_queries, summary_queries
+
+
+@dataclass(frozen=True, slots=True)
+class RepairBalancesCommand:
+    account_ids: tuple
+
+
+class RepairBalancesUsecase:
+    """
+    Rewrite balances of accounts which drifted from their transfers.
+    Accounts and their balance slots are locked and checked again first,
+    so drift fixed meanwhile or caused by transfers committed after the
+    check is not "repaired". Returns `LedgerBalance` of repaired accounts.
+    """
+
+    def execute(self, command: RepairBalancesCommand):
+        with transaction.atomic():
+            list(
+                Account.objects.select_for_update()
+                .filter(pk__in=command.account_ids)
+                .order_by("pk")
+                .values_list("pk")
+            )
+            list(
+                AccountBalanceSlot.objects.select_for_update()
+                .filter(account_id__in=command.account_ids)
+                .order_by("account_id", "slot")
+                .values_list("pk")
+            )
+            repaired = [
+                ledger
+                for ledger in balance_queries.get_ledger(
+                    "in", command.account_ids
+                )
+                if ledger.drift
+            ]
+
+            for ledger in repaired:
+                Account.objects.filter(pk=ledger.account_id).update(
+                    funds=F("funds") - ledger.drift,
+                    version=F("version") + 1,
+                )
+
+            if repaired:
+                summary_queries.invalidate()
+
+        return repaired
@@ -1,15 +1,26 @@
 from dataclasses import dataclass
-from decimal import Decimal
 
 from django.db import transaction
+from django.utils import timezone
 
 from ..exceptions import (
     CannotTransferToSameAccountException,
+    ConcurrentUpdateException,
     InvalidTransferCurrencyException,
     InvalidWithdrawAmountException,
 )
 from ..models import Transfer
-from ..queries import account_queries, currency_queries
+from ..money import Money
+from ..queries import account_queries, currency_queries, exchange_rate_queries
+from .base import AccountWriteUsecase
+from .idempotency import idempotency_keys
+from .journal import balance_of, write_journal
+
+
+class _NeedsConversion(Exception):
+    """
+    Target account of fast transfer has other currency than transfer.
+    """
 
 
 @dataclass(frozen=True, slots=True)
@@ -18,50 +29,239 @@ class TransferCommand:
     from_account: int
     to_account: int
     currency: int
-    value: Decimal
+    value: Money
+    idempotency_key: str | None = None
 
 
-class TransferUsecase:
+class TransferUsecase(AccountWriteUsecase):
     def execute(self, command: TransferCommand):
-        from_account = account_queries.get_by_id(command.from_account)
-        to_account = account_queries.get_by_id(command.to_account)
+        replayed = idempotency_keys.get_cached(command)
+
+        if replayed is not None:
+            return replayed
+
         currency = currency_queries.get_by_id(command.currency)
+        # rate is looked up before and inside transaction, both must see
+        # same rate
+        now = timezone.now()
+        self.validate_accounts(
+            account_queries.get_metadata(command.from_account),
+            account_queries.get_metadata(command.to_account),
+            currency,
+            now,
+        )
+        return self.retry_on_conflict(self._execute, command, currency, now)
+
+    def _execute(self, command, currency, now):
+        with transaction.atomic():
+            if record := idempotency_keys.claim(command):
+                return record.transfer
+
+            from_account, to_account = self.get_accounts(
+                command.from_account, command.to_account
+            )
+            self.validate(command, from_account, to_account, currency, now)
+            exchange_rate, to_value = self.convert(
+                command, currency, to_account, now
+            )
+
+            transfer = Transfer.objects.create(
+                name=command.name,
+                from_account=from_account,
+                to_account=to_account,
+                currency=currency,
+                value=command.value,
+                exchange_rate=exchange_rate,
+                to_value=to_value,
+            )
+
+            from_account.funds -= command.value
+            to_account.funds += transfer.credited_value
+            self.save_accounts(from_account, to_account)
+            write_journal(
+                transfer,
+                from_balance=balance_of(from_account),
+                to_balance=balance_of(to_account),
+            )
+            idempotency_keys.complete(command, transfer)
+
+        return transfer
 
-        if command.from_account == command.to_account:
+    def validate(self, command, from_account, to_account, currency, at):
+        self.validate_accounts(from_account, to_account, currency, at)
+
+        if command.value <= 0:
+            raise InvalidWithdrawAmountException(
+                "Transfer amount must be higher than 0"
+            )
+
+        if command.value > from_account.funds:
+            raise InvalidWithdrawAmountException(
+                "Transfer amount cannot be higher than available funds on source account"
+            )
+
+    def validate_accounts(self, from_account, to_account, currency, at):
+        """
+        Checks which need only `AccountMetadata`, done before transaction.
+        """
+        if from_account.pk == to_account.pk:
             raise CannotTransferToSameAccountException(
                 "Source account is same as target account, its not allowed."
             )
 
-        if from_account.currency != currency:
+        if from_account.currency_id != currency.pk:
             raise InvalidTransferCurrencyException(
                 "Source account currency does not match transfer currency"
             )
 
-        if to_account.currency != currency:
+        self.get_exchange_rate(currency, to_account, at)
+
+    def get_exchange_rate(self, currency, to_account, at):
+        """
+        `ExchangeRate` from transfer currency to currency of target
+        account in effect at `at`, None when they are same. Raises when
+        there is no rate.
+        """
+        if to_account.currency_id == currency.pk:
+            return None
+
+        exchange_rate = exchange_rate_queries.get_rate(
+            currency.pk, to_account.currency_id, at
+        )
+
+        if exchange_rate is None:
             raise InvalidTransferCurrencyException(
                 "Target account currency does not match transfer currency"
             )
-        if command.value <= 0:
+
+        return exchange_rate
+
+    def convert(self, command, currency, to_account, at):
+        """
+        `(exchange rate, to_value)` of transfer, `(None, None)` when target
+        account has transfer currency.
+        """
+        exchange_rate = self.get_exchange_rate(currency, to_account, at)
+
+        if exchange_rate is None:
+            return None, None
+
+        to_value = command.value.convert(exchange_rate.rate)
+
+        if to_value <= 0:
             raise InvalidWithdrawAmountException(
-                "Transfer amount must be higher than 0"
+                "Transfer amount is too small to convert"
             )
 
-        if command.value > from_account.funds:
+        return exchange_rate, to_value
+
+
+class FastTransferUsecase:
+    """
+    Same rules as `TransferUsecase`, but currency and funds checks are
+    folded into conditional UPDATEs, so happy path does not SELECT at all.
+    Both UPDATEs are issued in ascending account id order, so row locks
+    are taken in same order as in `TransferUsecase`. Hot accounts fall back
+    to writing their balance slots. Transfer into account of other
+    currency is rolled back once credit finds out and left to
+    `TransferUsecase`, which converts it.
+    """
+
+    def execute(self, command: TransferCommand):
+        from_account = int(command.from_account)
+        to_account = int(command.to_account)
+
+        if from_account == to_account:
+            raise CannotTransferToSameAccountException(
+                "Source account is same as target account, its not allowed."
+            )
+
+        if command.value <= 0:
             raise InvalidWithdrawAmountException(
-                "Transfer amount cannot be higher than available funds on source account"
+                "Transfer amount must be higher than 0"
             )
 
-        with transaction.atomic():
-            Transfer.objects.create(
-                name=command.name,
-                from_account=from_account,
-                to_account=to_account,
-                currency=currency,
-                value=command.value,
+        replayed = idempotency_keys.get_cached(command)
+
+        if replayed is not None:
+            return replayed
+
+        try:
+            with transaction.atomic():
+                if record := idempotency_keys.claim(command):
+                    return record.transfer
+
+                if from_account < to_account:
+                    from_balance = self._debit(from_account, command)
+                    to_balance = self._credit(to_account, command)
+                else:
+                    to_balance = self._credit(to_account, command)
+                    from_balance = self._debit(from_account, command)
+
+                transfer = Transfer.objects.create(
+                    name=command.name,
+                    from_account_id=from_account,
+                    to_account_id=to_account,
+                    currency_id=command.currency,
+                    value=command.value,
+                )
+                write_journal(transfer, from_balance, to_balance)
+                idempotency_keys.complete(command, transfer)
+        except _NeedsConversion:
+            return TransferUsecase().execute(command)
+
+        return transfer
+
+    def _debit(self, idx, command):
+        """
+        Return balance after debit, None for hot accounts.
+        """
+        funds = account_queries.debit(idx, command.currency, command.value)
+
+        if funds is not None:
+            return funds
+
+        account = account_queries.get_by_id(idx)
+
+        if account.currency_id != int(command.currency):
+            raise InvalidTransferCurrencyException(
+                "Source account currency does not match transfer currency"
             )
 
-            from_account.funds -= command.value
-            from_account.save()
+        if account.balance_slots:
+            if account_queries.debit_slots(account, command.value):
+                return None
+
+            if account_queries.slots_cover(account, command.value):
+                raise ConcurrentUpdateException(
+                    "Account was changed by another request, try again"
+                )
+
+        raise InvalidWithdrawAmountException(
+            "Transfer amount cannot be higher than available funds on source account"
+        )
+
+    def _credit(self, idx, command):
+        """
+        Return balance after credit, None for hot accounts.
+        """
+        funds = account_queries.credit(idx, command.currency, command.value)
+
+        if funds is not None:
+            return funds
+
+        # raises DoesNotExist when account is missing
+        account = account_queries.get_by_id(idx)
+
+        if account.balance_slots and account.currency_id == int(
+            command.currency
+        ):
+            if not account_queries.credit_slots(account, command.value):
+                raise ConcurrentUpdateException(
+                    "Account was changed by another request, try again"
+                )
+
+            return None
 
-            to_account.funds += command.value
-            to_account.save()
+        # other currency, `TransferUsecase` converts it or rejects it
+        raise _NeedsConversion()
@@ -1,14 +1,18 @@
 from dataclasses import dataclass
-from decimal import Decimal
 
 from django.db import transaction
 
 from ..exceptions import (
+    ConcurrentUpdateException,
     InvalidTransferCurrencyException,
     InvalidWithdrawAmountException,
 )
 from ..models import Transfer
+from ..money import Money
 from ..queries import account_queries, currency_queries
+from .base import AccountWriteUsecase
+from .idempotency import idempotency_keys
+from .journal import balance_of, write_journal
 
 
 @dataclass(frozen=True, slots=True)
@@ -16,19 +20,48 @@ class WithdrawCommand:
     name: str
     from_account: int
     currency: int
-    value: Decimal
+    value: Money
+    idempotency_key: str | None = None
 
 
-class WithdrawUsecase:
+class WithdrawUsecase(AccountWriteUsecase):
     def execute(self, command: WithdrawCommand):
-        account = account_queries.get_by_id(command.from_account)
+        replayed = idempotency_keys.get_cached(command)
+
+        if replayed is not None:
+            return replayed
+
         currency = currency_queries.get_by_id(command.currency)
+        self.validate_account(
+            account_queries.get_metadata(command.from_account), currency
+        )
+        return self.retry_on_conflict(self._execute, command, currency)
 
-        if account.currency != currency:
-            raise InvalidTransferCurrencyException(
-                "Account currency does not match withdrawal currency"
+    def _execute(self, command, currency):
+        with transaction.atomic():
+            if record := idempotency_keys.claim(command):
+                return record.transfer
+
+            (account,) = self.get_accounts(command.from_account)
+            self.validate(command, account, currency)
+
+            transfer = Transfer.objects.create(
+                name=command.name,
+                from_account=account,
+                currency=currency,
+                value=command.value,
             )
 
+            account.funds -= command.value
+            self.save_accounts(account)
+            write_journal(transfer, from_balance=balance_of(account))
+            idempotency_keys.complete(command, transfer)
+
+        return transfer
+
+    def validate(self, command, account, currency):
+        self.validate_account(account, currency)
+
         if command.value <= 0:
             raise InvalidWithdrawAmountException(
                 "Withdraw amount must be higher than 0"
@@ -39,13 +72,72 @@ class WithdrawUsecase:
                 "Withdraw amount cannot be higher than available funds"
             )
 
+    def validate_account(self, account, currency):
+        """
+        Checks which need only `AccountMetadata`, done before transaction.
+        """
+        if account.currency_id != currency.pk:
+            raise InvalidTransferCurrencyException(
+                "Account currency does not match withdrawal currency"
+            )
+
+
+class FastWithdrawUsecase:
+    """
+    Same rules as `WithdrawUsecase`, but currency and funds checks are
+    folded into conditional UPDATE, so happy path does not SELECT at all.
+    Hot accounts fall back to debiting their balance slots.
+    """
+
+    def execute(self, command: WithdrawCommand):
+        if command.value <= 0:
+            raise InvalidWithdrawAmountException(
+                "Withdraw amount must be higher than 0"
+            )
+
+        replayed = idempotency_keys.get_cached(command)
+
+        if replayed is not None:
+            return replayed
+
         with transaction.atomic():
-            Transfer.objects.create(
+            if record := idempotency_keys.claim(command):
+                return record.transfer
+
+            funds = account_queries.debit(
+                command.from_account, command.currency, command.value
+            )
+
+            if funds is None:
+                account = account_queries.get_by_id(command.from_account)
+
+                if account.currency_id != int(command.currency):
+                    raise InvalidTransferCurrencyException(
+                        "Account currency does not match withdrawal currency"
+                    )
+
+                if not account.balance_slots or not (
+                    account_queries.debit_slots(account, command.value)
+                ):
+                    if account.balance_slots and (
+                        account_queries.slots_cover(account, command.value)
+                    ):
+                        # slots were rebalanced meanwhile
+                        raise ConcurrentUpdateException(
+                            "Account was changed by another request, try again"
+                        )
+
+                    raise InvalidWithdrawAmountException(
+                        "Withdraw amount cannot be higher than available funds"
+                    )
+
+            transfer = Transfer.objects.create(
                 name=command.name,
-                from_account=account,
-                currency=currency,
+                from_account_id=command.from_account,
+                currency_id=command.currency,
                 value=command.value,
             )
+            write_journal(transfer, from_balance=funds)
+            idempotency_keys.complete(command, transfer)
 
-            account.funds -= command.value
-            account.save()
+        return transfer
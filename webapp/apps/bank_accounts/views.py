@@ -1,23 +1,53 @@
+from dataclasses import asdict
+
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import IntegrityError
-from django.views.generic import TemplateView
-
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import render
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.generic import TemplateView, View
+
+from .analytics import transfer_analytics
+from .const import (
+    ACCOUNT_AUTOCOMPLETE_LIMIT,
+    ACCOUNTS_PAGE_SIZE,
+    ANALYTICS_COUNTERPARTIES_LIMIT,
+    ANALYTICS_NET_FLOW_PAGE_SIZE,
+    HISTORY_PAGE_SIZE,
+    STATEMENT_PAGE_SIZE,
+)
 from .exceptions import (
+    AnalyticsNotLoadedException,
     CannotTransferToSameAccountException,
+    ConcurrentUpdateException,
+    IdempotencyKeyConflictException,
     InvalidCurrencyException,
     InvalidDepositAmountException,
     InvalidTransferCurrencyException,
     InvalidWithdrawAmountException,
 )
+from .exports import EXPORT_CONTENT_TYPES, export_transfers
 from .forms import (
     AddAccountForm,
     AddCurrencyForm,
     DepositForm,
     HistoryFilterForm,
+    NetFlowForm,
+    StatementForm,
     TransferForm,
     WithdrawForm,
 )
-from .queries import account_queries, currency_queries, transfer_queries
+from .money import Money
+from .queries import (
+    account_queries,
+    currency_queries,
+    entry_queries,
+    summary_queries,
+    transfer_queries,
+)
+from .queries.pagination import NEXT, PREVIOUS
 from .usecases import (
     AddAccountCommand,
     AddAccountUsecase,
@@ -25,21 +55,90 @@ from .usecases import (
     AddCurrencyUsecase,
     DepositCommand,
     DepositUsecase,
+    FastTransferUsecase,
+    FastWithdrawUsecase,
     TransferCommand,
     TransferUsecase,
     WithdrawCommand,
     WithdrawUsecase,
 )
+from .usecases.asynchronous import run_in_db_thread
+from .usecases.base import write_stats
+from .usecases.group_commit import deposit_group_commit
 
 
 class HomeView(TemplateView):
+    """
+    Cached summary and one page of accounts. Summary version, shared by
+    every worker, is used as ETag, so repeated visits get 304 until some
+    write invalidates it.
+    """
+
     template_name = "subpages/home.html"
 
     def get(self, request, *args, **kwargs):
-        context = self.get_context_data(**kwargs)
-        context["available_currencies"] = currency_queries.get_all()
-        context["available_accounts"] = account_queries.get_all()
-        return self.render_to_response(context)
+        summary = summary_queries.get_summary()
+        etag, last_modified = summary_validators(request, summary)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+
+        if response is None:
+            context = self.get_context_data(**kwargs)
+            context.update(get_home_page(request.GET, summary))
+            response = self.render_to_response(context)
+
+        return set_summary_validators(response, etag, last_modified)
+
+
+def summary_validators(request, summary):
+    etag = quote_etag(f"{summary.version}-{request.GET.urlencode()}")
+    return etag, int(summary.as_of.timestamp())
+
+
+def set_summary_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def get_home_page(params, summary):
+    direction = params.get("direction", NEXT)
+
+    try:
+        page = account_queries.get_page(
+            ACCOUNTS_PAGE_SIZE,
+            cursor=params.get("cursor"),
+            direction=PREVIOUS if direction == PREVIOUS else NEXT,
+        )
+    except ValueError:
+        page = account_queries.get_page(ACCOUNTS_PAGE_SIZE)
+
+    return {
+        "summary": summary,
+        "available_accounts": page.items,
+        "next_cursor": page.next_cursor,
+        "previous_cursor": page.previous_cursor,
+    }
+
+
+async def home_async(request):
+    """
+    Async variant of `HomeView`, ORM queries run in db thread pool instead
+    of blocking a worker thread for whole request.
+    """
+    summary = await run_in_db_thread(summary_queries.get_summary)
+    etag, last_modified = summary_validators(request, summary)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+
+    if response is None:
+        context = await run_in_db_thread(get_home_page, request.GET, summary)
+        response = render(request, HomeView.template_name, context)
+
+    return set_summary_validators(response, etag, last_modified)
 
 
 class AddAccountView(TemplateView):
@@ -132,19 +231,208 @@ class HistoryView(TemplateView):
         form = HistoryFilterForm(request.GET)
         context["history_filters"] = form
 
-        by_account = request.GET.get("by_account")
-
-        if by_account:
-            context["transfers"] = transfer_queries.get_filtered_by_account(
-                by_account
-            )
+        if not form.is_valid():
+            return self.render_to_response(context, status=400)
 
-        else:
-            context["transfers"] = transfer_queries.get_all()
+        context.update(
+            get_history_page(form.cleaned_data["by_account"], request.GET)
+        )
 
         return self.render_to_response(context)
 
 
+def get_history_page(by_account, params):
+    """
+    Template context with one keyset page of transfers of `by_account`
+    (validated by `HistoryFilterForm`) selected by `cursor` and
+    `direction` request params. Invalid cursor shows first page.
+    """
+    direction = params.get("direction", NEXT)
+
+    try:
+        page = transfer_queries.get_row_page(
+            HISTORY_PAGE_SIZE,
+            cursor=params.get("cursor"),
+            direction=PREVIOUS if direction == PREVIOUS else NEXT,
+            account=by_account,
+        )
+    except ValueError:
+        page = transfer_queries.get_row_page(
+            HISTORY_PAGE_SIZE, account=by_account
+        )
+
+    return {
+        "transfers": page.items,
+        "by_account": by_account or "",
+        "next_cursor": page.next_cursor,
+        "previous_cursor": page.previous_cursor,
+    }
+
+
+class StatementView(View):
+    """
+    Account statement read from journal: entries with running balance,
+    oldest first, paged by entry id `after`. Balance is null for entries
+    of hot accounts.
+    """
+
+    def get(self, request, account, *args, **kwargs):
+        try:
+            account_queries.get_metadata(account)
+        except ObjectDoesNotExist:
+            raise Http404("Unknown account")
+
+        form = StatementForm(request.GET)
+
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        # one more row tells whether there is next page
+        entries = list(
+            entry_queries.get_statement(
+                account, form.cleaned_data["after"] or 0
+            )[: STATEMENT_PAGE_SIZE + 1]
+        )
+        next_after = (
+            entries[STATEMENT_PAGE_SIZE - 1].pk
+            if len(entries) > STATEMENT_PAGE_SIZE
+            else None
+        )
+
+        return JsonResponse(
+            {
+                "next_after": next_after,
+                "results": [
+                    {
+                        "id": entry.pk,
+                        "transfer_id": entry.transfer_id,
+                        "name": entry.transfer.name,
+                        "transfer_date": entry.transfer.transfer_date,
+                        "currency": entry.transfer.currency.symbol,
+                        "amount": str(entry.amount),
+                        "balance": (
+                            None
+                            if entry.balance is None
+                            else str(entry.balance)
+                        ),
+                    }
+                    for entry in entries[:STATEMENT_PAGE_SIZE]
+                ],
+            }
+        )
+
+
+class HistoryExportView(View):
+    """
+    Streams whole history, filtered like `HistoryView`, as CSV or NDJSON
+    (`format` param). `gzip=1` compresses it on the fly.
+    """
+
+    def get(self, request, *args, **kwargs):
+        form = HistoryFilterForm(request.GET)
+        export_format = request.GET.get("format", "csv")
+
+        if not form.is_valid() or export_format not in EXPORT_CONTENT_TYPES:
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        compress = request.GET.get("gzip") == "1"
+        rows = transfer_queries.iter_rows(
+            form.cleaned_data["by_account"],
+            chunk_size=settings.EXPORT_CHUNK_SIZE,
+        )
+        response = StreamingHttpResponse(
+            export_transfers(
+                rows, export_format, settings.EXPORT_CHUNK_SIZE, compress
+            ),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="transfers.{export_format}"'
+        )
+
+        if compress:
+            # also keeps GZipMiddleware away from it
+            response["Content-Encoding"] = "gzip"
+
+        return response
+
+
+class AnalyticsView(View):
+    """
+    Read-only ledger reports computed in memory: `net-flow` paged by
+    account id `after`, `currency-volume` and `counterparties` of
+    `by_account`. Answers 503 until ledger is loaded.
+    """
+
+    def get(self, request, report, *args, **kwargs):
+        next_after = None
+
+        try:
+            if report == "net-flow":
+                form = NetFlowForm(request.GET)
+
+                if not form.is_valid():
+                    return JsonResponse({"errors": form.errors}, status=400)
+
+                # one more row tells whether there is next page
+                results = transfer_analytics.net_flow(
+                    form.cleaned_data["after"] or 0,
+                    ANALYTICS_NET_FLOW_PAGE_SIZE + 1,
+                )
+
+                if len(results) > ANALYTICS_NET_FLOW_PAGE_SIZE:
+                    results = results[:ANALYTICS_NET_FLOW_PAGE_SIZE]
+                    next_after = results[-1].account_id
+            elif report == "currency-volume":
+                results = transfer_analytics.currency_volume()
+            elif report == "counterparties":
+                form = HistoryFilterForm(request.GET)
+
+                if not form.is_valid() or not form.cleaned_data["by_account"]:
+                    return JsonResponse({"errors": form.errors}, status=400)
+
+                results = transfer_analytics.top_counterparties(
+                    form.cleaned_data["by_account"],
+                    ANALYTICS_COUNTERPARTIES_LIMIT,
+                )
+            else:
+                raise Http404("Unknown report")
+        except AnalyticsNotLoadedException as ex:
+            response = JsonResponse({"errors": str(ex)}, status=503)
+            response["Retry-After"] = 5
+            return response
+
+        # amounts as "12.50", JSON would show `Money` as number of cents
+        return JsonResponse(
+            {
+                "next_after": next_after,
+                "results": [
+                    {
+                        key: str(value) if isinstance(value, Money) else value
+                        for key, value in asdict(row).items()
+                    }
+                    for row in results
+                ],
+            }
+        )
+
+
+async def history_async(request):
+    """
+    Async variant of `HistoryView`.
+    """
+    form = HistoryFilterForm(request.GET)
+    context = {"history_filters": form}
+
+    if not await run_in_db_thread(form.is_valid):
+        return render(request, HistoryView.template_name, context, status=400)
+
+    page = await run_in_db_thread(
+        get_history_page, form.cleaned_data["by_account"], request.GET
+    )
+    return render(request, HistoryView.template_name, {**context, **page})
+
+
 class DepositView(TemplateView):
     template_name = "subpages/deposit.html"
 
@@ -162,7 +450,11 @@ class DepositView(TemplateView):
 
         if form.is_valid():
             entity = DepositCommand(**form.cleaned_data)
-            usecase = DepositUsecase()
+
+            if settings.DEPOSIT_GROUP_COMMIT:
+                usecase = deposit_group_commit
+            else:
+                usecase = DepositUsecase()
 
             try:
                 usecase.execute(entity)
@@ -170,6 +462,8 @@ class DepositView(TemplateView):
             except (
                 InvalidTransferCurrencyException,
                 InvalidDepositAmountException,
+                ConcurrentUpdateException,
+                IdempotencyKeyConflictException,
                 ObjectDoesNotExist,
             ) as ex:
                 form.errors["internal"] = form.error_class([ex])
@@ -203,7 +497,11 @@ class WithdrawView(TemplateView):
 
         if form.is_valid():
             entity = WithdrawCommand(**form.cleaned_data)
-            usecase = WithdrawUsecase()
+
+            if settings.TRANSFER_FAST_PATH:
+                usecase = FastWithdrawUsecase()
+            else:
+                usecase = WithdrawUsecase()
 
             try:
                 usecase.execute(entity)
@@ -211,6 +509,8 @@ class WithdrawView(TemplateView):
             except (
                 InvalidTransferCurrencyException,
                 InvalidWithdrawAmountException,
+                ConcurrentUpdateException,
+                IdempotencyKeyConflictException,
                 ObjectDoesNotExist,
             ) as ex:
                 form.errors["internal"] = form.error_class([ex])
@@ -244,7 +544,11 @@ class TransferView(TemplateView):
 
         if form.is_valid():
             entity = TransferCommand(**form.cleaned_data)
-            usecase = TransferUsecase()
+
+            if settings.TRANSFER_FAST_PATH:
+                usecase = FastTransferUsecase()
+            else:
+                usecase = TransferUsecase()
 
             try:
                 usecase.execute(entity)
@@ -253,6 +557,8 @@ class TransferView(TemplateView):
                 InvalidTransferCurrencyException,
                 InvalidWithdrawAmountException,
                 CannotTransferToSameAccountException,
+                ConcurrentUpdateException,
+                IdempotencyKeyConflictException,
                 ObjectDoesNotExist,
             ) as ex:
                 form.errors["internal"] = form.error_class([ex])
@@ -268,3 +574,32 @@ class TransferView(TemplateView):
 
         else:
             return self.render_to_response(context, status=400)
+
+
+class AccountAutocompleteView(View):
+    def get(self, request, *args, **kwargs):
+        prefix = request.GET.get("q", "").strip()
+
+        if not prefix:
+            return JsonResponse({"results": []})
+
+        results = account_queries.search_by_name(
+            prefix, ACCOUNT_AUTOCOMPLETE_LIMIT
+        )
+        return JsonResponse({"results": results})
+
+
+class WriteStatsView(View):
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(write_stats.snapshot())
+
+
+class CacheStatsView(View):
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(
+            {
+                "currencies": currency_queries.cache.stats(),
+                "account_metadata": account_queries.metadata_cache.stats(),
+                "summary": summary_queries.summary_cache.stats(),
+            }
+        )
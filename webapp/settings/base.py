@@ -65,6 +65,15 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # ===============================================================================
 # CACHE
 # ===============================================================================
+# Required to be shared by every process: reference caches and summary keep
+# their version stamps here, per-process backend would leave other workers
+# serving stale rows
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env("REDIS_URL", "redis://redis:6379/0"),
+    }
+}
 
 
 # ===============================================================================
@@ -154,6 +163,60 @@ TEMPLATES = [
 # ===============================================================================
 # Misc.
 # ===============================================================================
+# Use single-statement conditional UPDATEs for withdrawals and transfers
+TRANSFER_FAST_PATH = env("TRANSFER_FAST_PATH", False)
+
+# Optimistic (compare-and-swap on Account.version) instead of row locks
+OPTIMISTIC_LOCKING = env("OPTIMISTIC_LOCKING", False)
+OPTIMISTIC_LOCKING_RETRIES = int(env("OPTIMISTIC_LOCKING_RETRIES", 5))
+OPTIMISTIC_LOCKING_RETRY_DELAY = float(
+    env("OPTIMISTIC_LOCKING_RETRY_DELAY", 0.005)
+)
+
+# Idempotency keys of deposits / withdrawals / transfers
+IDEMPOTENCY_KEY_TTL = int(env("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+IDEMPOTENCY_CACHE_SIZE = int(env("IDEMPOTENCY_CACHE_SIZE", 10000))
+
+# Commit concurrent deposits together, in groups of up to MAX_BATCH
+# deposits collected within MAX_WAIT seconds
+DEPOSIT_GROUP_COMMIT = env("DEPOSIT_GROUP_COMMIT", False)
+DEPOSIT_GROUP_COMMIT_MAX_BATCH = int(
+    env("DEPOSIT_GROUP_COMMIT_MAX_BATCH", 100)
+)
+DEPOSIT_GROUP_COMMIT_MAX_WAIT = float(
+    env("DEPOSIT_GROUP_COMMIT_MAX_WAIT", 0.005)
+)
+# Longest time in seconds caller waits for its group to be committed
+DEPOSIT_GROUP_COMMIT_TIMEOUT = float(env("DEPOSIT_GROUP_COMMIT_TIMEOUT", 30))
+
+# Per-process cache of currencies and account metadata
+REFERENCE_CACHE_SIZE = int(env("REFERENCE_CACHE_SIZE", 10000))
+REFERENCE_CACHE_TTL = float(env("REFERENCE_CACHE_TTL", 300))
+
+# Size of thread pool running ORM calls of async views and usecases
+ASYNC_DB_THREADS = int(env("ASYNC_DB_THREADS", 8))
+
+# Balance checkpoints are taken this many seconds in the past, so
+# transactions still in flight cannot add transfers before them
+BALANCE_CHECKPOINT_LAG = int(env("BALANCE_CHECKPOINT_LAG", 60))
+
+# Monthly transfer partitions created ahead of time, and number of recent
+# months kept in database by `archive_transfers`
+TRANSFER_PARTITIONS_AHEAD = int(env("TRANSFER_PARTITIONS_AHEAD", 3))
+TRANSFER_ARCHIVE_AFTER_MONTHS = int(env("TRANSFER_ARCHIVE_AFTER_MONTHS", 24))
+
+# Directory of columnar archive files of transfers moved out of database,
+# empty disables the archive
+TRANSFER_ARCHIVE_DIR = env("TRANSFER_ARCHIVE_DIR", "")
+
+# Rows fetched from server-side cursor at a time by history exports
+EXPORT_CHUNK_SIZE = int(env("EXPORT_CHUNK_SIZE", 2000))
+
+# Seconds after which ledger arrays of analytics reports are reloaded in
+# background thread (old ones are served meanwhile), and rows read from
+# server-side cursor at a time when loading them
+ANALYTICS_CACHE_SECONDS = int(env("ANALYTICS_CACHE_SECONDS", 60))
+ANALYTICS_CHUNK_SIZE = int(env("ANALYTICS_CHUNK_SIZE", 100000))
 
 
 # =============
@@ -12,4 +12,12 @@ CELERY_ALWAYS_EAGER = True
 
 SENTRY_ENABLED = False
 
+# tests run in one process, local memory is shared by every connection
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "bank_accounts",
+    }
+}
+
 LOGGING["loggers"][""]["handlers"] = ["null"]